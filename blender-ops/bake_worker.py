@@ -0,0 +1,22 @@
+"""
+Background worker that bakes catalog materials to image maps
+Started by the add-on's bake cache as:
+    blender --background --factory-startup --python bake_worker.py -- job.json
+Exits with a non-zero code if any material failed to bake.
+"""
+
+import sys
+import os
+
+# Add the addon path to sys.path
+addon_path = os.path.dirname(os.path.abspath(__file__))
+if addon_path not in sys.path:
+    sys.path.append(addon_path)
+
+from philo_interior_addon.material_baker import run_bake_job
+
+script_args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+if not script_args:
+    print("Usage: blender --background --python bake_worker.py -- job.json")
+    sys.exit(2)
+sys.exit(1 if run_bake_job(script_args[0]) else 0)
@@ -0,0 +1,97 @@
+"""
+OBJ parsing benchmark for the streaming NumPy parser
+Run with: python benchmarks/bench_obj_parser.py (no Blender needed)
+
+Writes synthetic OBJ files of a growing vertex count (a triangulated
+grid per object with v/vt/vn records and v/vt/vn faces) and reports
+throughput of parse_obj against a line-by-line Python loop reading the
+same records. The line loop is skipped above LINE_LOOP_LIMIT vertices.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add the blender-ops folder to sys.path so the addon package resolves
+blender_ops_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if blender_ops_path not in sys.path:
+    sys.path.append(blender_ops_path)
+
+from philo_interior_addon.obj_parser import parse_obj
+
+VERTEX_COUNTS = [250_000, 1_000_000, 2_000_000, 4_000_000]
+LINE_LOOP_LIMIT = 1_000_000
+OBJECTS = 4
+
+def write_obj(path, vertex_count):
+    """Write OBJECTS grids totalling about vertex_count vertices; returns (vertices, faces)"""
+    side = int(np.sqrt(vertex_count / OBJECTS))
+    grid = np.stack(np.meshgrid(np.arange(side), np.arange(side), indexing="ij"), axis=-1).reshape(-1, 2)
+    cell = (grid[:, 0] < side - 1) & (grid[:, 1] < side - 1)
+    corner = np.flatnonzero(cell)
+    quads = np.stack([corner, corner + side, corner + side + 1, corner + 1], axis=1)
+    triangles = np.concatenate([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+
+    vertices = faces = 0
+    with open(path, "w") as f:
+        for index in range(OBJECTS):
+            f.write(f"o Grid{index}\nusemtl grid_{index % 2}\n")
+            coords = np.column_stack([grid * 0.01, np.sin(grid[:, 0] * 0.1) * 0.05])
+            np.savetxt(f, coords, fmt="v %.6f %.6f %.6f")
+            np.savetxt(f, grid / side, fmt="vt %.6f %.6f")
+            np.savetxt(f, np.tile([0.0, 0.0, 1.0], (len(grid), 1)), fmt="vn %.4f %.4f %.4f")
+            ids = np.repeat(triangles + vertices + 1, 3, axis=1)
+            np.savetxt(f, ids, fmt="f %d/%d/%d %d/%d/%d %d/%d/%d")
+            vertices += len(grid)
+            faces += len(triangles)
+    return vertices, faces
+
+def parse_line_loop(path):
+    """The same records parsed with a Python loop per line, like the old manual importer"""
+    positions, uvs, normals, faces = [], [], [], []
+    with open(path, "r") as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == "v":
+                positions.append([float(value) for value in parts[1:4]])
+            elif parts[0] == "vt":
+                uvs.append([float(value) for value in parts[1:3]])
+            elif parts[0] == "vn":
+                normals.append([float(value) for value in parts[1:4]])
+            elif parts[0] == "f":
+                faces.append([[int(index) for index in part.split("/")] for part in parts[1:]])
+    return positions, uvs, normals, faces
+
+def main():
+    print(f"{'vertices':>10} {'faces':>10} {'MB':>7} {'numpy (s)':>10} {'MB/s':>7} "
+          f"{'Mvert/s':>8} {'loop (s)':>9} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in VERTEX_COUNTS:
+            path = os.path.join(tmp, f"bench_{count}.obj")
+            vertices, faces = write_obj(path, count)
+            size_mb = os.path.getsize(path) / 1e6
+
+            start = time.perf_counter()
+            obj_data = parse_obj(path)
+            numpy_time = time.perf_counter() - start
+            assert obj_data.vertex_count == vertices and obj_data.face_count == faces
+
+            loop_cell, speedup = f"{'-':>9}", f"{'-':>8}"
+            if count <= LINE_LOOP_LIMIT:
+                start = time.perf_counter()
+                parse_line_loop(path)
+                loop_time = time.perf_counter() - start
+                loop_cell = f"{loop_time:>9.2f}"
+                speedup = f"{loop_time / numpy_time:>7.1f}x"
+
+            print(f"{vertices:>10} {faces:>10} {size_mb:>7.0f} {numpy_time:>10.2f} "
+                  f"{size_mb / numpy_time:>7.0f} {vertices / numpy_time / 1e6:>8.2f} {loop_cell} {speedup}")
+            os.remove(path)
+
+if __name__ == "__main__":
+    main()
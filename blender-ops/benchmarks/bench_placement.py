@@ -0,0 +1,92 @@
+"""
+Placement benchmark for SmartFurniturePlacement
+Run with: python benchmarks/bench_placement.py (no Blender needed)
+
+Places a growing number of small props (books, cushions, plants) into a
+large room by random candidate sampling, checking each prop's candidates
+in one _valid_candidates batch the way the wall and corner scorers do,
+and reports placement time per item count with and without the footprint
+grid index. (_place_anywhere finds free space from the occupancy raster
+and does no collision queries, so it would time the same code in both
+runs.)
+"""
+
+import contextlib
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the blender-ops folder to sys.path so the addon package resolves
+blender_ops_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if blender_ops_path not in sys.path:
+    sys.path.append(blender_ops_path)
+
+from philo_interior_addon.layout_core import SmartFurniturePlacement
+from philo_interior_addon.spatial_index import FootprintGrid
+
+ITEM_COUNTS = [100, 200, 400, 800, 1600]
+ROOM_SIZE = 16
+SEED = 1234
+ATTEMPTS = 50  # Random candidates tried per prop
+
+PROPS = [
+    {"width": 0.25, "depth": 0.18},  # Book stack
+    {"width": 0.45, "depth": 0.45},  # Cushion
+    {"width": 0.35, "depth": 0.35},  # Plant
+]
+
+def make_prop(dims):
+    """Build a furniture_info dict for a synthetic floor prop"""
+    return {
+        "type": "floor_decor",
+        "category": "decor",
+        "dimensions": {"width": dims["width"], "height": 0.3, "depth": dims["depth"]},
+        "placement": {"zone": "anywhere", "wall_distance": 0.0, "height": 0.0, "orientation": "free"}
+    }
+
+def sample_placement(placer, info):
+    """First of a batch of random candidates that passes the collision check, or None"""
+    dims = info["dimensions"]
+    bounds = placer.floor_bounds
+    positions = np.array([(placer.rng.uniform(bounds["min_x"], bounds["max_x"]),
+                           placer.rng.uniform(bounds["min_y"], bounds["max_y"]))
+                          for _ in range(ATTEMPTS)])
+    valid = placer._valid_candidates(positions, np.zeros(ATTEMPTS), dims)
+    if not valid.any():
+        return None
+    x, y = positions[np.argmax(valid)]
+    return {"position": (float(x), float(y), 0.0), "rotation": (0, 0, 0), "dimensions": dims}
+
+def run(item_count, indexed):
+    """Place item_count props and return (seconds, placed count)"""
+    placer = SmartFurniturePlacement(room_size=ROOM_SIZE, seed=SEED)
+    if not indexed:
+        # A single huge cell turns every query into a full linear scan
+        placer.placement_index = FootprintGrid(cell_size=1e9)
+    placer.reset_placements()
+
+    props = [make_prop(PROPS[i % len(PROPS)]) for i in range(item_count)]
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for info in props:
+            placement = sample_placement(placer, info)
+            if placement:
+                placer.add_placement(placement)
+    elapsed = time.perf_counter() - start
+
+    return elapsed, len(placer.placed_objects)
+
+def main():
+    print(f"{'items':>6} {'placed':>7} {'linear (ms)':>12} {'grid (ms)':>10} {'speedup':>8}")
+    for count in ITEM_COUNTS:
+        linear_time, placed = run(count, indexed=False)
+        grid_time, grid_placed = run(count, indexed=True)
+        assert placed == grid_placed, "index changed placement results"
+        speedup = linear_time / grid_time if grid_time else float("inf")
+        print(f"{count:>6} {placed:>7} {linear_time * 1000:>12.1f} {grid_time * 1000:>10.1f} {speedup:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
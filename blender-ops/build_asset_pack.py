@@ -0,0 +1,19 @@
+"""
+Build the precompiled furniture asset pack (cache/philo_assets.blend)
+Run with: blender --background --python build_asset_pack.py [-- --force]
+The pack is only rebuilt when a catalog OBJ/MTL or catalog entry changed,
+unless --force is given.
+"""
+
+import sys
+import os
+
+# Add the addon path to sys.path
+addon_path = os.path.dirname(os.path.abspath(__file__))
+if addon_path not in sys.path:
+    sys.path.append(addon_path)
+
+from philo_interior_addon.asset_pack import AssetPack
+
+script_args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+AssetPack().build(force="--force" in script_args)
@@ -11,36 +11,49 @@ bl_info = {
     "support": "COMMUNITY",
 }
 
-import bpy
-from . import scene_generator
-from . import materials
-from . import camera_setup
-from . import ui_panels
-from . import expert_interior_design
-from . import smart_placement_rules
-from . import furniture_placement
+try:
+    import bpy
+except ImportError:
+    # Outside Blender (layout workers, benchmarks) only the bpy-free
+    # modules such as layout_core can be imported from this package
+    bpy = None
 
-# Registration
-classes = (
-    ui_panels.PHILO_OT_generate_scene,
-    ui_panels.PHILO_OT_generate_furnished_room,
-    ui_panels.PHILO_OT_quick_render,
-    ui_panels.PHILO_OT_final_render,
-    ui_panels.PHILO_OT_render_snapshot,
-    ui_panels.PHILO_OT_adjust_camera,
-    ui_panels.PHILO_OT_set_viewport_shading,
-    ui_panels.PHILO_OT_assign_material_to_selected,
-    ui_panels.PHILO_PT_main_panel,
-    ui_panels.PHILO_PT_settings_panel,
-    ui_panels.PHILO_PT_camera_panel,
-    ui_panels.PHILO_PT_material_panel,
-)
+if bpy is not None:
+    from . import scene_generator
+    from . import materials
+    from . import camera_setup
+    from . import ui_panels
+    from . import expert_interior_design
+    from . import smart_placement_rules
+    from . import furniture_placement
+    from . import lod
+
+    # Registration
+    classes = (
+        ui_panels.PHILO_OT_generate_scene,
+        ui_panels.PHILO_OT_generate_furnished_room,
+        ui_panels.PHILO_OT_quick_render,
+        ui_panels.PHILO_OT_final_render,
+        ui_panels.PHILO_OT_render_snapshot,
+        ui_panels.PHILO_OT_export_web,
+        ui_panels.PHILO_OT_adjust_camera,
+        ui_panels.PHILO_OT_set_viewport_shading,
+        ui_panels.PHILO_OT_assign_material_to_selected,
+        ui_panels.PHILO_PT_main_panel,
+        ui_panels.PHILO_PT_settings_panel,
+        ui_panels.PHILO_PT_camera_panel,
+        ui_panels.PHILO_PT_material_panel,
+    )
+else:
+    classes = ()
 
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
+    lod.register()
 
 def unregister():
+    lod.unregister()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
 
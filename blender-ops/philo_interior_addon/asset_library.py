@@ -0,0 +1,129 @@
+"""Import-once asset library: normalized furniture masters shared by linked duplicates"""
+
+import bpy
+from .lod import lod_meshes
+
+LIBRARY_COLLECTION = "Philo_Asset_Library"
+
+# Custom properties marking library masters and the data they own
+ASSET_KEY = "philo_asset"
+ASSET_VERSION_KEY = "philo_asset_version"
+
+class AssetLibrary:
+    """Hidden collection holding one normalized master per furniture file.
+
+    The first request for a file runs the loader (OBJ import, coordinate
+    fix, scale applied) and parks the result in the library collection,
+    which is excluded from the view layer and from rendering. Every
+    placement after that is a linked duplicate: new objects sharing the
+    master's mesh data, so generating the same room again parses no OBJ
+    files at all. The library lives in the .blend file, so saved scenes
+    keep it between sessions.
+    """
+
+    def get_collection(self):
+        """The library collection, created hidden on first use"""
+        collection = bpy.data.collections.get(LIBRARY_COLLECTION)
+        if collection is None:
+            collection = bpy.data.collections.new(LIBRARY_COLLECTION)
+            collection.hide_render = True
+        if LIBRARY_COLLECTION not in bpy.context.scene.collection.children:
+            bpy.context.scene.collection.children.link(collection)
+
+        # Excluded collections are skipped by the depsgraph, selection and select_all/delete
+        layer_collection = bpy.context.view_layer.layer_collection.children.get(LIBRARY_COLLECTION)
+        if layer_collection is not None:
+            layer_collection.exclude = True
+        return collection
+
+    def find_master(self, asset_name, version=None):
+        """Master root object for an asset, or None if missing or out of date"""
+        collection = bpy.data.collections.get(LIBRARY_COLLECTION)
+        if collection is None:
+            return None
+        for obj in collection.objects:
+            if obj.parent is None and obj.get(ASSET_KEY) == asset_name:
+                if version is not None and obj.get(ASSET_VERSION_KEY) != version:
+                    return None
+                return obj
+        return None
+
+    def get_master(self, asset_name, loader, version=None):
+        """Master for an asset, running loader() to import it if it is not in the library yet.
+
+        loader returns the normalized root object (or None on failure).
+        version is any string that changes when the source or its
+        normalization changes (file mtime, scale); stale masters are rebuilt.
+        """
+        master = self.find_master(asset_name, version)
+        if master is not None:
+            return master
+
+        stale = self.find_master(asset_name)
+        if stale is not None:
+            print(f"  Asset {asset_name} changed, re-importing")
+            self.remove_master(stale)
+
+        print(f"  Importing {asset_name} into the asset library")
+        root = loader()
+        if root is None:
+            return None
+
+        collection = self.get_collection()
+        for obj in [root] + list(root.children_recursive):
+            for owner in list(obj.users_collection):
+                owner.objects.unlink(obj)
+            collection.objects.link(obj)
+            if obj.data is not None:
+                obj.data[ASSET_KEY] = asset_name
+                for proxy in lod_meshes(obj.data).values():
+                    proxy[ASSET_KEY] = asset_name
+
+        root.name = f"Asset_{asset_name}"
+        root[ASSET_KEY] = asset_name
+        if version is not None:
+            root[ASSET_VERSION_KEY] = version
+        return root
+
+    def instantiate(self, asset_name, loader, name, version=None, collection=None):
+        """Place a linked duplicate of an asset and return its root object"""
+        master = self.get_master(asset_name, loader, version)
+        if master is None:
+            return None
+
+        collection = collection or bpy.context.collection
+        root = self._copy_tree(master, None, collection)
+        root.name = name
+        return root
+
+    def _copy_tree(self, source, parent, collection):
+        """Linked duplicate of an object hierarchy; object copies keep sharing mesh data"""
+        copy = source.copy()
+        for key in (ASSET_KEY, ASSET_VERSION_KEY):
+            if key in copy:
+                del copy[key]
+        collection.objects.link(copy)
+        if parent is not None:
+            copy.parent = parent
+            copy.matrix_parent_inverse = source.matrix_parent_inverse.copy()
+
+        for child in source.children:
+            self._copy_tree(child, copy, collection)
+        return copy
+
+    def remove_master(self, master):
+        """Delete a master hierarchy; data still used by placed duplicates survives"""
+        for obj in [master] + list(master.children_recursive):
+            bpy.data.objects.remove(obj, do_unlink=True)
+
+    def clear(self):
+        """Empty the library"""
+        collection = bpy.data.collections.get(LIBRARY_COLLECTION)
+        if collection is None:
+            return
+        for obj in list(collection.objects):
+            bpy.data.objects.remove(obj, do_unlink=True)
+
+def is_library_data(datablock):
+    """True for mesh or other data owned by an asset library master"""
+    return datablock.get(ASSET_KEY) is not None
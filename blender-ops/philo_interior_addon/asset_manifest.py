@@ -0,0 +1,161 @@
+"""Per-asset geometry manifests: bounds, footprint and surface metrics computed once per asset
+
+A manifest describes a normalized asset in its root object's local space:
+the axis-aligned bounding box, lowest Z, a convex footprint polygon on the
+floor plane, vertex and face counts and the height of its top horizontal
+surface. Roots are tagged with the bounding box, so runtime positioning
+transforms 8 corners instead of iterating over every vertex.
+"""
+
+import os
+import json
+import numpy as np
+
+# Custom properties tagged on asset roots (copied to linked duplicates)
+AABB_MIN_KEY = "philo_aabb_min"
+AABB_MAX_KEY = "philo_aabb_max"
+TOP_SURFACE_KEY = "philo_top_surface"
+
+# Support directions sampled for the footprint polygon
+FOOTPRINT_DIRECTIONS = 64
+
+# Faces whose normal is within ~25 degrees of +Z count as horizontal surfaces
+UPWARD_NORMAL_Z = 0.9
+SURFACE_BIN = 0.01  # Height bins for the top surface, in meters
+
+def footprint_polygon(points_xy, directions=FOOTPRINT_DIRECTIONS):
+    """Convex footprint of XY points from their extreme points along evenly spaced directions.
+
+    The result is the convex hull of those support points, counter-clockwise,
+    exact for boxes and within cos(pi / directions) of the true hull otherwise.
+    """
+    if len(points_xy) == 0:
+        return []
+    angles = np.arange(directions) * (2 * np.pi / directions)
+    support = np.argmax(points_xy @ np.stack([np.cos(angles), np.sin(angles)]), axis=0)
+
+    # Consecutive directions often hit the same point
+    keep = np.concatenate([[True], support[1:] != support[:-1]])
+    if support[0] == support[-1] and keep.sum() > 1:
+        keep[0] = False
+    return [[float(x), float(y)] for x, y in points_xy[support[keep]]]
+
+def _face_surfaces(positions, loop_vertices, face_sizes):
+    """Area vectors and mean heights of every face (Newell's method)"""
+    starts = np.concatenate([[0], np.cumsum(face_sizes)[:-1]])
+    following = np.arange(1, len(loop_vertices) + 1)
+    following[starts + face_sizes - 1] = starts
+    points = positions[loop_vertices]
+    nxt = points[following]
+    cross = np.stack([
+        points[:, 1] * nxt[:, 2] - points[:, 2] * nxt[:, 1],
+        points[:, 2] * nxt[:, 0] - points[:, 0] * nxt[:, 2],
+        points[:, 0] * nxt[:, 1] - points[:, 1] * nxt[:, 0],
+    ], axis=1)
+    area_vectors = np.add.reduceat(cross, starts, axis=0) * 0.5
+    heights = np.add.reduceat(points[:, 2], starts) / face_sizes
+    return area_vectors, heights
+
+def top_surface_height(meshes, fallback):
+    """Height of the highest horizontal, upward-facing surface with a substantial area.
+
+    Upward face area is binned by height; the top surface is the highest
+    bin holding at least a quarter of the largest bin's area, so a table
+    top wins over a small vase standing on it.
+    """
+    heights, areas = [], []
+    for mesh in meshes:
+        if len(mesh["face_sizes"]) == 0:
+            continue
+        area_vectors, face_heights = _face_surfaces(mesh["positions"], mesh["loop_vertices"], mesh["face_sizes"])
+        area = np.linalg.norm(area_vectors, axis=1)
+        upward = area_vectors[:, 2] > UPWARD_NORMAL_Z * np.maximum(area, 1e-12)
+        heights.append(face_heights[upward])
+        areas.append(area[upward])
+    if not heights or sum(len(h) for h in heights) == 0:
+        return fallback
+
+    heights = np.concatenate(heights)
+    areas = np.concatenate(areas)
+    bins = np.floor(heights / SURFACE_BIN).astype(np.int64)
+    bin_ids, inverse = np.unique(bins, return_inverse=True)
+    bin_areas = np.bincount(inverse, weights=areas)
+    substantial = bin_ids[bin_areas >= 0.25 * bin_areas.max()]
+    top_bin = substantial.max()
+    return float(heights[bins == top_bin].max())
+
+def compute_manifest(meshes):
+    """Manifest for an asset from its meshes in root space.
+
+    meshes: list of {"positions" (N, 3), "loop_vertices", "face_sizes"}
+    """
+    points = np.concatenate([mesh["positions"] for mesh in meshes]) if meshes else np.zeros((0, 3))
+    if len(points) == 0:
+        aabb_min = aabb_max = [0.0, 0.0, 0.0]
+    else:
+        aabb_min = points.min(axis=0).tolist()
+        aabb_max = points.max(axis=0).tolist()
+
+    return {
+        "aabb_min": aabb_min,
+        "aabb_max": aabb_max,
+        "lowest_z": aabb_min[2],
+        "footprint": footprint_polygon(points[:, :2]),
+        "vertex_count": int(len(points)),
+        "face_count": int(sum(len(mesh["face_sizes"]) for mesh in meshes)),
+        "top_surface_height": top_surface_height(meshes, aabb_max[2]),
+    }
+
+def tag_root(root, manifest):
+    """Store the manifest bounds on an asset root"""
+    root[AABB_MIN_KEY] = list(manifest["aabb_min"])
+    root[AABB_MAX_KEY] = list(manifest["aabb_max"])
+    root[TOP_SURFACE_KEY] = manifest["top_surface_height"]
+
+def aabb_corners(aabb_min, aabb_max):
+    """The 8 corners of a box as homogeneous columns, shape (4, 8)"""
+    xs, ys, zs = zip(aabb_min, aabb_max)
+    corners = np.array([(x, y, z, 1.0) for x in xs for y in ys for z in zs])
+    return corners.T
+
+def tagged_world_bounds(obj, matrix=None):
+    """World-space (min, max) of a tagged root's box, or None if the object has no manifest.
+
+    matrix defaults to obj.matrix_world; pass obj.matrix_basis for a root
+    whose transform changed since the last depsgraph update.
+    """
+    aabb_min = obj.get(AABB_MIN_KEY)
+    aabb_max = obj.get(AABB_MAX_KEY)
+    if aabb_min is None or aabb_max is None:
+        return None
+    matrix = np.array(matrix if matrix is not None else obj.matrix_world, dtype=np.float64)
+    corners = (matrix @ aabb_corners(list(aabb_min), list(aabb_max)))[:3]
+    return corners.min(axis=1), corners.max(axis=1)
+
+class ManifestStore:
+    """JSON sidecar manifests, one per asset file, valid for one geometry key"""
+
+    def __init__(self, manifest_dir):
+        self.manifest_dir = manifest_dir
+
+    def _path(self, filename):
+        return os.path.join(self.manifest_dir, f"{filename}.json")
+
+    def load(self, filename, key):
+        """Manifest for the asset, or None if missing or built from other sources"""
+        try:
+            with open(self._path(filename), "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get("key") == key else None
+
+    def save(self, filename, key, manifest):
+        """Write a manifest atomically"""
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        manifest = dict(manifest, key=key, file=filename)
+        tmp_path = self._path(filename) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self._path(filename))
+        return manifest
@@ -0,0 +1,205 @@
+"""Precompiled .blend asset pack built from the OBJ furniture catalog"""
+
+import os
+import json
+import time
+import hashlib
+import bpy
+from . import config
+from .layout_core import FurnitureCatalog
+from .asset_library import ASSET_KEY
+from .lod import lod_meshes
+
+# Bump when the build changes what goes into the pack (normalization, materials)
+ASSET_PACK_VERSION = 2
+
+def _file_sha256(path):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _catalog_hash(furniture_info):
+    """Hash of the catalog entry, so scale or rotation changes rebuild the asset"""
+    return hashlib.sha256(json.dumps(furniture_info, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def _stat_key(path):
+    """(size, mtime) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime)
+
+def _source_files(models_path, filename):
+    """The OBJ and, when present, its MTL sidecar"""
+    obj_path = os.path.join(models_path, filename)
+    mtl_path = os.path.splitext(obj_path)[0] + ".mtl"
+    return [path for path in (obj_path, mtl_path) if os.path.exists(path)]
+
+class AssetPack:
+    """A .blend file of normalized, material-assigned furniture plus a JSON manifest.
+
+    The manifest records the pack version, the Blender version that built
+    it and, per catalog file, the size, mtime and SHA-256 of every source
+    file plus a hash of the catalog entry. The pack is current only if
+    all of those still match; sizes and mtimes are compared first so the
+    common case does not re-hash the OBJ files, and the answer is reused
+    until a size, mtime or catalog entry changes.
+    """
+
+    def __init__(self, pack_path=None, models_path=None):
+        self.pack_path = pack_path or config.ASSET_PACK_PATH
+        self.manifest_path = os.path.splitext(self.pack_path)[0] + ".json"
+        self.models_path = models_path or config.MODELS_PATH
+        self._manifest = None
+        self._current = None
+        self._current_stamp = None
+
+    def _stamp(self):
+        """Sizes and mtimes of the pack, its manifest and every source, plus the catalog hashes"""
+        stamp = [_stat_key(self.pack_path), _stat_key(self.manifest_path)]
+        for filename, furniture_info in sorted(FurnitureCatalog.FURNITURE_DATA.items()):
+            sources = tuple((path, _stat_key(path)) for path in _source_files(self.models_path, filename))
+            stamp.append((filename, _catalog_hash(furniture_info), sources))
+        return tuple(stamp)
+
+    def load_manifest(self):
+        """Manifest dict, or None if the pack has not been built"""
+        if self._manifest is None:
+            try:
+                with open(self.manifest_path, "r") as f:
+                    self._manifest = json.load(f)
+            except (OSError, ValueError):
+                return None
+        return self._manifest
+
+    def _fingerprint(self, filename, previous=None):
+        """Size, mtime and hash of an asset's sources; hashes are reused when size and mtime match"""
+        sources = {}
+        for path in _source_files(self.models_path, filename):
+            stat = os.stat(path)
+            name = os.path.basename(path)
+            known = (previous or {}).get(name)
+            if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime:
+                sha256 = known["sha256"]
+            else:
+                sha256 = _file_sha256(path)
+            sources[name] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha256}
+        return sources
+
+    def is_current(self):
+        """True if the pack exists and was built from the current sources and catalog"""
+        stamp = self._stamp()
+        if self._current is not None and stamp == self._current_stamp:
+            return self._current
+        if self._current_stamp is not None and stamp[1] != self._current_stamp[1]:
+            self._manifest = None  # Rebuilt by another session
+
+        manifest = self.load_manifest()
+        self._current = False
+        self._current_stamp = stamp
+        if manifest is None or not os.path.exists(self.pack_path):
+            return False
+        if manifest.get("version") != ASSET_PACK_VERSION:
+            return False
+
+        assets = manifest.get("assets", {})
+        for filename, furniture_info in FurnitureCatalog.FURNITURE_DATA.items():
+            entry = assets.get(filename)
+            if entry is None or entry["catalog"] != _catalog_hash(furniture_info):
+                return False
+            current = self._fingerprint(filename, entry["sources"])
+            if {name: src["sha256"] for name, src in current.items()} != \
+                    {name: src["sha256"] for name, src in entry["sources"].items()}:
+                return False
+
+        self._current = True
+        return True
+
+    def load(self, filename):
+        """Append an asset's object hierarchy from the pack and return its root, or None"""
+        manifest = self.load_manifest()
+        entry = (manifest or {}).get("assets", {}).get(filename)
+        if entry is None:
+            return None
+
+        with bpy.data.libraries.load(self.pack_path, link=False) as (data_from, data_to):
+            data_to.objects = [name for name in entry["objects"] if name in data_from.objects]
+
+        # Appended names can change on clashes; find the root by its tag
+        objects = [obj for obj in data_to.objects if obj is not None]
+        root = next((obj for obj in objects if obj.parent is None and obj.get(ASSET_KEY) == filename), None)
+        if root is None:
+            return None
+
+        for obj in objects:
+            bpy.context.collection.objects.link(obj)
+        print(f"  Loaded {filename} from asset pack")
+        return root
+
+    def build(self, force=False):
+        """Import, normalize and texture every catalog asset and write the pack.
+
+        Meant for a background Blender session (see build_asset_pack.py);
+        it clears the current scene. Returns True if the pack was rebuilt.
+        """
+        if not force and self.is_current():
+            print(f"Asset pack is up to date: {self.pack_path}")
+            return False
+
+        # Import here: scene_generator imports furniture_placement, which imports this module
+        from .scene_generator import PhiloSceneGenerator
+        generator = PhiloSceneGenerator()
+        generator.clear_scene()
+        manager = generator.furniture_manager
+        manager.models_path = self.models_path
+
+        previous = (self.load_manifest() or {}).get("assets", {})
+        assets = {}
+        datablocks = set()
+        start = time.time()
+        for filename, furniture_info in FurnitureCatalog.FURNITURE_DATA.items():
+            print(f"Building {filename}...")
+            root = manager._import_and_normalize(filename, furniture_info)
+            if root is None:
+                print(f"  Skipped {filename}: import failed")
+                continue
+            generator._apply_smart_materials(root, furniture_info)
+
+            hierarchy = [root] + list(root.children_recursive)
+            root.name = f"Asset_{filename}"
+            root[ASSET_KEY] = filename
+            for obj in hierarchy:
+                if obj.data is not None:
+                    obj.data[ASSET_KEY] = filename
+                    for proxy in lod_meshes(obj.data).values():
+                        proxy[ASSET_KEY] = filename
+            datablocks.update(hierarchy)
+
+            assets[filename] = {
+                "objects": [obj.name for obj in hierarchy],
+                "catalog": _catalog_hash(furniture_info),
+                "sources": self._fingerprint(filename, previous.get(filename, {}).get("sources")),
+            }
+
+        os.makedirs(os.path.dirname(self.pack_path), exist_ok=True)
+        bpy.data.libraries.write(self.pack_path, datablocks, path_remap='ABSOLUTE', fake_user=True)
+
+        manifest = {
+            "version": ASSET_PACK_VERSION,
+            "blender": bpy.app.version_string,
+            "built": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "assets": assets,
+        }
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+        self._manifest = manifest
+        self._current = None
+        print(f"Built asset pack with {len(assets)} assets in {time.time() - start:.1f}s: {self.pack_path}")
+        return True
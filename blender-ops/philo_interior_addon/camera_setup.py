@@ -4,6 +4,8 @@ import bpy
 import math
 from mathutils import Vector
 from . import config
+from .asset_manifest import tagged_world_bounds
+from .geometry_stats import hierarchy_stats
 
 class CameraManager:
     def __init__(self):
@@ -61,24 +63,18 @@ class CameraManager:
     
     def get_target_center(self, target_obj):
         """Get the center point of a target object or group"""
-        if target_obj.type == 'EMPTY':
-            # Get center of all children
-            points = []
-            for child in target_obj.children:
-                if child.type == 'MESH':
-                    bbox = [child.matrix_world @ Vector(corner) for corner in child.bound_box]
-                    points.extend(bbox)
-            
-            if points:
-                min_co = Vector((min(p.x for p in points), 
-                               min(p.y for p in points), 
-                               min(p.z for p in points)))
-                max_co = Vector((max(p.x for p in points), 
-                               max(p.y for p in points), 
-                               max(p.z for p in points)))
-                return (min_co + max_co) / 2
-        else:
-            # Single object
+        # Assets with a manifest: center of their transformed bounding box
+        bounds = tagged_world_bounds(target_obj)
+        if bounds is not None:
+            return Vector(((bounds[0] + bounds[1]) / 2).tolist())
+        
+        # Meshes of the object and its children: center of their world-space vertex extents
+        stats = hierarchy_stats(target_obj)
+        if stats is not None:
+            return Vector(((stats["min"] + stats["max"]) / 2).tolist())
+        
+        if target_obj.type != 'EMPTY':
+            # Single non-mesh object
             bbox = [target_obj.matrix_world @ Vector(corner) for corner in target_obj.bound_box]
             min_co = Vector((min(p.x for p in bbox), 
                            min(p.y for p in bbox), 
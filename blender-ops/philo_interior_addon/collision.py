@@ -0,0 +1,147 @@
+"""Oriented bounding box collision tests for furniture footprints"""
+
+import numpy as np
+
+# Tolerance so footprints that exactly touch are not reported as overlapping
+TOUCH_EPSILON = 1e-9
+
+def rotated_half_extents(half_extents, rotations):
+    """Axis-aligned half extents of footprints rotated about Z"""
+    half_extents = np.asarray(half_extents, dtype=float)
+    rotations = np.asarray(rotations, dtype=float)
+    cos_r = np.abs(np.cos(rotations))
+    sin_r = np.abs(np.sin(rotations))
+    half_x = half_extents[..., 0] * cos_r + half_extents[..., 1] * sin_r
+    half_y = half_extents[..., 0] * sin_r + half_extents[..., 1] * cos_r
+    return np.stack([half_x, half_y], axis=-1)
+
+def _axis_overlaps(centers_a, half_extents_a, rotations_a,
+                   centers_b, half_extents_b, rotations_b, margin):
+    """Overlap of the two footprint projections on each of the four separating axes"""
+    centers_a = np.asarray(centers_a, dtype=float)
+    centers_b = np.asarray(centers_b, dtype=float)
+    half_a = np.asarray(half_extents_a, dtype=float) + margin
+    half_b = np.asarray(half_extents_b, dtype=float) + margin
+    rotations_a = np.asarray(rotations_a, dtype=float)
+    rotations_b = np.asarray(rotations_b, dtype=float)
+
+    # Local X axis is (cos, sin), local Y axis is (-sin, cos)
+    cos_a, sin_a = np.cos(rotations_a), np.sin(rotations_a)
+    cos_b, sin_b = np.cos(rotations_b), np.sin(rotations_b)
+
+    dx = centers_b[..., 0] - centers_a[..., 0]
+    dy = centers_b[..., 1] - centers_a[..., 1]
+
+    # Dot products between the axes of A and the axes of B
+    ax_bx = np.abs(cos_a * cos_b + sin_a * sin_b)
+    ax_by = np.abs(-cos_a * sin_b + sin_a * cos_b)
+    ay_bx = np.abs(-sin_a * cos_b + cos_a * sin_b)
+    ay_by = np.abs(sin_a * sin_b + cos_a * cos_b)
+
+    ha_x, ha_y = half_a[..., 0], half_a[..., 1]
+    hb_x, hb_y = half_b[..., 0], half_b[..., 1]
+
+    # Projection radii minus the projected center offset on each axis
+    return (
+        ha_x + hb_x * ax_bx + hb_y * ax_by - np.abs(dx * cos_a + dy * sin_a),
+        ha_y + hb_x * ay_bx + hb_y * ay_by - np.abs(-dx * sin_a + dy * cos_a),
+        hb_x + ha_x * ax_bx + ha_y * ay_bx - np.abs(dx * cos_b + dy * sin_b),
+        hb_y + ha_x * ax_by + ha_y * ay_by - np.abs(-dx * sin_b + dy * cos_b),
+    )
+
+def obb_overlap(centers_a, half_extents_a, rotations_a,
+                centers_b, half_extents_b, rotations_b, margin=0.0):
+    """Separating-axis test between two sets of oriented footprints.
+
+    Footprints are rectangles on the floor: a center (x, y), half extents
+    (half width along local X, half depth along local Y) and a rotation
+    about Z in radians. Both sets broadcast against each other, so one
+    candidate can be tested against every placed footprint, or M candidates
+    against N placed footprints with shapes (M, 1) and (1, N).
+    margin inflates every footprint on all sides before testing.
+    Returns a boolean array, True where the footprints overlap.
+    """
+    overlaps = _axis_overlaps(centers_a, half_extents_a, rotations_a,
+                              centers_b, half_extents_b, rotations_b, margin)
+    # Overlapping only if no axis separates them; touching counts as separated
+    return np.minimum.reduce(overlaps) > TOUCH_EPSILON
+
+def obb_penetration(centers_a, half_extents_a, rotations_a,
+                    centers_b, half_extents_b, rotations_b, margin=0.0):
+    """Penetration depth of overlapping footprints, 0 where they are separated.
+
+    The depth is the smallest projection overlap over the separating axes,
+    i.e. how far one footprint must move to stop overlapping the other.
+    Broadcasts like obb_overlap.
+    """
+    overlaps = _axis_overlaps(centers_a, half_extents_a, rotations_a,
+                              centers_b, half_extents_b, rotations_b, margin)
+    return np.maximum(np.minimum.reduce(overlaps), 0.0)
+
+class FootprintSet:
+    """Growable arrays of placed footprints for batched collision tests"""
+
+    def __init__(self, capacity=16):
+        self.count = 0
+        self._centers = np.zeros((capacity, 2))
+        self._half_extents = np.zeros((capacity, 2))
+        self._rotations = np.zeros(capacity)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def centers(self):
+        return self._centers[:self.count]
+
+    @property
+    def half_extents(self):
+        return self._half_extents[:self.count]
+
+    @property
+    def rotations(self):
+        return self._rotations[:self.count]
+
+    def clear(self):
+        """Forget every footprint, keeping the allocated storage"""
+        self.count = 0
+
+    def add(self, center, half_extents, rotation):
+        """Append a footprint and return its index"""
+        if self.count == len(self._rotations):
+            capacity = max(16, self.count * 2)
+            self._centers = np.resize(self._centers, (capacity, 2))
+            self._half_extents = np.resize(self._half_extents, (capacity, 2))
+            self._rotations = np.resize(self._rotations, capacity)
+
+        index = self.count
+        self._centers[index] = center[:2]
+        self._half_extents[index] = half_extents
+        self._rotations[index] = rotation
+        self.count += 1
+        return index
+
+    def update(self, index, center, half_extents, rotation):
+        """Overwrite an existing footprint in place"""
+        self._centers[index] = center[:2]
+        self._half_extents[index] = half_extents
+        self._rotations[index] = rotation
+
+    def _select(self, indices):
+        """Arrays for all footprints, or only for the given indices"""
+        if indices is None:
+            return self.centers, self.half_extents, self.rotations
+        indices = np.asarray(indices, dtype=int)
+        return self._centers[indices], self._half_extents[indices], self._rotations[indices]
+
+    def overlaps(self, center, half_extents, rotation, indices=None, margin=0.0):
+        """Boolean overlap of one footprint against all (or the given) footprints"""
+        centers, halves, rotations = self._select(indices)
+        return obb_overlap(center[:2], half_extents, rotation,
+                           centers, halves, rotations, margin=margin)
+
+    def penetrations(self, center, half_extents, rotation, indices=None, margin=0.0):
+        """Penetration depth of one footprint into all (or the given) footprints"""
+        centers, halves, rotations = self._select(indices)
+        return obb_penetration(center[:2], half_extents, rotation,
+                               centers, halves, rotations, margin=margin)
@@ -7,8 +7,58 @@ PROJECT_ROOT = "/Users/yenju/philo-homes-website"
 BLENDER_OPS_PATH = os.path.join(PROJECT_ROOT, "blender-ops")
 
 # Asset files
+MODELS_PATH = os.path.join(BLENDER_OPS_PATH, "3d-models")
 HDRI_PATH = os.path.join(BLENDER_OPS_PATH, "studio_small_08_4k.exr")
 FABRIC_TEXTURE_PATH = os.path.join(BLENDER_OPS_PATH, "texture", "gray-cloth-fabric.png")
+BURLAP_TEXTURE_PATH = os.path.join(BLENDER_OPS_PATH, "texture", "fabric-burlap.jpg")
+
+# Precompiled .blend furniture pack (build with build_asset_pack.py) and its manifest
+ASSET_PACK_PATH = os.path.join(BLENDER_OPS_PATH, "cache", "philo_assets.blend")
+
+# Solved layouts are cached here, keyed by catalog, room, selection and seed
+LAYOUT_CACHE_DIR = os.path.join(BLENDER_OPS_PATH, "cache", "layouts")
+LAYOUT_CACHE_SIZE = 64  # Layouts kept in memory
+LAYOUT_CACHE_VERSION = 2  # Bump when the layout solvers change, so stale layouts miss
+
+# Normalized furniture geometry, keyed by source file hash and catalog entry
+GEOMETRY_CACHE_DIR = os.path.join(BLENDER_OPS_PATH, "cache", "geometry")
+GEOMETRY_CACHE_MAX_BYTES = 2 * 1024 ** 3
+GEOMETRY_CACHE_MAX_AGE_DAYS = 30
+
+# Per-asset JSON manifests (bounds, footprint, top surface height)
+ASSET_MANIFEST_DIR = os.path.join(BLENDER_OPS_PATH, "cache", "manifests")
+
+# Depsgraph evaluations the commit phase of room generation or a layout change may
+# trigger, from any source: one for the placed transforms (twice that when objects
+# without a manifest are seated from their vertices). Imports and LOD generation in
+# the compute phase are not counted
+DEPSGRAPH_UPDATE_BUDGET = 1
+
+# Decimated LOD proxies: fraction of faces kept per level, generated for meshes with at least LOD_MIN_FACES faces
+LOD_RATIOS = (0.25, 0.05)
+LOD_MIN_FACES = 5000
+# LOD level each render preset shows (0 = full resolution)
+LOD_LEVEL_BY_PRESET = {
+    "preview": 2,
+    "medium": 1,
+    "final": 0
+}
+
+# Procedural catalog materials baked to tiled image maps, keyed by spec hash and resolution
+BAKE_CACHE_DIR = os.path.join(BLENDER_OPS_PATH, "cache", "bakes")
+BAKE_RESOLUTION = 1024
+BAKE_SAMPLES = 16
+# Repeats of the seamless baked tile per UV unit; 1 keeps the procedural pattern's density
+# on meshes whose UVs span the object once
+BAKE_UV_TILES = 1.0
+# Final renders with missing bakes start once the background worker finishes (polled
+# every BAKE_POLL_INTERVAL seconds) without blocking the UI; True blocks the UI until
+# the bakes exist
+BAKE_WAIT_FOR_FINAL = False
+BAKE_POLL_INTERVAL = 1.0
+
+# Baked GLB scenes for the website viewer
+WEB_EXPORT_DIR = os.path.join(BLENDER_OPS_PATH, "exports")
 
 # Room dimensions
 ROOM_SIZE = 12
@@ -52,6 +102,8 @@ MATERIAL_KEYWORDS = {
     "glass": ["glass", "mirror", "crystal"],
     "plastic": ["plastic", "acrylic", "poly"]
 }
+# When a name contains keywords of several types, the type listed first wins
+MATERIAL_KEYWORD_PRIORITY = ["fabric", "leather", "wood", "metal", "glass", "plastic"]
 
 # Render settings
 RENDER_PRESETS = {
@@ -0,0 +1,47 @@
+"""Depsgraph update instrumentation for room generation
+
+Placement computes every final transform first and evaluates the view
+layer once at the end; DepsgraphCounter wraps that commit phase and makes
+regressions visible by counting both the explicit view_layer.update()
+calls made through it and every depsgraph_update_post event (operators
+included) while it is active.
+"""
+
+import bpy
+
+class DepsgraphCounter:
+    """Context manager counting depsgraph updates during a block of work.
+
+    budget: depsgraph evaluations the block is expected to need, from any
+        source; more (or more explicit updates) prints a warning
+    """
+
+    def __init__(self, label, budget=None):
+        self.label = label
+        self.budget = budget
+        self.updates = 0      # view_layer.update() calls made through update()
+        self.evaluations = 0  # depsgraph_update_post events from any source
+
+    def __enter__(self):
+        self.updates = 0
+        self.evaluations = 0
+        bpy.app.handlers.depsgraph_update_post.append(self._on_depsgraph_update)
+        return self
+
+    def __exit__(self, *exc):
+        if self._on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.remove(self._on_depsgraph_update)
+        print(f"Depsgraph during {self.label}: {self.updates} view layer update(s), "
+              f"{self.evaluations} depsgraph evaluation(s)")
+        # Operators and property writes re-evaluate without going through update()
+        if self.budget is not None and max(self.updates, self.evaluations) > self.budget:
+            print(f"  WARNING: {self.label} needed {self.evaluations} depsgraph evaluations "
+                  f"({self.updates} explicit), expected at most {self.budget}")
+
+    def _on_depsgraph_update(self, scene, depsgraph=None):
+        self.evaluations += 1
+
+    def update(self):
+        """Evaluate the view layer and count it"""
+        self.updates += 1
+        bpy.context.view_layer.update()
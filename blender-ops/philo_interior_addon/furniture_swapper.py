@@ -8,6 +8,9 @@ import os
 import json
 from mathutils import Vector
 from .materials import create_material, assign_materials_by_name
+from .material_variants import MATERIAL_TYPE_FAMILIES, assign_family, set_colorway
+from .furniture_placement import FurnitureManager
+from .layout_core import FurnitureCatalog
 
 class FurnitureSwapperAdvanced:
     """Advanced furniture swapping with material preservation and pre-rendering support"""
@@ -28,6 +31,7 @@ class FurnitureSwapperAdvanced:
                         "name": "Wooden Coffee Table", 
                         "file": "table-2.obj",
                         "materials": {"wood": ["*"]},  # * means all parts
+                        "colorways": {"wood": "oak"},
                         "accessories": ["plant_pot", "books"],
                     }
                 ]
@@ -40,6 +44,7 @@ class FurnitureSwapperAdvanced:
                         "name": "Modern Sectional",
                         "file": "sofa-1.obj",
                         "materials": {"fabric": ["cushion", "seat"], "metal": ["legs"]},
+                        "colorways": {"fabric": "charcoal", "metal": "matte_black"},
                         "accessories": ["throw_pillows"],
                     }
                 ]
@@ -65,6 +70,7 @@ class FurnitureSwapperAdvanced:
         }
         
         self.render_cache = {}  # Store pre-rendered views
+        self.furniture_manager = FurnitureManager()  # Shares the scene's asset library
         
     def swap_furniture_with_materials(self, slot_type, option_index):
         """Swap furniture and automatically apply appropriate materials"""
@@ -89,7 +95,8 @@ class FurnitureSwapperAdvanced:
             return False
             
         # Apply materials based on configuration
-        self._apply_configured_materials(furniture_obj, selected_option["materials"])
+        self._apply_configured_materials(furniture_obj, selected_option["materials"],
+                                         selected_option.get("colorways"))
         
         # Add accessories if specified
         if "accessories" in selected_option:
@@ -116,18 +123,12 @@ class FurnitureSwapperAdvanced:
             bpy.data.objects.remove(obj, do_unlink=True)
             
     def _load_furniture(self, filename, slot_name):
-        """Load furniture and tag it with slot information"""
-        filepath = os.path.join(self._get_models_path(), filename)
-        if not os.path.exists(filepath):
-            print(f"Model file not found: {filepath}")
-            return None
-            
-        # Import OBJ
-        old_objects = set(bpy.data.objects)
-        bpy.ops.wm.obj_import(filepath=filepath)
-        new_objects = list(set(bpy.data.objects) - old_objects)
-        
-        if not new_objects:
+        """Place furniture from the asset library and tag it with slot information"""
+        # Imported once per file; later swaps are linked duplicates
+        furniture_info = FurnitureCatalog.get_furniture_info(filename) or {}
+        self.furniture_manager.models_path = self._get_models_path()
+        furniture = self.furniture_manager.instantiate_furniture(filename, furniture_info)
+        if not furniture:
             return None
             
         # Create parent empty
@@ -135,32 +136,55 @@ class FurnitureSwapperAdvanced:
         parent["furniture_slot"] = slot_name
         bpy.context.collection.objects.link(parent)
         
-        # Parent imported objects
-        for obj in new_objects:
-            obj.parent = parent
+        # Parent the placed hierarchy
+        furniture.parent = parent
+        for obj in [furniture] + list(furniture.children_recursive):
             obj["furniture_slot"] = slot_name
             
         return parent
         
-    def _apply_configured_materials(self, furniture_obj, material_config):
-        """Apply materials based on configuration"""
+    def _apply_configured_materials(self, furniture_obj, material_config, colorways=None):
+        """Apply materials based on configuration.
+        
+        Material types with a variant family share the family shader and get
+        their colorway (from colorways, or the family default) as object properties.
+        """
+        colorways = colorways or {}
         for material_type, part_patterns in material_config.items():
-            material = create_material(material_type)
+            family = MATERIAL_TYPE_FAMILIES.get(material_type)
+            material = None if family else create_material(material_type)
             
-            for child in furniture_obj.children:
+            for child in furniture_obj.children_recursive:
                 if child.type != 'MESH':
                     continue
                     
                 # Check if object name matches any pattern
                 for pattern in part_patterns:
                     if pattern == "*" or pattern.lower() in child.name.lower():
-                        # Apply material
-                        if child.data.materials:
+                        child["material_type"] = material_type
+                        if family:
+                            family_name, default_colorway = family
+                            assign_family(child, family_name, colorways.get(material_type, default_colorway))
+                        elif child.data.materials:
                             child.data.materials[0] = material
                         else:
                             child.data.materials.append(material)
                         break
                         
+    def recolor_slot(self, slot_type, material_type, colorway):
+        """Change the colorway of one material type on the furniture at a slot.
+        
+        Only object properties are written: no furniture reload, no new
+        materials. Returns the number of parts recolored.
+        """
+        if slot_type not in self.furniture_variations or material_type not in MATERIAL_TYPE_FAMILIES:
+            return 0
+        slot_name = self.furniture_variations[slot_type]["slot_name"]
+        parts = [obj for obj in bpy.data.objects
+                 if obj.get("furniture_slot") == slot_name and obj.get("material_type") == material_type]
+        family_name, _ = MATERIAL_TYPE_FAMILIES[material_type]
+        return set_colorway(parts, family_name, colorway)
+        
     def _add_accessories(self, furniture_obj, accessory_list):
         """Add accessories to furniture"""
         for accessory_name in accessory_list:
@@ -253,7 +277,7 @@ class FurnitureSwapperAdvanced:
             bpy.context.view_layer.objects.active = bpy.data.objects[state["active_object"]]
 
 
-# Operator for integration with UI
+# Operators for integration with UI
 class FURNITURE_OT_smart_swap(bpy.types.Operator):
     """Smart furniture swapping with material application"""
     bl_idname = "philo.smart_furniture_swap"
@@ -274,8 +298,36 @@ class FURNITURE_OT_smart_swap(bpy.types.Operator):
         return {'FINISHED'}
 
 
+class FURNITURE_OT_set_colorway(bpy.types.Operator):
+    """Recolor furniture at a slot by writing its colorway properties"""
+    bl_idname = "philo.set_furniture_colorway"
+    bl_label = "Set Furniture Colorway"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    slot_type: bpy.props.StringProperty()
+    material_type: bpy.props.StringProperty(default="fabric")
+    colorway: bpy.props.StringProperty()
+    
+    def execute(self, context):
+        swapper = FurnitureSwapperAdvanced()
+        try:
+            recolored = swapper.recolor_slot(self.slot_type, self.material_type, self.colorway)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+            
+        if recolored:
+            self.report({'INFO'}, f"Recolored {recolored} parts to {self.colorway}")
+        else:
+            self.report({'WARNING'}, "No parts to recolor at this slot")
+            
+        return {'FINISHED'}
+
+
 def register():
     bpy.utils.register_class(FURNITURE_OT_smart_swap)
+    bpy.utils.register_class(FURNITURE_OT_set_colorway)
 
 def unregister():
+    bpy.utils.unregister_class(FURNITURE_OT_set_colorway)
     bpy.utils.unregister_class(FURNITURE_OT_smart_swap)
\ No newline at end of file
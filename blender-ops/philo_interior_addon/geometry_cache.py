@@ -0,0 +1,251 @@
+"""Content-addressed cache of normalized furniture geometry
+
+An entry holds the meshes of a furniture piece after the OBJ coordinate
+fix and the catalog scale are baked in, their LOD proxies (see lod) and
+the asset manifest derived from them (see asset_manifest). It is keyed by the SHA-256 of the source
+files and the catalog entry, so a changed OBJ, MTL, scale or rotation
+simply misses and is rebuilt.
+"""
+
+import os
+import json
+import time
+import hashlib
+import bpy
+import numpy as np
+from . import config
+from .asset_pack import _file_sha256, _source_files
+from .obj_mesh import get_or_create_material, mesh_from_arrays
+from .asset_manifest import compute_manifest, tag_root
+from .lod import lod_key, lod_meshes
+
+# Bump when normalization changes what an entry contains
+GEOMETRY_CACHE_VERSION = 3
+
+def _material_spec(material):
+    """Base color, alpha and texture of a material, enough to recreate an imported one"""
+    spec = {"color": None, "alpha": 1.0, "texture": None}
+    if material is None or not material.use_nodes:
+        return spec
+    principled = material.node_tree.nodes.get("Principled BSDF")
+    if principled is None:
+        return spec
+    base_color = principled.inputs["Base Color"]
+    spec["color"] = tuple(base_color.default_value)[:3]
+    spec["alpha"] = principled.inputs["Alpha"].default_value
+    for link in base_color.links:
+        image = getattr(link.from_node, "image", None)
+        if image is not None:
+            spec["texture"] = bpy.path.abspath(image.filepath)
+    return spec
+
+def _read_mesh(mesh, prefix, arrays):
+    """Store a mesh's vertices, loops, faces, UVs and custom normals under prefix"""
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    face_sizes = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", face_sizes)
+    material_indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_indices)
+
+    arrays[f"{prefix}/positions"] = positions.reshape(-1, 3)
+    arrays[f"{prefix}/loop_vertices"] = loop_vertices
+    arrays[f"{prefix}/face_sizes"] = face_sizes
+    arrays[f"{prefix}/material_indices"] = material_indices
+
+    if mesh.uv_layers.active is not None:
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        mesh.uv_layers.active.data.foreach_get("uv", uvs)
+        arrays[f"{prefix}/loop_uvs"] = uvs.reshape(-1, 2)
+
+    if mesh.has_custom_normals:
+        normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+        if hasattr(mesh, "corner_normals"):
+            mesh.corner_normals.foreach_get("vector", normals)  # Blender 4.1+
+        else:
+            mesh.calc_normals_split()
+            mesh.loops.foreach_get("normal", normals)
+        arrays[f"{prefix}/loop_normals"] = normals.reshape(-1, 3)
+
+def capture_hierarchy(root):
+    """Arrays, object records and root-space meshes of a normalized object hierarchy"""
+    bpy.context.view_layer.update()
+    hierarchy = [root] + list(root.children_recursive)
+    index = {obj.name: i for i, obj in enumerate(hierarchy)}
+    root_inverse = np.array(root.matrix_world.inverted(), dtype=np.float64)
+
+    arrays = {}
+    records = []
+    root_meshes = []
+    for i, obj in enumerate(hierarchy):
+        prefix = str(i)
+        arrays[f"{prefix}/matrix_basis"] = np.array(obj.matrix_basis, dtype=np.float32)
+        arrays[f"{prefix}/matrix_parent_inverse"] = np.array(obj.matrix_parent_inverse, dtype=np.float32)
+        materials = []
+        if obj.type == 'MESH' and obj.data is not None:
+            _read_mesh(obj.data, prefix, arrays)
+            for level, proxy in lod_meshes(obj.data).items():
+                _read_mesh(proxy, f"{prefix}/lod{level}", arrays)
+            materials = [(slot.name or "Material", _material_spec(slot)) for slot in obj.data.materials]
+            to_root = root_inverse @ np.array(obj.matrix_world, dtype=np.float64)
+            positions = arrays[f"{prefix}/positions"].astype(np.float64)
+            root_meshes.append({
+                "positions": positions @ to_root[:3, :3].T + to_root[:3, 3],
+                "loop_vertices": arrays[f"{prefix}/loop_vertices"],
+                "face_sizes": arrays[f"{prefix}/face_sizes"],
+            })
+        records.append({
+            "name": obj.name,
+            "parent": index.get(obj.parent.name, -1) if obj is not root and obj.parent else -1,
+            "materials": materials,
+        })
+    return arrays, records, root_meshes
+
+# SHA-256 of source files by (path, size, mtime), so unchanged OBJs are hashed once per session
+_source_hashes = {}
+
+def _source_hash(models_path, filename):
+    """Combined hash of an asset's source files"""
+    parts = []
+    for path in _source_files(models_path, filename):
+        stat = os.stat(path)
+        stamp = (path, stat.st_size, stat.st_mtime)
+        if stamp not in _source_hashes:
+            _source_hashes[stamp] = _file_sha256(path)
+        parts.append(f"{os.path.basename(path)}:{_source_hashes[stamp]}")
+    return "|".join(parts)
+
+class GeometryCache:
+    """One .npz file per normalized asset, evicted by total size and age.
+
+    Reads refresh an entry's mtime, so size eviction drops the least
+    recently used entries first.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None, max_age_days=None):
+        self.cache_dir = cache_dir or config.GEOMETRY_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else config.GEOMETRY_CACHE_MAX_BYTES
+        self.max_age_days = max_age_days if max_age_days is not None else config.GEOMETRY_CACHE_MAX_AGE_DAYS
+
+    def make_key(self, models_path, filename, furniture_info):
+        """Hash of the source files and the catalog entry parts normalization depends on"""
+        payload = {
+            "version": GEOMETRY_CACHE_VERSION,
+            "file": filename,
+            "sources": _source_hash(models_path, filename),
+            "scale": furniture_info.get("scale", 1.0),
+            "initial_rotation": list(furniture_info.get("initial_rotation", (0, 0, 0))),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def has(self, key):
+        """True if an entry exists for the key"""
+        return os.path.exists(self._path(key))
+
+    def load(self, key, collection=None):
+        """Rebuild the cached object hierarchy and return its manifest-tagged root, or None on a miss"""
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in data.files}
+        except (OSError, ValueError):
+            return None
+        os.utime(path)
+
+        meta = json.loads(str(arrays.pop("meta")))
+        collection = collection or bpy.context.collection
+        objects = []
+        for index, entry in enumerate(meta["objects"]):
+            prefix = str(index)
+            data = None
+            if f"{prefix}/positions" in arrays:
+                materials = [get_or_create_material(name, spec) for name, spec in entry["materials"]]
+                data = mesh_from_arrays(
+                    entry["name"],
+                    arrays[f"{prefix}/positions"],
+                    arrays[f"{prefix}/loop_vertices"],
+                    arrays[f"{prefix}/face_sizes"],
+                    arrays[f"{prefix}/material_indices"],
+                    arrays.get(f"{prefix}/loop_uvs"),
+                    arrays.get(f"{prefix}/loop_normals"),
+                    materials
+                )
+                level = 1
+                while f"{prefix}/lod{level}/positions" in arrays:
+                    lod_prefix = f"{prefix}/lod{level}"
+                    data[lod_key(level)] = mesh_from_arrays(
+                        f"{entry['name']}_LOD{level}",
+                        arrays[f"{lod_prefix}/positions"],
+                        arrays[f"{lod_prefix}/loop_vertices"],
+                        arrays[f"{lod_prefix}/face_sizes"],
+                        arrays[f"{lod_prefix}/material_indices"],
+                        arrays.get(f"{lod_prefix}/loop_uvs"),
+                        arrays.get(f"{lod_prefix}/loop_normals"),
+                        materials
+                    )
+                    level += 1
+            obj = bpy.data.objects.new(entry["name"], data)
+            collection.objects.link(obj)
+            if entry["parent"] >= 0:
+                obj.parent = objects[entry["parent"]]
+                obj.matrix_parent_inverse = arrays[f"{prefix}/matrix_parent_inverse"].tolist()
+            obj.matrix_basis = arrays[f"{prefix}/matrix_basis"].tolist()
+            objects.append(obj)
+
+        root = objects[0]
+        tag_root(root, meta["manifest"])
+        return root
+
+    def store(self, key, root):
+        """Write a normalized hierarchy to the cache, tag the root with its manifest and return it"""
+        arrays, records, root_meshes = capture_hierarchy(root)
+        manifest = compute_manifest(root_meshes)
+        arrays["meta"] = np.array(json.dumps({"objects": records, "manifest": manifest}))
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self._path(key) + ".tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, self._path(key))
+        tag_root(root, manifest)
+        self.evict()
+        return manifest
+
+    def evict(self):
+        """Drop entries older than max_age_days, then the least recently used beyond max_bytes"""
+        try:
+            names = [name for name in os.listdir(self.cache_dir) if name.endswith(".npz")]
+        except OSError:
+            return
+        entries = []
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        cutoff = time.time() - self.max_age_days * 86400
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove every cache entry"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".npz"):
+                os.remove(os.path.join(self.cache_dir, name))
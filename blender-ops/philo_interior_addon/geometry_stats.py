@@ -0,0 +1,49 @@
+"""Vectorized mesh statistics: world-space extrema and centroids read with foreach_get
+
+Vertex coordinates are copied into NumPy in one call per mesh and moved to
+world space with a single matrix product, instead of evaluating
+`matrix_world @ v.co` for every vertex in Python. Transforms must be
+current (call view_layer.update() after moving objects).
+"""
+
+import numpy as np
+
+def local_coordinates(mesh):
+    """Vertex coordinates of a mesh, shape (N, 3)"""
+    coordinates = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coordinates)
+    return coordinates.reshape(-1, 3).astype(np.float64)
+
+def world_coordinates(obj, matrix=None):
+    """Vertex coordinates of a mesh object in world space (or under matrix), shape (N, 3)"""
+    matrix = np.array(matrix if matrix is not None else obj.matrix_world, dtype=np.float64)
+    return local_coordinates(obj.data) @ matrix[:3, :3].T + matrix[:3, 3]
+
+def objects_stats(objects):
+    """World-space {"min", "max", "centroid", "count"} over the vertices of the mesh objects, or None"""
+    lows, highs, sums = [], [], []
+    count = 0
+    for obj in objects:
+        if obj.type != 'MESH' or obj.data is None or len(obj.data.vertices) == 0:
+            continue
+        points = world_coordinates(obj)
+        lows.append(points.min(axis=0))
+        highs.append(points.max(axis=0))
+        sums.append(points.sum(axis=0))
+        count += len(points)
+    if count == 0:
+        return None
+    return {
+        "min": np.min(lows, axis=0),
+        "max": np.max(highs, axis=0),
+        "centroid": np.sum(sums, axis=0) / count,
+        "count": count,
+    }
+
+def object_stats(obj):
+    """Statistics of a single mesh object, or None"""
+    return objects_stats([obj])
+
+def hierarchy_stats(root):
+    """Statistics of an object and all of its descendants, or None"""
+    return objects_stats([root] + list(root.children_recursive))
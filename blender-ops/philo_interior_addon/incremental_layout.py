@@ -0,0 +1,175 @@
+"""Incremental re-layout: apply one change and re-solve only the items it affects"""
+
+from .layout_core import FurnitureCatalog, SmartFurniturePlacement
+from .smart_placement_rules import PlacementRules, SmartLayoutGenerator
+
+CHANGE_ACTIONS = ("add", "remove", "resize", "move")
+
+# Layout roles that PlacementRules positions relative to the sofa
+SOFA_DEPENDENTS = ("rug", "coffee_table", "side_table")
+
+def layout_role(furniture_file):
+    """Layout role of a furniture file (sofa, rug, coffee_table, ...), or None"""
+    categories = SmartLayoutGenerator()._categorize_furniture([furniture_file])
+    return next(iter(categories), None)
+
+def _rule_spots(role, room_size, sofa):
+    """Preferred (x, y, z_rotation) spots PlacementRules gives a sofa dependent"""
+    sofa_position = sofa["position"]
+    sofa_rotation = sofa["rotation"][2]
+    if role == "coffee_table":
+        rules = PlacementRules.get_coffee_table_placement(sofa_position, sofa_rotation)
+    elif role == "rug":
+        rules = PlacementRules.get_rug_placement(room_size, sofa_position)
+    else:
+        rules = PlacementRules.get_side_table_placement(
+            room_size, [{"type": "sofa", "position": sofa_position}]
+        )
+    return [(spot["pos"][0], spot["pos"][1], spot["rot"]) for spot in rules["positions"]]
+
+def update_layout(layout, change, room, catalog=None, seed=None):
+    """Apply one change to a solved layout, re-solving only the affected items.
+
+    layout: list of {"file", "position", "rotation"} placements, e.g. from solve_layout
+    room: the room dict solve_layout takes ("size", optionally "polygon")
+    change: {"action": "add" | "remove" | "resize" | "move", "file": ...}
+        move takes "position" and optionally "rotation"; add may give a
+        "position" (otherwise the item is placed by the solver); resize takes
+        "dimensions" ({"width", "height", "depth"}) and keeps the item in place
+    Items are re-solved when they depend on the changed item through
+    PlacementRules (rug, coffee and side table follow the sofa) or when the
+    change leaves them colliding. Everything else keeps its placement.
+    Returns (new_layout, affected): affected lists the files that were
+    added, removed or given a new placement, in layout order.
+    """
+    action = change["action"]
+    if action not in CHANGE_ACTIONS:
+        raise ValueError(f"Unknown layout change: {action}")
+    target = change["file"]
+
+    items = {item["file"]: dict(item) for item in layout}
+    order = [item["file"] for item in layout]
+    if action == "add" and target in items:
+        raise ValueError(f"{target} is already in the layout")
+    if action != "add" and target not in items:
+        raise ValueError(f"{target} is not in the layout")
+
+    # Resized items carry their own dimensions; expose them to the solver
+    catalog = dict(catalog if catalog is not None else FurnitureCatalog.FURNITURE_DATA)
+    if action == "resize":
+        items[target]["dimensions"] = dict(change["dimensions"])
+    for furniture_file, item in items.items():
+        if "dimensions" in item:
+            catalog[furniture_file] = dict(catalog[furniture_file], dimensions=item["dimensions"])
+
+    fixed = []       # Placed by the change itself
+    dirty = set()    # Need a new placement from the solver
+    if action == "remove":
+        del items[target]
+        order.remove(target)
+    elif action == "add":
+        order.append(target)
+        if "position" in change:
+            items[target] = {
+                "file": target,
+                "position": tuple(change["position"]),
+                "rotation": tuple(change.get("rotation", (0, 0, 0)))
+            }
+            fixed.append(target)
+        else:
+            dirty.add(target)
+    elif action == "move":
+        items[target]["position"] = tuple(change["position"])
+        items[target]["rotation"] = tuple(change.get("rotation", items[target]["rotation"]))
+        fixed.append(target)
+    else:
+        fixed.append(target)
+
+    roles = {furniture_file: layout_role(furniture_file) for furniture_file in order}
+
+    # Rule dependencies: moving, adding or removing the sofa drags its dependents along
+    if roles.get(target) == "sofa" and action != "resize":
+        dirty.update(f for f in order if f != target and roles[f] in SOFA_DEPENDENTS)
+
+    def make_placer():
+        return SmartFurniturePlacement(
+            room_size=room["size"],
+            wall_height=room.get("wall_height", 3.2),
+            catalog=catalog,
+            seed=seed,
+            room_polygon=room.get("polygon")
+        )
+
+    placer = make_placer()     # Everything that keeps or gets a placement
+    changed = make_placer()    # Only what the change itself placed
+
+    def register(target_placer, furniture_file):
+        # Rugs lie under furniture, so they never block anything
+        if roles[furniture_file] == "rug":
+            return
+        item = items[furniture_file]
+        target_placer.add_placement({
+            "position": item["position"],
+            "rotation": item["rotation"],
+            "dimensions": catalog[furniture_file]["dimensions"]
+        })
+
+    # The changed item wins; untouched items keep their spot unless it now collides with them
+    for furniture_file in fixed:
+        register(placer, furniture_file)
+        register(changed, furniture_file)
+    for furniture_file in order:
+        if furniture_file in fixed or furniture_file in dirty:
+            continue
+        item = items[furniture_file]
+        if roles[furniture_file] != "rug" and changed.collides(
+                item["position"], catalog[furniture_file]["dimensions"], item["rotation"]):
+            dirty.add(furniture_file)
+        else:
+            register(placer, furniture_file)
+
+    sofa = next((items[f] for f in order if roles[f] == "sofa" and f not in dirty), None)
+    for furniture_file in placer._get_placement_order([f for f in order if f in dirty]):
+        role = roles[furniture_file]
+        spots = _rule_spots(role, room["size"], sofa) if sofa and role in SOFA_DEPENDENTS else None
+
+        if role == "rug" and spots:
+            # The rules assume a square room; keep the rug on the floor of any other shape
+            half_extents = placer._half_extents(catalog[furniture_file]["dimensions"])
+            spots = [spot for spot in spots
+                     if placer.room.contains_footprints([spot[:2]], half_extents, spot[2])[0]]
+        if role == "rug" and spots:
+            x, y, rotation = spots[0]
+            placement = {
+                "position": (x, y, catalog[furniture_file]["placement"]["height"]),
+                "rotation": (0, 0, rotation)
+            }
+        else:
+            placement = placer.place_item(furniture_file, preferred=spots)
+
+        if placement is None:
+            if furniture_file not in items:
+                print(f"Could not place {furniture_file}, leaving it out of the layout")
+                order.remove(furniture_file)
+                continue
+            print(f"Could not re-place {furniture_file}, keeping its previous spot")
+            placement = items[furniture_file]
+
+        item = items.setdefault(furniture_file, {"file": furniture_file})
+        item["position"] = placement["position"]
+        item["rotation"] = placement["rotation"]
+        register(placer, furniture_file)
+        if role == "sofa":
+            sofa = item
+
+    new_layout = [items[f] for f in order]
+    previous = {item["file"]: item for item in layout}
+    affected = [
+        item["file"] for item in new_layout
+        if item["file"] not in previous
+        or item["position"] != previous[item["file"]]["position"]
+        or item["rotation"] != previous[item["file"]]["rotation"]
+        or item.get("dimensions") != previous[item["file"]].get("dimensions")
+    ]
+    affected.extend(f for f in previous if f not in items)
+    return new_layout, affected
@@ -0,0 +1,111 @@
+"""Persistent cache of solved layouts keyed by catalog, room, selection and seed"""
+
+import os
+import copy
+import json
+import hashlib
+from collections import OrderedDict
+from . import config
+
+class LayoutCache:
+    """LRU cache of layouts in memory, backed by one JSON file per key on disk.
+
+    Memory holds the most recently used layouts; anything evicted from
+    memory is still found on disk, which survives Blender restarts. The
+    disk store is trimmed to max_disk_entries by last use as well.
+    """
+
+    def __init__(self, cache_dir, max_entries=64, max_disk_entries=1024):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.entries = OrderedDict()  # key -> layout, least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(catalog, room, selection, seed):
+        """Stable hash of everything that determines a layout, including the solver version"""
+        payload = json.dumps({
+            "version": config.LAYOUT_CACHE_VERSION,
+            "catalog": catalog,
+            "room": room,
+            "selection": list(selection),
+            "seed": seed,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remember(self, key, layout):
+        """Store in memory as most recently used, evicting the oldest entries"""
+        self.entries[key] = layout
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get(self, key):
+        """Copy of the cached layout for key, or None"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(self.entries[key])
+
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                layout = json.load(f)
+            os.utime(path)  # Mark as recently used for disk eviction
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        # JSON turns tuples into lists; placements use tuples
+        layout = [
+            {name: tuple(value) if isinstance(value, list) else value for name, value in item.items()}
+            for item in layout
+        ]
+        self._remember(key, layout)
+        self.hits += 1
+        return copy.deepcopy(layout)
+
+    def put(self, key, layout):
+        """Cache a copy of a layout in memory and on disk"""
+        self._remember(key, copy.deepcopy(layout))
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._path(key) + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(layout, f)
+            os.replace(tmp_path, self._path(key))
+            self._trim_disk()
+        except OSError as e:
+            print(f"Could not write layout cache: {e}")
+
+    def _trim_disk(self):
+        """Delete the least recently used files beyond max_disk_entries"""
+        files = [os.path.join(self.cache_dir, name)
+                 for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_disk_entries]:
+            os.remove(path)
+
+    def clear(self):
+        """Drop every cached layout from memory and disk"""
+        self.entries.clear()
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+_shared_cache = None
+
+def get_layout_cache():
+    """Process-wide cache, so the memory LRU outlives each generator instance"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = LayoutCache(config.LAYOUT_CACHE_DIR, max_entries=config.LAYOUT_CACHE_SIZE)
+    return _shared_cache
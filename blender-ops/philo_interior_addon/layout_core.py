@@ -0,0 +1,617 @@
+"""Headless furniture layout engine, importable without Blender
+
+Everything in this module is pure geometry: the furniture catalog, the
+smart placement algorithm and the rule/expert based layout generators.
+Layout workers and benchmarks can import it from a plain Python process
+and skip Blender's startup entirely; FurnitureManager only turns the
+resulting layout into objects.
+"""
+
+import math
+import random
+import numpy as np
+from . import collision
+from .spatial_index import FootprintGrid
+from .occupancy import OccupancyGrid
+from .room_geometry import RoomPolygon
+from .expert_interior_design import ExpertInteriorLayout
+from .smart_placement_rules import PlacementRules, SmartLayoutGenerator
+from .layout_optimizer import LayoutAnnealer
+
+class FurnitureCatalog:
+    """Catalog of available furniture with placement characteristics"""
+    
+    FURNITURE_DATA = {
+        "painting-1.obj": {
+            "type": "wall_decor",
+            "category": "decor",
+            "dimensions": {"width": 1.2, "height": 0.9, "depth": 0.05},
+            "scale": 0.6,  # Scale factor for realistic size
+            "initial_rotation": (0, 0, 0),  # Based on reference image
+            "placement": {
+                "zone": "wall",
+                "wall_distance": 0.05,  # Very close to wall
+                "height": 1.5,  # Eye level
+                "orientation": "wall_aligned"
+            }
+        },
+        "pot-1.obj": {
+            "type": "floor_decor",
+            "category": "decor", 
+            "dimensions": {"width": 0.3, "height": 0.6, "depth": 0.3},
+            "scale": 0.3,  # Scale down for realistic pot size
+            "initial_rotation": (0, 0, 0),  # Based on reference image
+            "placement": {
+                "zone": "corner",
+                "wall_distance": 0.3,
+                "height": 0.0,
+                "orientation": "fixed"  # No rotation
+            }
+        },
+        "rug-1.obj": {
+            "type": "floor_decor",
+            "category": "floor_decor",
+            "dimensions": {"width": 2.5, "height": 0.02, "depth": 1.8},
+            "scale": 1.25,  # Slightly larger
+            "initial_rotation": (0, 0, 0),  # Based on reference image
+            "placement": {
+                "zone": "center",
+                "wall_distance": 1.0,
+                "height": 0.001,  # Just above floor
+                "orientation": "fixed"
+            }
+        },
+        "shelf-1.obj": {
+            "type": "storage",
+            "category": "storage",
+            "dimensions": {"width": 0.8, "height": 1.8, "depth": 0.35},
+            "scale": 0.9,  # Realistic shelf size
+            "initial_rotation": (0, 0, 0),  # Based on reference image
+            "placement": {
+                "zone": "wall",
+                "wall_distance": 0.02,
+                "height": 0.0,
+                "orientation": "wall_aligned"
+            }
+        },
+        "sofa-1.obj": {
+            "type": "seating",
+            "category": "seating",
+            "dimensions": {"width": 2.2, "height": 0.85, "depth": 0.9},
+            "scale": 1.1,  # Realistic sofa size
+            "initial_rotation": (0, 0, 0),  # Correct orientation after -90X fix
+            "placement": {
+                "zone": "wall",
+                "wall_distance": 0.3,
+                "height": 0.0,
+                "orientation": "wall_aligned"
+            }
+        },
+        "table-1.obj": {
+            "type": "side_table",
+            "category": "table",
+            "dimensions": {"width": 0.5, "height": 0.5, "depth": 0.5},
+            "scale": 0.5,  # Smaller scale for realistic side table
+            "initial_rotation": (math.pi/2, 0, math.pi/2),  # 90° X rotation + 90° Z rotation
+            "placement": {
+                "zone": "center",
+                "wall_distance": 0.8,
+                "height": 0.0,
+                "orientation": "fixed"
+            }
+        },
+        "table-2.obj": {
+            "type": "coffee_table",
+            "category": "table",
+            "dimensions": {"width": 1.2, "height": 0.4, "depth": 0.6},
+            "scale": 0.7,  # Smaller scale for realistic coffee table
+            "initial_rotation": (0, 0, math.pi/2),  # Rotate 90° to fix orientation
+            "placement": {
+                "zone": "center",
+                "wall_distance": 0.8,
+                "height": 0.0,
+                "orientation": "fixed"
+            }
+        }
+    }
+    
+    @classmethod
+    def get_furniture_info(cls, filename):
+        """Get furniture information by filename"""
+        return cls.FURNITURE_DATA.get(filename, None)
+    
+    @classmethod
+    def get_all_furniture(cls):
+        """Get list of all available furniture"""
+        return list(cls.FURNITURE_DATA.keys())
+
+class SmartFurniturePlacement:
+    """Smart furniture placement algorithm"""
+    
+    # Clearance added around every footprint, so placed objects keep a 0.2m gap
+    COLLISION_MARGIN = 0.1
+    
+    # Spacing between generated wall, corner and center candidates (meters)
+    CANDIDATE_STEP = 0.25
+    
+    # Seeded noise added to zone candidate scores (meters of preference), so each seed
+    # slides items along their wall, corner or center spot; far below the wall and corner
+    # rank steps, which stay in order
+    SCORE_JITTER = 0.5
+    
+    def __init__(self, room_size=6, wall_height=3.2, catalog=None, seed=None, room_polygon=None):
+        # A floor polygon replaces the square room; vertices or a RoomPolygon
+        if room_polygon is not None and not isinstance(room_polygon, RoomPolygon):
+            room_polygon = RoomPolygon(room_polygon)
+        self.room_polygon = room_polygon
+        self.room = room_polygon if room_polygon is not None else RoomPolygon.square(room_size)
+        if room_polygon is not None:
+            room_size = room_polygon.size
+        
+        self.room_size = room_size  # Compact room
+        self.wall_height = wall_height
+        self.catalog = catalog if catalog is not None else FurnitureCatalog.FURNITURE_DATA
+        self.rng = random.Random(seed)  # Private RNG so equal seeds give equal layouts
+        self.score_rng = np.random.default_rng(self.rng.getrandbits(64))
+        self.placed_objects = []
+        self.placement_index = FootprintGrid(cell_size=0.5)
+        self.footprints = collision.FootprintSet()
+        if room_polygon is not None:
+            self.floor_bounds = {
+                "min_x": float(room_polygon.min_xy[0]),
+                "max_x": float(room_polygon.max_xy[0]),
+                "min_y": float(room_polygon.min_xy[1]),
+                "max_y": float(room_polygon.max_xy[1])
+            }
+        else:
+            self.floor_bounds = {
+                "min_x": -room_size/2 + 0.3,
+                "max_x": room_size/2 - 0.3,
+                "min_y": -room_size/2 + 0.3,
+                "max_y": room_size/2 - 0.3
+            }
+        self.occupancy = OccupancyGrid(self.floor_bounds, resolution=0.05, room_polygon=room_polygon)
+    
+    def select_furniture(self, furniture_count=5):
+        """Pick furniture_count files: a sofa, a table and a decoration first, then random ones"""
+        available_furniture = list(self.catalog.keys())
+        print(f"Available furniture: {available_furniture}")
+        
+        # Ensure we have at least one sofa, one table, and one decoration
+        essential_furniture = []
+        
+        # Find essential pieces
+        sofa = next((f for f in available_furniture if "sofa" in f.lower()), None)
+        table = next((f for f in available_furniture if "table" in f.lower()), None)
+        decor = next((f for f in available_furniture if "painting" in f.lower() or "pot" in f.lower()), None)
+        
+        if sofa: essential_furniture.append(sofa)
+        if table: essential_furniture.append(table)
+        if decor: essential_furniture.append(decor)
+        
+        print(f"Essential furniture selected: {essential_furniture}")
+        
+        # Fill remaining slots with random furniture
+        remaining_slots = furniture_count - len(essential_furniture)
+        remaining_furniture = [f for f in available_furniture if f not in essential_furniture]
+        
+        if remaining_slots > 0 and remaining_furniture:
+            additional = self.rng.sample(remaining_furniture, min(remaining_slots, len(remaining_furniture)))
+            essential_furniture.extend(additional)
+        
+        print(f"Total furniture to place: {essential_furniture}")
+        return essential_furniture
+    
+    def generate_random_layout(self, furniture_count=5, furniture_files=None):
+        """Generate a random furniture layout (of furniture_files if given)"""
+        if furniture_files is None:
+            furniture_files = self.select_furniture(furniture_count)
+        
+        # Reset placed objects for new generation
+        self.reset_placements()
+        
+        # Prioritize placement order
+        placement_order = self._get_placement_order(furniture_files)
+        print(f"Placement order: {placement_order}")
+        
+        layout = []
+        for furniture_file in placement_order:
+            placement = self._find_optimal_placement(furniture_file)
+            if placement:
+                layout.append({
+                    "file": furniture_file,
+                    "position": placement["position"],
+                    "rotation": placement["rotation"]
+                })
+                self.add_placement(placement)
+                print(f"Found placement for {furniture_file}")
+            else:
+                print(f"Could not find valid placement for {furniture_file}")
+        
+        print(f"Final layout has {len(layout)} items")
+        return layout
+    
+    def generate_expert_layout(self, furniture_files):
+        """Expert fixed positions for furniture_files, with greedy placement for the rest.
+        
+        The expert positions assume the square room: a file with no expert
+        position, or whose position leaves the floor polygon, goes through
+        the zone search around the expert-placed items instead.
+        """
+        self.reset_placements()
+        expert = SmartLayoutGenerator(room_size=self.room_size).generate_layout(furniture_files)
+        spots = {item["file"]: item for item in expert}
+        
+        layout = []
+        leftover = []
+        for furniture_file in furniture_files:
+            item = spots.get(furniture_file)
+            furniture_info = self.catalog.get(furniture_file)
+            if item is None or not furniture_info:
+                leftover.append(furniture_file)
+                continue
+            
+            dimensions = furniture_info["dimensions"]
+            if self.room_polygon is not None and not self.room_polygon.contains_footprints(
+                    [item["position"][:2]], self._half_extents(dimensions), item["rotation"][2])[0]:
+                print(f"Expert position for {furniture_file} is off the floor")
+                leftover.append(furniture_file)
+                continue
+            
+            layout.append(item)
+            self.add_placement({"position": item["position"], "rotation": item["rotation"], "dimensions": dimensions})
+        
+        for furniture_file in self._get_placement_order(leftover):
+            placement = self._find_optimal_placement(furniture_file)
+            if placement:
+                layout.append({
+                    "file": furniture_file,
+                    "position": placement["position"],
+                    "rotation": placement["rotation"]
+                })
+                self.add_placement(placement)
+                print(f"Found placement for {furniture_file}")
+            else:
+                print(f"Could not find valid placement for {furniture_file}")
+        
+        return layout
+    
+    def reset_placements(self):
+        """Forget all placed objects and empty the collision index"""
+        self.placed_objects = []
+        self.placement_index.clear()
+        self.footprints.clear()
+        self.occupancy.clear()
+    
+    def add_placement(self, placement):
+        """Record a placed object and add its footprint to the collision index"""
+        index = len(self.placed_objects)
+        self.placed_objects.append(placement)
+        
+        position = placement["position"]
+        dimensions = placement["dimensions"]
+        rotation = self._z_rotation(placement["rotation"])
+        self.footprints.add(position, self._half_extents(dimensions), rotation)
+        half_width, half_depth = self._half_extents(dimensions)
+        self.occupancy.add_footprint(
+            position,
+            (half_width + self.COLLISION_MARGIN, half_depth + self.COLLISION_MARGIN),
+            rotation
+        )
+        self.placement_index.insert(index, *self._footprint_bounds(position, dimensions, rotation))
+    
+    def place_item(self, furniture_file, preferred=None):
+        """Placement for one item, trying preferred (x, y, z_rotation) spots before its zone search"""
+        furniture_info = self.catalog.get(furniture_file)
+        if not furniture_info:
+            return None
+        
+        if preferred:
+            # Earlier preferred spots score higher
+            placement = self._choose_best_candidate(
+                [np.array([spot[:2] for spot in preferred], dtype=float)],
+                [np.array([spot[2] for spot in preferred], dtype=float)],
+                [-np.arange(len(preferred), dtype=float)],
+                furniture_info["dimensions"],
+                furniture_info["placement"]["height"]
+            )
+            if placement:
+                return placement
+        
+        return self._find_optimal_placement(furniture_file)
+    
+    def collides(self, position, dimensions, rotation):
+        """True if a footprint overlaps anything placed so far, including the safety gap"""
+        if not len(self.footprints):
+            return False
+        return bool(self.footprints.overlaps(
+            position, self._half_extents(dimensions), self._z_rotation(rotation),
+            margin=self.COLLISION_MARGIN
+        ).any())
+    
+    def _get_placement_order(self, furniture_list):
+        """Determine optimal placement order"""
+        priority_order = {
+            "wall_decor": 1,    # Paintings first
+            "storage": 2,       # Shelves second  
+            "seating": 3,       # Sofa third
+            "table": 4,         # Tables fourth
+            "floor_decor": 5    # Decorative items last
+        }
+        
+        def get_priority(filename):
+            furniture_info = self.catalog.get(filename)
+            return priority_order.get(furniture_info["category"], 10)
+        
+        return sorted(furniture_list, key=get_priority)
+    
+    def _find_optimal_placement(self, furniture_file):
+        """Find optimal placement for a piece of furniture"""
+        furniture_info = self.catalog.get(furniture_file)
+        if not furniture_info:
+            return None
+        
+        placement_zone = furniture_info["placement"]["zone"]
+        
+        if placement_zone == "wall":
+            return self._place_against_wall(furniture_info)
+        elif placement_zone == "corner":
+            return self._place_in_corner(furniture_info)
+        elif placement_zone == "center":
+            return self._place_in_center(furniture_info)
+        else:
+            return self._place_anywhere(furniture_info)
+    
+    def _place_against_wall(self, furniture_info):
+        """Place furniture against a wall"""
+        dims = furniture_info["dimensions"]
+        wall_distance = furniture_info["placement"]["wall_distance"]
+        height = furniture_info["placement"]["height"]
+        
+        # Slide along each wall; earlier walls and spots near the wall middle score higher
+        positions, rotations, ranks, slides = self.room.wall_candidates(
+            wall_distance + dims["depth"]/2, self.CANDIDATE_STEP
+        )
+        scores = self._jitter(-ranks * self.room_size - np.abs(slides))
+        
+        return self._choose_best_candidate([positions], [rotations], [scores], dims, height)
+    
+    def _place_in_corner(self, furniture_info):
+        """Place furniture in a corner"""
+        dims = furniture_info["dimensions"]
+        height = furniture_info["placement"]["height"]
+        
+        # Grid of insets along both corner walls; earlier corners and tighter insets score higher
+        steps = np.arange(0.5, 1.5 + 1e-9, self.CANDIDATE_STEP)
+        inset_a, inset_b = (a.ravel() for a in np.meshgrid(steps, steps))
+        positions, rotations, scores = [], [], []
+        for rank, corner in enumerate(self.room.corners()):
+            along_a, along_b = corner["along"]
+            positions.append(np.asarray(corner["position"]) +
+                             inset_a[:, None] * along_a + inset_b[:, None] * along_b)
+            rotations.append(np.full(len(inset_a), corner["rotation"]))
+            scores.append(self._jitter(-rank * self.room_size - np.hypot(inset_a - 0.5, inset_b - 0.5)))
+        
+        if not positions:
+            return None
+        return self._choose_best_candidate(positions, rotations, scores, dims, height)
+    
+    def _place_in_center(self, furniture_info):
+        """Place furniture in center area"""
+        dims = furniture_info["dimensions"]
+        height = furniture_info["placement"]["height"]
+        orientation = furniture_info["placement"]["orientation"]
+        
+        # Fixed orientation keeps rotation 0, others may turn in 45 degree steps
+        if orientation == "fixed":
+            angles = np.zeros(1)
+        else:
+            angles = np.arange(8) * math.pi/4
+        
+        # Grid around the preferred spot slightly back from center (the centroid of a polygon room)
+        if self.room_polygon is not None:
+            origin = preferred = np.array(self.room_polygon.centroid)
+        else:
+            origin, preferred = np.zeros(2), np.array((0, -0.5))
+        offsets = self._candidate_offsets(1.5)
+        grid_x, grid_y = (a.ravel() for a in np.meshgrid(offsets, offsets))
+        grid = origin + np.stack([grid_x, grid_y], axis=1)
+        distance = np.hypot(grid[:, 0] - preferred[0], grid[:, 1] - preferred[1])
+        
+        positions = np.repeat(grid, len(angles), axis=0)
+        rotations = np.tile(angles, len(grid))
+        scores = self._jitter(np.repeat(-distance, len(angles)))
+        
+        return self._choose_best_candidate([positions], [rotations], [scores], dims, height)
+    
+    def _candidate_offsets(self, extent):
+        """Offsets from -extent to extent in CANDIDATE_STEP increments"""
+        count = int(round(extent / self.CANDIDATE_STEP))
+        return np.arange(-count, count + 1) * self.CANDIDATE_STEP
+    
+    def _jitter(self, scores):
+        """Scores plus the seed's noise"""
+        return scores + self.score_rng.uniform(0.0, self.SCORE_JITTER, len(scores))
+    
+    def _choose_best_candidate(self, positions, rotations, scores, dimensions, height):
+        """Validate all candidates in one pass and return the best scoring one"""
+        positions = np.concatenate(positions)
+        rotations = np.concatenate(rotations)
+        scores = np.concatenate(scores)
+        
+        valid = self._valid_candidates(positions, rotations, dimensions)
+        if not valid.any():
+            return None
+        
+        # Highest score wins; ties go to the earliest candidate
+        best = np.flatnonzero(valid)[np.argmax(scores[valid])]
+        return {
+            "position": (float(positions[best, 0]), float(positions[best, 1]), height),
+            "rotation": (0, 0, float(rotations[best])),
+            "dimensions": dimensions
+        }
+    
+    def _place_anywhere(self, furniture_info):
+        """Place furniture anywhere valid"""
+        dims = furniture_info["dimensions"]
+        height = furniture_info["placement"]["height"]
+        
+        # A cell whose clearance covers the item's inflated half-diagonal fits it at any rotation
+        half_width, half_depth = self._half_extents(dims)
+        radius = math.hypot(half_width + self.COLLISION_MARGIN, half_depth + self.COLLISION_MARGIN)
+        
+        cell = self.occupancy.find_free_cell(radius)
+        if cell is None:
+            return None
+        
+        position = (cell[0], cell[1], height)
+        if not self._is_valid_placement(position, dims, 0):
+            return None
+        
+        return {
+            "position": position,
+            "rotation": (0, 0, 0),
+            "dimensions": dims
+        }
+    
+    def _is_valid_placement(self, position, dimensions, rotation):
+        """Check if placement is valid (no collisions, within bounds)"""
+        return bool(self._valid_candidates(
+            np.array([position[:2]], dtype=float), np.array([rotation], dtype=float), dimensions
+        )[0])
+    
+    def _valid_candidates(self, positions, rotations, dimensions):
+        """Bounds and collision check for M candidate positions/rotations at once"""
+        half_extents = self._half_extents(dimensions)
+        
+        # Apply rotation to get actual bounds
+        extents = collision.rotated_half_extents(half_extents, rotations)
+        valid = ((positions[:, 0] - extents[:, 0] >= self.floor_bounds["min_x"]) &
+                 (positions[:, 0] + extents[:, 0] <= self.floor_bounds["max_x"]) &
+                 (positions[:, 1] - extents[:, 1] >= self.floor_bounds["min_y"]) &
+                 (positions[:, 1] + extents[:, 1] <= self.floor_bounds["max_y"]))
+        
+        # Inside the bounding box is not enough for L-shaped rooms and alcoves
+        if self.room_polygon is not None and valid.any():
+            valid[valid] = self.room_polygon.contains_footprints(
+                positions[valid], half_extents, rotations[valid]
+            )
+        
+        if not valid.any() or not len(self.footprints):
+            return valid
+        
+        # Each in-bounds candidate only meets the placed footprints under its own bounds
+        candidates = np.flatnonzero(valid)
+        reach = collision.rotated_half_extents(
+            np.add(half_extents, self.COLLISION_MARGIN), rotations[candidates]
+        )
+        lower = (positions[candidates] - reach).tolist()
+        upper = (positions[candidates] + reach).tolist()
+        pair_candidates = []
+        pair_footprints = []
+        for candidate, (min_x, min_y), (max_x, max_y) in zip(candidates.tolist(), lower, upper):
+            nearby = self.placement_index.query(min_x, min_y, max_x, max_y)
+            pair_candidates.extend([candidate] * len(nearby))
+            pair_footprints.extend(nearby)
+        if not pair_candidates:
+            return valid
+        
+        # Every (candidate, nearby footprint) pair in a single array operation
+        pair_candidates = np.asarray(pair_candidates)
+        pair_footprints = np.asarray(pair_footprints)
+        hits = collision.obb_overlap(
+            positions[pair_candidates], half_extents, rotations[pair_candidates],
+            self.footprints.centers[pair_footprints],
+            self.footprints.half_extents[pair_footprints],
+            self.footprints.rotations[pair_footprints],
+            margin=self.COLLISION_MARGIN
+        )
+        valid[pair_candidates[hits]] = False
+        return valid
+    
+    def _half_extents(self, dimensions):
+        """Half width and half depth of a footprint"""
+        return (dimensions["width"] / 2, dimensions["depth"] / 2)
+    
+    def _z_rotation(self, rotation):
+        """Z rotation from either a scalar or an (x, y, z) euler tuple"""
+        if isinstance(rotation, (tuple, list)):
+            return rotation[2]
+        return rotation
+    
+    def _footprint_bounds(self, position, dimensions, rotation):
+        """Axis-aligned bounds of a footprint, inflated by the collision margin"""
+        # Inflate before rotating so the bounds cover the inflated oriented box
+        half_width, half_depth = self._half_extents(dimensions)
+        half_x, half_y = collision.rotated_half_extents(
+            (half_width + self.COLLISION_MARGIN, half_depth + self.COLLISION_MARGIN), rotation
+        )
+        return (position[0] - half_x, position[1] - half_y,
+                position[0] + half_x, position[1] + half_y)
+    
+    def _check_collision(self, pos1, dims1, rot1, pos2, dims2, rot2):
+        """Check collision between two objects"""
+        # Exact oriented footprint test, keeping a safety gap between objects
+        return bool(collision.obb_overlap(
+            pos1[:2], self._half_extents(dims1), self._z_rotation(rot1),
+            pos2[:2], self._half_extents(dims2), self._z_rotation(rot2),
+            margin=self.COLLISION_MARGIN
+        ))
+
+def solve_layout(room, catalog=None, seed=None, furniture_count=5,
+                 mode="greedy", start="greedy", iterations=2000, selection=None):
+    """Solve a furniture layout for a room without touching bpy.
+
+    room: dict with "size" (square room width/depth in meters) and
+        optionally "wall_height" and "polygon", a list of (x, y) floor
+        vertices for rooms that are not square (L-shapes, alcoves)
+    catalog: mapping of furniture file -> catalog entry, defaults to
+        FurnitureCatalog.FURNITURE_DATA
+    seed: RNG seed; the same room, catalog and seed give the same layout
+    mode: "greedy" returns the starting layout as is, "anneal" refines it
+        with LayoutAnnealer for the given number of iterations
+    start: "greedy" starts from the candidate-scoring placer, "expert"
+        from the fixed expert positions of SmartLayoutGenerator (items
+        without one are placed greedily)
+    selection: furniture files to place; defaults to furniture_count
+        files picked by SmartFurniturePlacement.select_furniture
+    Returns a list of {"file", "position", "rotation"} placements.
+    """
+    placer = SmartFurniturePlacement(
+        room_size=room["size"],
+        wall_height=room.get("wall_height", 3.2),
+        catalog=catalog,
+        seed=seed,
+        room_polygon=room.get("polygon")
+    )
+    if selection is None:
+        selection = placer.select_furniture(furniture_count)
+    if start == "expert":
+        layout = placer.generate_expert_layout(selection)
+    else:
+        layout = placer.generate_random_layout(furniture_files=selection)
+
+    if mode == "anneal":
+        annealer = LayoutAnnealer(layout, room["size"], placer.catalog, seed=seed,
+                                  room_polygon=placer.room_polygon)
+        layout = annealer.optimize(iterations)
+    return layout
+
+def score_layout(layout, room, furniture_count=5):
+    """Score a solved layout; higher is better.
+
+    The number of placed items dominates (out of furniture_count). Ties are
+    broken by spread: the mean distance from each item to its nearest
+    neighbour, normalised by the room size.
+    """
+    if not layout:
+        return 0.0
+    
+    score = len(layout) / furniture_count
+    if len(layout) > 1:
+        centers = np.array([item["position"][:2] for item in layout], dtype=float)
+        distances = np.hypot(*(centers[:, None, :] - centers[None, :, :]).transpose(2, 0, 1))
+        np.fill_diagonal(distances, np.inf)
+        score += 0.1 * float(distances.min(axis=1).mean()) / room["size"]
+    return score
+
@@ -0,0 +1,73 @@
+"""Parallel multi-seed layout generation
+
+Fans (room, seed) jobs out to a process pool of plain Python workers.
+Each worker runs layout_core.solve_layout, which seeds its own
+random.Random, so a seed gives the same layout in any worker and in any
+batch size.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from .layout_core import solve_layout, score_layout
+
+def _solve_job(job):
+    """Solve and score a single (room, seed) job in a worker process"""
+    room_index, seed_index, room, seed, catalog, furniture_count = job
+    # Per-item placement logs from hundreds of jobs are noise, keep them out of the console
+    with contextlib.redirect_stdout(io.StringIO()):
+        layout = solve_layout(room, catalog=catalog, seed=seed, furniture_count=furniture_count)
+    return {
+        "room_index": room_index,
+        "seed_index": seed_index,
+        "room": room,
+        "seed": seed,
+        "layout": layout,
+        "score": score_layout(layout, room, furniture_count)
+    }
+
+def generate_layouts(rooms, seeds, catalog=None, furniture_count=5, max_workers=None, keep_best=None):
+    """Generate a layout for every room spec and seed in parallel.
+
+    rooms: list of room dicts as accepted by solve_layout
+    seeds: list of RNG seeds, each one solved for every room
+    max_workers: pool size, defaults to the CPU count; 1 solves in-process
+    keep_best: if set, keep only the best N layouts per room
+    Returns scored results grouped by room, best first within each room.
+    """
+    seeds = list(seeds)
+    jobs = [
+        (room_index, seed_index, room, seed, catalog, furniture_count)
+        for room_index, room in enumerate(rooms)
+        for seed_index, seed in enumerate(seeds)
+    ]
+    if not jobs:
+        return []
+    
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) == 1:
+        results = [_solve_job(job) for job in jobs]
+    else:
+        # Spawn keeps workers clean when called from inside Blender
+        context = multiprocessing.get_context("spawn")
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            results = list(pool.map(_solve_job, jobs, chunksize=chunksize))
+    
+    # Sort best first within each room; seed breaks ties so order is stable
+    results.sort(key=lambda r: (r["room_index"], -r["score"], r["seed_index"]))
+    
+    if keep_best is not None:
+        kept_per_room = {}
+        best = []
+        for result in results:
+            kept = kept_per_room.get(result["room_index"], 0)
+            if kept < keep_best:
+                best.append(result)
+                kept_per_room[result["room_index"]] = kept + 1
+        results = best
+    
+    print(f"Generated {len(jobs)} layouts for {len(rooms)} room(s) on {min(workers, len(jobs))} worker(s)")
+    return results
@@ -0,0 +1,283 @@
+"""Simulated-annealing layout optimizer with incremental cost updates"""
+
+import math
+import random
+import numpy as np
+from . import collision
+from .spatial_index import FootprintGrid
+from .room_geometry import RoomPolygon
+from .smart_placement_rules import PlacementRules
+
+class LayoutAnnealer:
+    """Refines a greedy or expert layout by simulated annealing.
+
+    Cost terms:
+      - collision: penetration depth between floor footprints
+      - clearance: penetration once footprints are inflated by half a walkway
+      - wall: gap and facing error of wall-zone items against their nearest wall
+      - bounds: how far a footprint pokes through the room walls, or an inner
+        corner of the floor pokes into it
+      - coffee_table: distance from the spot PlacementRules.get_coffee_table_placement
+        derives from the sofa
+      - anchor: squared distance from the item's starting spot, so items with
+        no other terms (decor, rugs, free-standing pieces) stay put
+      - zone: how much further a corner item is from its nearest corner, or a
+        center item from the room centroid, than where it started
+    Costs are cached per item and per pair. Moving one item only recomputes
+    its own terms, its pairs with the neighbours found through a
+    FootprintGrid, and the rules it takes part in, so a step is O(k).
+    """
+
+    WEIGHTS = {
+        "collision": 50.0,
+        "clearance": 2.0,
+        "wall": 5.0,
+        "bounds": 50.0,
+        "coffee_table": 3.0,
+        "anchor": 1.0,
+        "zone": 5.0,
+    }
+    CLEARANCE = 0.4  # Walkway kept between floor items (meters)
+
+    def __init__(self, layout, room_size, catalog, seed=None, weights=None, room_polygon=None):
+        # A floor polygon replaces the square room; vertices or a RoomPolygon
+        if room_polygon is not None and not isinstance(room_polygon, RoomPolygon):
+            room_polygon = RoomPolygon(room_polygon)
+        self.room = room_polygon if room_polygon is not None else RoomPolygon.square(room_size)
+        self.room_size = room_size
+        self.rng = random.Random(seed)
+        self.weights = dict(self.WEIGHTS, **(weights or {}))
+        self.layout = [dict(item) for item in layout]
+
+        # Walls the placers use: edge index and the rotation facing into the room
+        self.walls = [{"edge": edge, "rotation": self.room.facing_rotation(self.room.normals[edge])}
+                      for edge in self.room.walls]
+        self.reflex = self.room.reflex_vertices()
+        self.corner_points = np.array([corner["position"] for corner in self.room.corners()]).reshape(-1, 2)
+
+        count = len(self.layout)
+        self.positions = np.array([item["position"][:2] for item in self.layout], dtype=float).reshape(count, 2)
+        self.rotations = np.array([item["rotation"][2] for item in self.layout], dtype=float)
+        self.half_extents = np.zeros((count, 2))
+        self.zones = []
+        self.orientations = []
+        self.wall_distances = np.zeros(count)
+        self.obstacles = np.zeros(count, dtype=bool)
+
+        sofa = None
+        coffee_tables = []
+        for i, item in enumerate(self.layout):
+            info = catalog.get(item["file"]) or {}
+            dims = info.get("dimensions", {"width": 0.5, "depth": 0.5})
+            placement = info.get("placement", {})
+            self.half_extents[i] = (dims["width"] / 2, dims["depth"] / 2)
+            self.zones.append(placement.get("zone", "anywhere"))
+            self.orientations.append(placement.get("orientation", "fixed"))
+            self.wall_distances[i] = placement.get("wall_distance", 0.0)
+
+            # Wall decor hangs above the floor and rugs lie under furniture
+            self.obstacles[i] = info.get("type") != "wall_decor" and info.get("category") != "floor_decor"
+
+            if info.get("type") == "seating" and sofa is None:
+                sofa = i
+            elif info.get("type") == "coffee_table":
+                coffee_tables.append(i)
+
+        # Starting spots, and how far each item may sit from its zone target
+        self.anchors = self.positions.copy()
+        self.zone_slack = np.array([self._zone_distance(i) for i in range(count)])
+
+        # Rule terms: (items involved, cost function)
+        self.rules = []
+        if sofa is not None:
+            for table in coffee_tables:
+                self.rules.append(((sofa, table), self._coffee_table_cost))
+        self.item_rules = [[] for _ in range(count)]
+        for r, (items, _) in enumerate(self.rules):
+            for i in items:
+                self.item_rules[i].append(r)
+
+        # Obstacle footprints, indexed by item so ids line up with the layout
+        self.footprints = collision.FootprintSet(capacity=max(16, count))
+        self.grid = FootprintGrid(cell_size=0.5)
+        for i in range(count):
+            self.footprints.add(self.positions[i], self.half_extents[i], self.rotations[i])
+            if self.obstacles[i]:
+                self.grid.insert(i, *self._grid_bounds(i))
+
+        # Cost caches
+        self.unary_costs = np.array([self._unary_cost(i) for i in range(count)])
+        self.pair_costs = [self._pair_costs(i) for i in range(count)]
+        self.rule_costs = [fn(*items) for items, fn in self.rules]
+        self.total_cost = self._full_cost()
+
+    def _grid_bounds(self, i):
+        """Grid bounds of an item, inflated by half the walkway"""
+        # Inflate before rotating so the bounds cover the inflated oriented box
+        reach_x, reach_y = collision.rotated_half_extents(
+            self.half_extents[i] + self.CLEARANCE / 2, self.rotations[i]
+        )
+        x, y = self.positions[i]
+        return (x - reach_x, y - reach_y, x + reach_x, y + reach_y)
+
+    def _poke(self, i):
+        """How far item i's footprint crosses the floor outline"""
+        center, (half_x, half_y) = self.positions[i], self.half_extents[i]
+        cos_r, sin_r = math.cos(self.rotations[i]), math.sin(self.rotations[i])
+        local = np.array([(-half_x, -half_y), (half_x, -half_y), (half_x, half_y), (-half_x, half_y)])
+        corners = center + local @ np.array([[cos_r, sin_r], [-sin_r, cos_r]])
+
+        # Corners outside the floor, by their distance back to it
+        outside = ~self.room.contains(corners)
+        poke = float(self.room.distance_to_walls(corners[outside]).sum()) if outside.any() else 0.0
+
+        # Inner corners of the floor inside the footprint, by their depth into it
+        if len(self.reflex):
+            offsets = self.reflex - center
+            local_x = np.abs(offsets[:, 0] * cos_r + offsets[:, 1] * sin_r)
+            local_y = np.abs(-offsets[:, 0] * sin_r + offsets[:, 1] * cos_r)
+            poke += float(np.maximum(np.minimum(half_x - local_x, half_y - local_y), 0.0).sum())
+        return poke
+
+    def _zone_distance(self, i):
+        """Distance from item i to its zone target (nearest corner or the centroid), 0 for other zones"""
+        if self.zones[i] == "corner" and len(self.corner_points):
+            return float(np.hypot(*(self.corner_points - self.positions[i]).T).min())
+        if self.zones[i] == "center":
+            return float(np.hypot(*(self.positions[i] - self.room.centroid)))
+        return 0.0
+
+    def _unary_cost(self, i):
+        """Wall alignment, zone, anchor and bounds cost of a single item"""
+        cost = self.weights["bounds"] * self._poke(i)
+
+        drift = self.positions[i] - self.anchors[i]
+        cost += self.weights["anchor"] * float(drift @ drift)
+        cost += self.weights["zone"] * max(0.0, self._zone_distance(i) - self.zone_slack[i]) ** 2
+
+        if self.zones[i] == "wall" and self.walls:
+            # Back against the nearest wall at wall_distance, facing into the room
+            distances = self.room.edge_distances(self.positions[i])[0]
+            wall = min(self.walls, key=lambda w: distances[w["edge"]])
+            offset = self.positions[i] - self.room.starts[wall["edge"]]
+            gap = float(offset @ self.room.normals[wall["edge"]]) - self.half_extents[i][1]
+            facing = 1 - math.cos(self.rotations[i] - wall["rotation"])
+            cost += self.weights["wall"] * ((gap - self.wall_distances[i]) ** 2 + facing)
+
+        return cost
+
+    def _pair_costs(self, i):
+        """Collision and clearance cost of item i against its neighbours, as {j: cost}"""
+        if not self.obstacles[i]:
+            return {}
+
+        neighbours = [j for j in self.grid.query(*self._grid_bounds(i)) if j != i]
+        if not neighbours:
+            return {}
+
+        center, half, rotation = self.positions[i], self.half_extents[i], self.rotations[i]
+        depth = self.footprints.penetrations(center, half, rotation, indices=neighbours)
+        crowding = self.footprints.penetrations(center, half, rotation, indices=neighbours,
+                                                margin=self.CLEARANCE / 2)
+        costs = self.weights["collision"] * depth + self.weights["clearance"] * crowding
+        return {j: float(c) for j, c in zip(neighbours, costs) if c > 0}
+
+    def _coffee_table_cost(self, sofa, table):
+        """Distance of the coffee table from the spot the sofa rule asks for"""
+        target = PlacementRules.get_coffee_table_placement(
+            tuple(self.positions[sofa]), self.rotations[sofa]
+        )["positions"][0]
+        dx = self.positions[table][0] - target["pos"][0]
+        dy = self.positions[table][1] - target["pos"][1]
+        facing = 1 - math.cos(self.rotations[table] - target["rot"])
+        return self.weights["coffee_table"] * (dx * dx + dy * dy + facing)
+
+    def _full_cost(self):
+        """Total cost from the caches (pairs are stored on both items)"""
+        pairs = sum(sum(costs.values()) for costs in self.pair_costs) / 2
+        return float(self.unary_costs.sum()) + pairs + sum(self.rule_costs)
+
+    def _local_cost(self, i, pair_costs, rule_costs, unary_cost):
+        """Every cached term that involves item i"""
+        return unary_cost + sum(pair_costs.values()) + sum(rule_costs)
+
+    def _set_state(self, i, position, rotation):
+        """Move item i and keep its footprint and grid entry in sync"""
+        self.positions[i] = position
+        self.rotations[i] = rotation
+        self.footprints.update(i, position, self.half_extents[i], rotation)
+        if self.obstacles[i]:
+            self.grid.insert(i, *self._grid_bounds(i))
+
+    def _propose(self, i, temperature_ratio):
+        """Random move for item i: a jitter, sometimes a quarter turn"""
+        step = 0.05 + 0.5 * temperature_ratio
+        position = self.positions[i] + (self.rng.gauss(0, step), self.rng.gauss(0, step))
+        rotation = self.rotations[i]
+        if self.orientations[i] != "fixed" and self.rng.random() < 0.25:
+            rotation = self.rng.choice((0.0, math.pi/2, -math.pi/2, math.pi))
+        return position, rotation
+
+    def step(self, temperature, temperature_ratio=1.0):
+        """Propose one move and accept it by the Metropolis rule; returns True if accepted"""
+        i = self.rng.randrange(len(self.layout))
+        old_position = self.positions[i].copy()
+        old_rotation = self.rotations[i]
+        old_rules = [self.rule_costs[r] for r in self.item_rules[i]]
+        old_local = self._local_cost(i, self.pair_costs[i], old_rules, self.unary_costs[i])
+
+        position, rotation = self._propose(i, temperature_ratio)
+        self._set_state(i, position, rotation)
+
+        new_unary = self._unary_cost(i)
+        new_pairs = self._pair_costs(i)
+        new_rules = [self.rules[r][1](*self.rules[r][0]) for r in self.item_rules[i]]
+        delta = self._local_cost(i, new_pairs, new_rules, new_unary) - old_local
+
+        if delta > 0 and self.rng.random() >= math.exp(-delta / temperature):
+            self._set_state(i, old_position, old_rotation)
+            return False
+
+        # Commit: swap item i's pair entries on both sides
+        for j in self.pair_costs[i]:
+            self.pair_costs[j].pop(i, None)
+        for j, cost in new_pairs.items():
+            self.pair_costs[j][i] = cost
+        self.pair_costs[i] = new_pairs
+        self.unary_costs[i] = new_unary
+        for r, cost in zip(self.item_rules[i], new_rules):
+            self.rule_costs[r] = cost
+        self.total_cost += delta
+        return True
+
+    def optimize(self, iterations=2000, start_temperature=1.0, end_temperature=1e-3):
+        """Anneal for a number of steps and return the best layout found"""
+        if not self.layout:
+            return []
+
+        start_cost = best_cost = self.total_cost
+        best_positions = self.positions.copy()
+        best_rotations = self.rotations.copy()
+
+        cooling = (end_temperature / start_temperature) ** (1.0 / max(1, iterations))
+        temperature = start_temperature
+        accepted = 0
+        for _ in range(iterations):
+            if self.step(temperature, temperature / start_temperature):
+                accepted += 1
+                if self.total_cost < best_cost:
+                    best_cost = self.total_cost
+                    best_positions = self.positions.copy()
+                    best_rotations = self.rotations.copy()
+            temperature *= cooling
+
+        print(f"Annealed layout: cost {start_cost:.3f} -> best {best_cost:.3f} "
+              f"({accepted}/{iterations} moves accepted)")
+
+        result = []
+        for i, item in enumerate(self.layout):
+            placed = dict(item)
+            placed["position"] = (float(best_positions[i][0]), float(best_positions[i][1]), item["position"][2])
+            placed["rotation"] = (item["rotation"][0], item["rotation"][1], float(best_rotations[i]))
+            result.append(placed)
+        return result
@@ -0,0 +1,149 @@
+"""Decimated level-of-detail proxies for catalog assets, switched by render quality
+
+Asset preprocessing (import normalization, the asset pack build and the
+geometry cache) stores decimated copies of every large furniture mesh
+next to it: the full mesh points to its proxies through ID properties,
+so they are saved, appended and duplicated together with it. The scene's
+philo_lod_quality setting swaps the mesh data of placed objects between
+the proxies and the full meshes; setup_render_settings and the render
+operators set it from their quality preset.
+"""
+
+import bpy
+from bpy.props import EnumProperty
+from . import config
+
+# ID property on a full mesh pointing to its proxy for a level (1, 2, ...)
+LOD_KEY = "philo_lod_{}"
+# ID property on an object showing a proxy, pointing back to its full mesh
+LOD_FULL_KEY = "philo_lod_full"
+
+def lod_key(level):
+    return LOD_KEY.format(level)
+
+def lod_meshes(mesh):
+    """Proxy meshes of a full mesh, by level"""
+    proxies = {}
+    for level in range(1, len(config.LOD_RATIOS) + 1):
+        proxy = mesh.get(lod_key(level))
+        if proxy is not None:
+            proxies[level] = proxy
+    return proxies
+
+def generate_lods(root, ratios=None):
+    """Decimate every large mesh in a hierarchy into one proxy per level.
+
+    Each level adds a collapse Decimate modifier to all meshes at once,
+    evaluates the depsgraph a single time and copies the evaluated meshes;
+    the modifiers are removed again. Meshes under config.LOD_MIN_FACES
+    faces keep no proxies. Returns the number of proxies created.
+    """
+    ratios = ratios or config.LOD_RATIOS
+    objects = {}
+    for obj in [root] + list(root.children_recursive):
+        if obj.type == 'MESH' and obj.data is not None and len(obj.data.polygons) >= config.LOD_MIN_FACES:
+            objects.setdefault(obj.data.name, obj)  # One decimation per shared mesh
+    if not objects:
+        return 0
+
+    created = 0
+    for level, ratio in enumerate(ratios, start=1):
+        modifiers = {}
+        for obj in objects.values():
+            modifier = obj.modifiers.new(name="Philo_LOD", type='DECIMATE')
+            modifier.decimate_type = 'COLLAPSE'
+            modifier.ratio = ratio
+            modifiers[obj] = modifier
+
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        for obj, modifier in modifiers.items():
+            proxy = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+            proxy.name = f"{obj.data.name}_LOD{level}"
+            obj.data[lod_key(level)] = proxy
+            obj.modifiers.remove(modifier)
+            created += 1
+
+    print(f"  Generated {created} LOD proxies for {root.name}")
+    return created
+
+def _sync_materials(source, target):
+    """Copy one mesh's material slots onto another (a full mesh and its proxies share materials)"""
+    if len(target.materials) != len(source.materials):
+        target.materials.clear()
+        for material in source.materials:
+            target.materials.append(material)
+        return
+    for index, material in enumerate(source.materials):
+        if target.materials[index] != material:
+            target.materials[index] = material
+
+def set_lod_level(level, objects=None):
+    """Show each mesh object's proxy for a level (0 = full resolution).
+
+    Objects without a proxy for the level use the nearest more detailed
+    one. Returns the number of objects whose mesh changed.
+    """
+    objects = objects if objects is not None else bpy.context.scene.objects
+    swapped = 0
+    for obj in objects:
+        if obj.type != 'MESH' or obj.data is None:
+            continue
+        full = obj.get(LOD_FULL_KEY) or obj.data
+        target = full
+        for candidate in range(level, 0, -1):
+            proxy = full.get(lod_key(candidate))
+            if proxy is not None:
+                target = proxy
+                break
+
+        # Materials assigned while a proxy was shown go back to the full mesh first
+        if obj.data != full:
+            _sync_materials(obj.data, full)
+        if target is not full:
+            _sync_materials(full, target)
+            obj[LOD_FULL_KEY] = full
+        elif LOD_FULL_KEY in obj:
+            del obj[LOD_FULL_KEY]
+        if obj.data != target:
+            obj.data = target
+            swapped += 1
+    return swapped
+
+def apply_quality(quality, scene=None):
+    """Switch the scene's geometry to the LOD level of a render quality preset"""
+    scene = scene or bpy.context.scene
+    # Import here: asset_library imports this module
+    from .asset_library import LIBRARY_COLLECTION
+    level = config.LOD_LEVEL_BY_PRESET.get(quality, 0)
+    # Library masters keep their full meshes; only placed objects switch
+    objects = [obj for obj in scene.objects
+               if not any(collection.name == LIBRARY_COLLECTION for collection in obj.users_collection)]
+    swapped = set_lod_level(level, objects)
+    print(f"Geometry detail set to {quality} (LOD {level}), {swapped} meshes swapped")
+
+def set_quality(quality, scene=None):
+    """Set the scene's geometry detail setting, or switch directly if the add-on is not registered"""
+    scene = scene or bpy.context.scene
+    if hasattr(scene, "philo_lod_quality"):
+        scene.philo_lod_quality = quality  # The update callback swaps the meshes
+    else:
+        apply_quality(quality, scene)
+
+def _on_quality_update(scene, context):
+    apply_quality(scene.philo_lod_quality, scene)
+
+def register():
+    bpy.types.Scene.philo_lod_quality = EnumProperty(
+        name="Geometry Detail",
+        description="Furniture mesh detail; preview and medium use decimated proxies",
+        items=[
+            ('preview', "Preview", "Lightest proxies, for navigation and preview renders"),
+            ('medium', "Medium", "Moderately decimated proxies"),
+            ('final', "Final", "Full resolution meshes")
+        ],
+        default='final',
+        update=_on_quality_update
+    )
+
+def unregister():
+    del bpy.types.Scene.philo_lod_quality
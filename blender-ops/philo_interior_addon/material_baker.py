@@ -0,0 +1,450 @@
+"""Bake procedural catalog materials to tiled image maps
+
+Each procedural catalog material (fabric, leather, wood) is rendered once
+to base color, roughness and normal maps on a unit plane, in a background
+Blender process so the session stays responsive. Bakes are cached on disk
+under the material's spec hash and the bake settings, so an unchanged
+material is never baked twice. Final renders and web exports swap the
+procedural materials for image-textured ones built from the bakes, and
+restore them afterwards.
+
+The baked maps are made seamless (texture_tiling) and applied through the
+mesh UVs with a Mapping node repeating them config.BAKE_UV_TILES times
+per UV unit, the same sampling glTF viewers use (the Mapping node exports
+as KHR_texture_transform). Final renders do not block the UI on missing
+bakes by default: a timer swaps the bakes in once the worker is done and
+only then starts the render, and it never swaps materials under a
+running render job.
+"""
+
+import os
+import json
+import shutil
+import subprocess
+import uuid
+import bpy
+import numpy as np
+from . import config
+from .texture_tiling import make_tileable
+from .material_registry import MATERIAL_HASH_KEY, get_material_registry, spec_hash
+from .material_compiler import build_material, compile_material
+
+# Bumped when the bake setup changes, so older bakes are not reused
+BAKE_VERSION = 2
+
+# (map name, bake type, pass filter, image colorspace)
+BAKE_PASSES = (
+    ("base_color", 'DIFFUSE', {'COLOR'}, "sRGB"),
+    ("roughness", 'ROUGHNESS', None, "Non-Color"),
+    ("normal", 'NORMAL', None, "Non-Color"),
+)
+
+# Custom property on a baked material: spec hash of the material it replaces
+BAKE_SOURCE_KEY = "philo_bake_source"
+
+BAKE_WORKER_SCRIPT = os.path.join(config.BLENDER_OPS_PATH, "bake_worker.py")
+
+# Nodes that need no baking: a material of only these is already cheap and exportable
+PLAIN_NODE_TYPES = {"ShaderNodeOutputMaterial", "ShaderNodeBsdfPrincipled"}
+
+def is_procedural(spec):
+    """True if a spec has nodes beyond a Principled BSDF and its output"""
+    return any(node["type"] not in PLAIN_NODE_TYPES for node in spec.get("nodes", {}).values())
+
+def _bsdf_inputs(spec):
+    """Constant Principled BSDF inputs of a spec"""
+    for node in spec.get("nodes", {}).values():
+        if node["type"] == "ShaderNodeBsdfPrincipled":
+            return dict(node.get("inputs", {}))
+    return {}
+
+def baked_spec(spec, maps):
+    """Spec of the image-textured stand-in for a baked material"""
+    inputs = _bsdf_inputs(spec)
+    for name in ("Base Color", "Roughness", "Normal"):
+        inputs.pop(name, None)
+    tiles = config.BAKE_UV_TILES
+    repeat = {"extension": 'REPEAT'}
+    return {
+        "name": f"{spec['name']}_Baked",
+        "nodes": {
+            "output": {"type": "ShaderNodeOutputMaterial"},
+            "bsdf": {"type": "ShaderNodeBsdfPrincipled", "inputs": inputs},
+            "tex_coord": {"type": "ShaderNodeTexCoord"},
+            "mapping": {"type": "ShaderNodeMapping", "inputs": {"Scale": (tiles, tiles, 1.0)}},
+            "base_color": {"type": "ShaderNodeTexImage", "image": maps["base_color"],
+                           "props": repeat, "colorspace": "sRGB"},
+            "roughness": {"type": "ShaderNodeTexImage", "image": maps["roughness"],
+                          "props": repeat, "colorspace": "Non-Color"},
+            "normal": {"type": "ShaderNodeTexImage", "image": maps["normal"],
+                       "props": repeat, "colorspace": "Non-Color"},
+            "normal_map": {"type": "ShaderNodeNormalMap"},
+        },
+        "links": [
+            ("tex_coord.UV", "mapping.Vector"),
+            ("mapping.Vector", "base_color.Vector"),
+            ("mapping.Vector", "roughness.Vector"),
+            ("mapping.Vector", "normal.Vector"),
+            ("base_color.Color", "bsdf.Base Color"),
+            ("roughness.Color", "bsdf.Roughness"),
+            ("normal.Color", "normal_map.Color"),
+            ("normal_map.Normal", "bsdf.Normal"),
+            ("bsdf.BSDF", "output.Surface"),
+        ],
+        "material": dict(spec.get("material", {})),
+    }
+
+class BakeCache:
+    """On-disk bakes of material specs and the background worker that fills them.
+
+    Each bake is a directory named by its bake key holding one PNG per map
+    and a bake.json written last, so half-finished bakes are never used.
+    """
+
+    def __init__(self, cache_dir=None, resolution=None, samples=None):
+        self.cache_dir = cache_dir or config.BAKE_CACHE_DIR
+        self.resolution = resolution or config.BAKE_RESOLUTION
+        self.samples = samples or config.BAKE_SAMPLES
+        self.worker = None
+        self.worker_log = None
+        self.worker_jobs = {}  # Bake key -> material name, for the running worker
+        self.failed = set()    # Bake keys that failed this session, never re-queued
+
+    def bake_key(self, spec):
+        """Hash of a spec and the bake settings"""
+        return spec_hash("bake", {
+            "material": spec_hash(spec["name"], spec),
+            "resolution": self.resolution,
+            "samples": self.samples,
+            "version": BAKE_VERSION,
+        })
+
+    def entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def maps(self, spec):
+        """{map name: image path} of a finished bake, or None"""
+        directory = self.entry_dir(self.bake_key(spec))
+        manifest_path = os.path.join(directory, "bake.json")
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path) as f:
+                maps = {name: os.path.join(directory, filename)
+                        for name, filename in json.load(f)["maps"].items()}
+        except (OSError, ValueError, KeyError):
+            return None
+        if not all(os.path.exists(path) for path in maps.values()):
+            return None
+        return maps
+
+    def busy(self):
+        """True while a worker is still baking"""
+        return self.worker is not None and self.worker.poll() is None
+
+    def bake(self, specs, wait=True):
+        """Bake the specs without a cached bake in a background Blender process.
+
+        With wait=False the worker keeps running and later calls use its
+        bakes once they are finished. Returns the number of specs sent.
+        """
+        if self.busy():
+            if not wait:
+                print("  Bake worker still running, using finished bakes only")
+                return 0
+            self.wait()
+        self.collect()
+
+        jobs = [{"key": self.bake_key(spec), "spec": spec} for spec in specs if self.maps(spec) is None]
+        retries = [job for job in jobs if job["key"] in self.failed]
+        if retries:
+            print(f"  Not re-baking {len(retries)} materials that failed earlier this session")
+            jobs = [job for job in jobs if job["key"] not in self.failed]
+        if not jobs:
+            return 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        job_path = os.path.join(self.cache_dir, f"job_{uuid.uuid4().hex}.json")
+        with open(job_path, "w") as f:
+            json.dump({
+                "cache_dir": self.cache_dir,
+                "resolution": self.resolution,
+                "samples": self.samples,
+                "jobs": jobs,
+            }, f)
+
+        print(f"Baking {len(jobs)} materials at {self.resolution}px in the background...")
+        command = [bpy.app.binary_path, "--background", "--factory-startup",
+                   "--python", BAKE_WORKER_SCRIPT, "--", job_path]
+        self.worker_log = open(job_path[:-len(".json")] + ".log", "w")
+        self.worker = subprocess.Popen(command, stdout=self.worker_log, stderr=subprocess.STDOUT)
+        self.worker_jobs = {job["key"]: job["spec"]["name"] for job in jobs}
+        if wait:
+            self.wait()
+        return len(jobs)
+
+    def wait(self):
+        """Block until the running worker is done"""
+        if self.worker is None:
+            return
+        self.worker.wait()
+        self.collect()
+
+    def collect(self):
+        """Check a finished worker's exit code and record the bakes it failed; returns how many failed"""
+        if self.worker is None or self.worker.poll() is None:
+            return 0
+        returncode = self.worker.returncode
+        log_path = self.worker_log.name
+        self.worker_log.close()
+        self.worker = self.worker_log = None
+
+        # A worker that crashed leaves its job file behind
+        job_path = log_path[:-len(".log")] + ".json"
+        if os.path.exists(job_path):
+            os.remove(job_path)
+
+        failed = [key for key in self.worker_jobs
+                  if not os.path.exists(os.path.join(self.entry_dir(key), "bake.json"))]
+        names = [self.worker_jobs[key] for key in failed]
+        self.failed.update(failed)
+        self.worker_jobs = {}
+        if returncode != 0 or failed:
+            print(f"  WARNING: Bake worker exited with code {returncode}, "
+                  f"failed: {', '.join(names) or 'unknown'} (log: {log_path})")
+        else:
+            os.remove(log_path)
+            print("  Material bakes finished")
+        return len(failed)
+
+    def baked_material(self, spec):
+        """Registered image-textured material for a baked spec, or None if not baked yet"""
+        maps = self.maps(spec)
+        if maps is None:
+            return None
+        material = compile_material(baked_spec(spec, maps))
+        material[BAKE_SOURCE_KEY] = spec_hash(spec["name"], spec)
+        return material
+
+_shared_cache = None
+
+def get_bake_cache():
+    """Process-wide bake cache, so one worker runs at a time"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = BakeCache()
+    return _shared_cache
+
+def bakeable_specs():
+    """Procedural catalog specs by the spec hash their materials are registered under"""
+    # Import here: materials imports the compiler this module also uses
+    from .materials import catalog_specs
+    return {spec_hash(spec["name"], spec): spec
+            for spec in catalog_specs().values() if is_procedural(spec)}
+
+def _material_slots(scene):
+    for obj in scene.objects:
+        for slot in getattr(obj, "material_slots", ()):
+            if slot.material is not None:
+                yield slot
+
+def use_baked_materials(scene=None, wait=True, on_ready=None):
+    """Swap the scene's procedural catalog materials for their bakes; returns slots swapped.
+
+    Missing bakes are made by the background worker first; with
+    wait=False they are only started and the procedural material stays.
+    on_ready is called once the scene has every bake it can get: right
+    away, or from the poll timer after the worker is done.
+    """
+    scene = scene or bpy.context.scene
+    cache = get_bake_cache()
+    specs = bakeable_specs()
+
+    used = {}
+    for slot in _material_slots(scene):
+        key = slot.material.get(MATERIAL_HASH_KEY)
+        if key in specs:
+            used[key] = specs[key]
+    if not used:
+        if on_ready is not None:
+            on_ready()
+        return 0
+    cache.bake(list(used.values()), wait=wait)
+
+    baked = {key: cache.baked_material(spec) for key, spec in used.items()}
+    pending = None in baked.values() and cache.busy()
+    if pending:
+        # Procedural materials stay until the worker is done; swap the rest in then
+        callbacks = _waiting_scenes.setdefault(scene.name, [])
+        if on_ready is not None and on_ready not in callbacks:
+            callbacks.append(on_ready)
+        if not bpy.app.timers.is_registered(_poll_bakes):
+            bpy.app.timers.register(_poll_bakes, first_interval=config.BAKE_POLL_INTERVAL)
+    swapped = 0
+    for slot in _material_slots(scene):
+        original = slot.material
+        replacement = baked.get(original.get(MATERIAL_HASH_KEY))
+        if replacement is not None:
+            # Keep the procedural original alive while no slot uses it
+            original.use_fake_user = True
+            slot.material = replacement
+            swapped += 1
+    print(f"Baked materials in use: {swapped} slots swapped")
+    if not pending and on_ready is not None:
+        on_ready()
+    return swapped
+
+# Scenes showing procedural materials until their bakes finish -> on_ready callbacks
+_waiting_scenes = {}
+
+def is_waiting(scene=None):
+    """True while a scene's bakes are still being made"""
+    return (scene or bpy.context.scene).name in _waiting_scenes
+
+def _poll_bakes():
+    """Timer: swap bakes into the waiting scenes once the worker is done"""
+    cache = get_bake_cache()
+    # Slot materials must not change under a running render job
+    if cache.busy() or bpy.app.is_job_running('RENDER'):
+        return config.BAKE_POLL_INTERVAL
+    cache.collect()
+    waiting = dict(_waiting_scenes)
+    _waiting_scenes.clear()
+    for name, callbacks in waiting.items():
+        scene = bpy.data.scenes.get(name)
+        if scene is None:
+            continue
+        use_baked_materials(scene, wait=False)
+        if name in _waiting_scenes:
+            # A new worker is making bakes still missing; call back after it instead
+            _waiting_scenes[name].extend(callbacks)
+            continue
+        for callback in callbacks:
+            callback()
+    # Keep polling if that started a worker for bakes still missing
+    return config.BAKE_POLL_INTERVAL if _waiting_scenes else None
+
+def restore_procedural_materials(scene=None):
+    """Put the procedural materials back where baked ones were swapped in; returns slots restored"""
+    scene = scene or bpy.context.scene
+    if _waiting_scenes.pop(scene.name, None):
+        print("Dropped the actions waiting for this scene's bakes")
+    registry = get_material_registry()
+    restored = 0
+    originals = set()
+    for slot in _material_slots(scene):
+        key = slot.material.get(BAKE_SOURCE_KEY)
+        if key is None:
+            continue
+        original = registry.find(key)
+        if original is not None:
+            slot.material = original
+            originals.add(original)
+            restored += 1
+    for original in originals:
+        original.use_fake_user = False
+    if restored:
+        print(f"Procedural materials restored in {restored} slots")
+    return restored
+
+def set_baked_for_quality(quality, scene=None, on_ready=None):
+    """Baked materials for the final preset, procedural ones otherwise.
+
+    on_ready is called once the scene's materials are set, for the final
+    preset possibly later, when the background bakes are done.
+    """
+    scene = scene or bpy.context.scene
+    if quality == "final":
+        use_baked_materials(scene, wait=config.BAKE_WAIT_FOR_FINAL, on_ready=on_ready)
+    else:
+        restore_procedural_materials(scene)
+        if on_ready is not None:
+            on_ready()
+
+def _bake_plane():
+    """Unit plane with UVs matching its Generated coordinates"""
+    mesh = bpy.data.meshes.new("Bake_Plane")
+    mesh.from_pydata([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)], [], [(0, 1, 2, 3)])
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    for loop in mesh.loops:
+        co = mesh.vertices[loop.vertex_index].co
+        uv_layer.data[loop.index].uv = (co.x, co.y)
+    obj = bpy.data.objects.new("Bake_Plane", mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+def bake_spec(spec, directory, resolution, samples):
+    """Bake one spec's maps into directory (run inside the bake worker)"""
+    scene = bpy.context.scene
+    scene.render.engine = 'CYCLES'
+    scene.cycles.device = 'CPU'
+    scene.cycles.samples = samples
+    scene.render.bake.margin = 0
+
+    plane = _bake_plane()
+    material = build_material(spec["name"], spec)
+    plane.data.materials.append(material)
+    for obj in scene.objects:
+        obj.select_set(obj == plane)
+    bpy.context.view_layer.objects.active = plane
+
+    nodes = material.node_tree.nodes
+    filenames = {}
+    for name, bake_type, pass_filter, colorspace in BAKE_PASSES:
+        image = bpy.data.images.new(f"{spec['name']}_{name}", resolution, resolution)
+        image.colorspace_settings.name = colorspace
+        target = nodes.new(type="ShaderNodeTexImage")
+        target.image = image
+        nodes.active = target
+
+        options = {"type": bake_type}
+        if pass_filter:
+            options["pass_filter"] = pass_filter
+        if bake_type == 'NORMAL':
+            options["normal_space"] = 'TANGENT'
+        bpy.ops.object.bake(**options)
+
+        # Seamless, so the maps can repeat across UV space
+        pixels = np.empty(len(image.pixels), dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        pixels = make_tileable(pixels.reshape(resolution, resolution, 4), normal_map=(bake_type == 'NORMAL'))
+        image.pixels.foreach_set(pixels.astype(np.float32).ravel())
+
+        filenames[name] = f"{name}.png"
+        image.filepath_raw = os.path.join(directory, filenames[name])
+        image.file_format = 'PNG'
+        image.save()
+        nodes.remove(target)
+        bpy.data.images.remove(image)
+
+    bpy.data.objects.remove(plane)
+    bpy.data.materials.remove(material)
+    return filenames
+
+def run_bake_job(job_path):
+    """Bake every entry of a job file written by BakeCache.bake; returns the number that failed"""
+    with open(job_path) as f:
+        job = json.load(f)
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    failed = 0
+    for entry in job["jobs"]:
+        final_dir = os.path.join(job["cache_dir"], entry["key"])
+        partial_dir = final_dir + ".partial"
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        os.makedirs(partial_dir)
+        try:
+            filenames = bake_spec(entry["spec"], partial_dir, job["resolution"], job["samples"])
+            with open(os.path.join(partial_dir, "bake.json"), "w") as f:
+                json.dump({"material": entry["spec"]["name"], "resolution": job["resolution"],
+                           "maps": filenames}, f, indent=2)
+            shutil.rmtree(final_dir, ignore_errors=True)
+            os.replace(partial_dir, final_dir)
+            print(f"Baked {entry['spec']['name']} -> {final_dir}")
+        except Exception as e:
+            failed += 1
+            shutil.rmtree(partial_dir, ignore_errors=True)
+            print(f"  ERROR: Baking {entry['spec']['name']} failed: {e}")
+
+    os.remove(job_path)
+    return failed
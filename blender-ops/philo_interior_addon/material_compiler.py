@@ -0,0 +1,169 @@
+"""Declarative material specs and a compiler that builds their node trees
+
+A spec is a plain dict (JSON-compatible apart from tuples):
+
+    {
+        "name": "Brushed_Metal",
+        "nodes": {
+            "output": {"type": "ShaderNodeOutputMaterial"},
+            "bsdf": {"type": "ShaderNodeBsdfPrincipled",
+                     "inputs": {"Base Color": (0.7, 0.7, 0.7, 1), "Metallic": 1.0}},
+            "noise": {"type": "ShaderNodeTexNoise", "inputs": {"Scale": 80}},
+            "ramp": {"type": "ShaderNodeValToRGB", "ramp": [(0.0, (0, 0, 0, 1)), (1.0, (1, 1, 1, 1))]},
+            "mix": {"type": "ShaderNodeMix", "props": {"data_type": 'RGBA'}},
+            "image": {"type": "ShaderNodeTexImage", "image": "/path/to/texture.png",
+                      "colorspace": "Non-Color"},
+        },
+        "links": [("bsdf.BSDF", "output.Surface"), ("noise.Factor", "ramp.Factor")],
+    }
+
+Socket names are written the Blender 4.x way ("Factor", "A", "Result",
+"Specular IOR Level"); each (node type, settings, socket) is resolved to
+the socket this Blender version actually has once per session, including
+older aliases ("Fac", "Color1", "Specular"). Compiled materials are
+registered by spec hash (see material_registry), so compiling the same
+spec again returns the existing material.
+"""
+
+import os
+import bpy
+from .material_registry import get_material_registry
+
+# Blender 4.x socket names and the names older versions used
+SOCKET_ALIASES = {
+    "Factor": ("Fac",),
+    "A": ("Color1",),
+    "B": ("Color2",),
+    "Result": ("Color",),
+    "Specular IOR Level": ("Specular",),
+    "Sheen Weight": ("Sheen",),
+    "Subsurface Weight": ("Subsurface",),
+    "Transmission Weight": ("Transmission",),
+    "Coat Weight": ("Clearcoat",),
+    "Emission Color": ("Emission",),
+}
+
+# (node type, settings, "inputs"/"outputs", name) -> socket index, or None if missing
+_socket_indices = {}
+
+# Horizontal spacing of compiled nodes in the editor
+NODE_SPACING = 250
+
+def _settings_key(node_spec):
+    """Node settings that change which sockets are available (e.g. ShaderNodeMix.data_type)"""
+    return tuple(sorted((key, str(value)) for key, value in node_spec.get("props", {}).items()))
+
+def _resolve_socket(node, direction, name):
+    """Index of the first available socket named name or one of its aliases"""
+    sockets = getattr(node, direction)
+    for candidate in (name,) + SOCKET_ALIASES.get(name, ()):
+        for index, socket in enumerate(sockets):
+            if socket.name == candidate and getattr(socket, "enabled", True):
+                return index
+    return None
+
+def _socket(node, node_spec, direction, name):
+    """Socket of a compiled node, resolved once per session; None if this Blender has no such socket"""
+    key = (node.bl_idname, _settings_key(node_spec), direction, name)
+    if key not in _socket_indices:
+        _socket_indices[key] = _resolve_socket(node, direction, name)
+        if _socket_indices[key] is None:
+            print(f"  WARNING: {node.bl_idname} has no {direction[:-1]} socket '{name}', skipped")
+    index = _socket_indices[key]
+    return None if index is None else getattr(node, direction)[index]
+
+def _load_image(path):
+    """Image datablock for a file, reusing one already loaded; None if it cannot be read"""
+    if not path or not os.path.exists(path):
+        print(f"  WARNING: Texture not found: {path}")
+        return None
+    try:
+        return bpy.data.images.load(path, check_existing=True)
+    except RuntimeError as e:
+        print(f"  WARNING: Could not load texture {path}: {e}")
+        return None
+
+def build_node_tree(node_tree, spec):
+    """Replace a node tree's contents with the nodes and links of a spec"""
+    nodes = node_tree.nodes
+    links = node_tree.links
+    nodes.clear()
+
+    # Create every node first, then settings, values and links
+    created = {}
+    node_specs = spec.get("nodes", {})
+    for column, (key, node_spec) in enumerate(reversed(list(node_specs.items()))):
+        node = nodes.new(type=node_spec["type"])
+        node.name = key
+        node.location = (-column * NODE_SPACING, 0)
+        created[key] = node
+
+    for key, node_spec in node_specs.items():
+        node = created[key]
+        for prop, value in node_spec.get("props", {}).items():
+            setattr(node, prop, value)
+
+        if "image" in node_spec:
+            image = _load_image(node_spec["image"])
+            if image is None:
+                # Without its image the node would only render black; links to it are dropped
+                nodes.remove(node)
+                del created[key]
+                continue
+            if "colorspace" in node_spec:
+                image.colorspace_settings.name = node_spec["colorspace"]
+            node.image = image
+
+        for name, value in node_spec.get("inputs", {}).items():
+            socket = _socket(node, node_spec, "inputs", name)
+            if socket is not None:
+                socket.default_value = value
+
+        if "ramp" in node_spec:
+            elements = node.color_ramp.elements
+            for index, (position, color) in enumerate(node_spec["ramp"]):
+                element = elements[index] if index < len(elements) else elements.new(position)
+                element.position = position
+                element.color = color
+
+    for source, target in spec.get("links", []):
+        from_key, from_name = source.split(".", 1)
+        to_key, to_name = target.split(".", 1)
+        if from_key not in created or to_key not in created:
+            continue
+        from_socket = _socket(created[from_key], node_specs[from_key], "outputs", from_name)
+        to_socket = _socket(created[to_key], node_specs[to_key], "inputs", to_name)
+        if from_socket is not None and to_socket is not None:
+            links.new(from_socket, to_socket)
+
+def build_material(name, spec):
+    """New material compiled from a spec"""
+    material = bpy.data.materials.new(name=name)
+    material.use_nodes = True
+    build_node_tree(material.node_tree, spec)
+    for prop, value in spec.get("material", {}).items():
+        setattr(material, prop, value)
+    return material
+
+def compile_material(spec, acquire=False):
+    """Material for a spec, built only the first time that exact spec is compiled.
+
+    acquire holds a registry reference the caller must release.
+    """
+    return get_material_registry().get_or_create(
+        spec["name"], spec, lambda name, params: build_material(name, params), acquire=acquire)
+
+def compile_materials(specs, acquire=False):
+    """Compile several specs; returns {key: material} for a {key: spec} dict"""
+    return {key: compile_material(spec, acquire) for key, spec in specs.items()}
+
+def principled_spec(name, inputs):
+    """Spec of a plain Principled BSDF material with the given input values"""
+    return {
+        "name": name,
+        "nodes": {
+            "output": {"type": "ShaderNodeOutputMaterial"},
+            "bsdf": {"type": "ShaderNodeBsdfPrincipled", "inputs": dict(inputs)},
+        },
+        "links": [("bsdf.BSDF", "output.Surface")],
+    }
@@ -0,0 +1,68 @@
+"""Precompiled material keyword matcher for slot and object names, importable without bpy
+
+The keyword table is compiled into one regular expression. Alternatives
+are ordered by type priority, and a zero-width lookahead tries them at
+every position, so a single scan finds the highest-priority keyword in a
+name. Results are memoized per name, since imported kits repeat part names.
+"""
+
+import re
+from . import config
+
+class KeywordMatcher:
+    """Matches names against {material type: [keywords]} with explicit type priorities.
+
+    priority lists material types from most to least important; types
+    missing from it rank after the listed ones, in table order.
+    """
+
+    def __init__(self, keywords, priority=None):
+        order = list(priority or []) + [t for t in keywords if t not in (priority or [])]
+        self.rank = {material_type: index for index, material_type in enumerate(order)}
+
+        entries = sorted(
+            ((self.rank[material_type], -len(keyword), keyword.lower(), material_type)
+             for material_type, words in keywords.items() for keyword in words),
+        )
+        self.keyword_types = {}
+        for _, _, keyword, material_type in entries:
+            self.keyword_types.setdefault(keyword, material_type)
+        alternatives = "|".join(re.escape(keyword) for keyword in self.keyword_types)
+        self.pattern = re.compile(f"(?=({alternatives}))") if alternatives else None
+        self._memo = {}
+
+    def match(self, name):
+        """(material type, keyword) of the highest-priority keyword in name, or None"""
+        if not name or self.pattern is None:
+            return None
+        key = name.lower()
+        if key not in self._memo:
+            best = None
+            for found in self.pattern.finditer(key):
+                keyword = found.group(1)
+                rank = self.rank[self.keyword_types[keyword]]
+                if best is None or rank < best[0]:
+                    best = (rank, keyword)
+                    if rank == 0:
+                        break
+            self._memo[key] = (self.keyword_types[best[1]], best[1]) if best else None
+        return self._memo[key]
+
+_matcher = None
+
+def get_keyword_matcher():
+    """Matcher compiled from config.MATERIAL_KEYWORDS once per session"""
+    global _matcher
+    if _matcher is None:
+        _matcher = KeywordMatcher(config.MATERIAL_KEYWORDS, config.MATERIAL_KEYWORD_PRIORITY)
+    return _matcher
+
+def format_match_table(rows):
+    """Text table of (object, slot, material type, keyword, matched on) rows"""
+    header = ("Object", "Slot", "Material", "Keyword", "Matched on")
+    rows = [tuple(str(value) if value is not None else "-" for value in row) for row in rows]
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    lines = ["  ".join(value.ljust(widths[i]) for i, value in enumerate(row)).rstrip()
+             for row in [header] + rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
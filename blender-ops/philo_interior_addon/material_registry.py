@@ -0,0 +1,117 @@
+"""Deduplicating material registry keyed by a hash of each material's parameters
+
+Asking for the same kind of material with the same parameters returns the
+existing datablock instead of building another node tree (and another
+Premium_Fabric.001). The hash is stored on the material, so materials in
+a reopened .blend file are found again. Code that keeps materials around
+before assigning them (MaterialManager) holds references; purge() removes
+registered materials that are neither referenced nor used by any slot.
+"""
+
+import json
+import hashlib
+import bpy
+
+# Custom property holding a registered material's spec hash
+MATERIAL_HASH_KEY = "philo_material_hash"
+
+def spec_hash(kind, params):
+    """Stable hash of a material kind and its parameters"""
+    payload = json.dumps({"kind": kind, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+class MaterialRegistry:
+    """Materials by spec hash, with reference counts"""
+
+    def __init__(self):
+        self._materials = {}  # spec hash -> material
+        self._refs = {}       # spec hash -> references held by callers
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key):
+        """Live material for a hash, or None"""
+        material = self._materials.get(key)
+        if material is not None:
+            try:
+                if material.get(MATERIAL_HASH_KEY) == key:
+                    return material
+            except ReferenceError:
+                pass  # Removed from bpy.data since it was registered
+            del self._materials[key]
+
+        # Registered in an earlier session or before the index was reset
+        for material in bpy.data.materials:
+            if material.get(MATERIAL_HASH_KEY) == key:
+                self._materials[key] = material
+                return material
+        return None
+
+    def find(self, key):
+        """Registered material for a spec hash, or None"""
+        return self._lookup(key)
+
+    def get_or_create(self, kind, params, builder, acquire=True):
+        """Material for (kind, params), built with builder(kind, params) on a miss.
+
+        kind doubles as the name of a newly built material. acquire counts
+        a reference the caller must release().
+        """
+        key = spec_hash(kind, params)
+        material = self._lookup(key)
+        if material is None:
+            material = builder(kind, params)
+            material[MATERIAL_HASH_KEY] = key
+            self._materials[key] = material
+            self.misses += 1
+        else:
+            self.hits += 1
+        if acquire:
+            self._refs[key] = self._refs.get(key, 0) + 1
+        return material
+
+    def release(self, material):
+        """Drop one reference to a material; unregistered materials and None are ignored"""
+        if material is None:
+            return
+        try:
+            key = material.get(MATERIAL_HASH_KEY)
+        except ReferenceError:
+            return
+        if self._refs.get(key, 0) > 0:
+            self._refs[key] -= 1
+
+    def purge(self):
+        """Remove registered materials without references or Blender users; returns how many"""
+        removed = 0
+        for key, material in list(self._materials.items()):
+            try:
+                users = material.users
+            except ReferenceError:
+                del self._materials[key]
+                continue
+            if self._refs.get(key, 0) <= 0 and users == 0:
+                bpy.data.materials.remove(material)
+                del self._materials[key]
+                self._refs.pop(key, None)
+                removed += 1
+        return removed
+
+    def reset(self):
+        """Forget all materials and references (after the scene's materials were removed)"""
+        self._materials.clear()
+        self._refs.clear()
+
+    def report(self):
+        """One-line summary of registry use"""
+        return (f"{len(self._materials)} registered materials, "
+                f"{self.hits} reused, {self.misses} built")
+
+_shared_registry = None
+
+def get_material_registry():
+    """Process-wide registry, shared by every MaterialManager and generator"""
+    global _shared_registry
+    if _shared_registry is None:
+        _shared_registry = MaterialRegistry()
+    return _shared_registry
@@ -0,0 +1,240 @@
+"""Attribute-driven material families for instant recoloring
+
+A family is one shader whose color, roughness, metallic, surface pattern,
+bump strength and image texture come from object custom properties, read
+with Attribute nodes of type OBJECT. Every object of a family shares the
+one compiled material (and, for linked duplicates, the mesh); a colorway
+is a set of property values, so recoloring writes a few properties and
+never builds a material or recompiles a shader.
+
+Families are linked to object material slots, not mesh slots: a mesh is
+shared with the asset library master and every duplicate, and objects
+without colorway properties would read 0 (black) from the shader. A mesh
+with no slots at all needs one to link into; if other objects share it,
+the object gets its own copy of the mesh first.
+"""
+
+import os
+from . import config
+from .material_compiler import compile_material, principled_spec
+
+# Colorway field -> object custom property the family shaders read
+VARIANT_PROPS = {
+    "color": "philo_color",
+    "roughness": "philo_roughness",
+    "metallic": "philo_metallic",
+    "pattern": "philo_pattern",
+    "bump": "philo_bump",
+    "texture": "philo_texture",
+}
+
+# Object custom properties recording the family and colorway applied
+FAMILY_KEY = "philo_material_family"
+COLORWAY_KEY = "philo_colorway"
+
+# Values for fields a colorway leaves out; a missing property would read as 0 (black)
+DEFAULT_VARIANT = {
+    "color": (0.5, 0.5, 0.5),
+    "roughness": 0.5,
+    "metallic": 0.0,
+    "pattern": 0,
+    "bump": 0.0,
+    "texture": 0,
+}
+
+def _attribute(field):
+    return {"type": "ShaderNodeAttribute",
+            "props": {"attribute_type": 'OBJECT', "attribute_name": VARIANT_PROPS[field]}}
+
+def _select(nodes, links, prefix, index_output, sources, data_type):
+    """Mix chain picking one of several output sockets by an index; returns the result socket"""
+    selected = sources[0]
+    for index, source in enumerate(sources[1:], start=1):
+        # Step from 0 to 1 as the index goes from index - 1 to index
+        nodes[f"{prefix}select_{index}"] = {"type": "ShaderNodeMapRange",
+                                            "inputs": {"From Min": index - 1, "From Max": index}}
+        nodes[f"{prefix}mix_{index}"] = {"type": "ShaderNodeMix", "props": {"data_type": data_type}}
+        links += [
+            (index_output, f"{prefix}select_{index}.Value"),
+            (f"{prefix}select_{index}.Result", f"{prefix}mix_{index}.Factor"),
+            (selected, f"{prefix}mix_{index}.A"),
+            (source, f"{prefix}mix_{index}.B"),
+        ]
+        selected = f"{prefix}mix_{index}.Result"
+    return selected
+
+def family_spec(name, inputs, patterns=(), textures=()):
+    """Spec of a family shader.
+
+    patterns lists (texture node type, inputs, output socket) bump patterns;
+    the pattern property picks one by index. textures lists image paths
+    tinted by the color property; texture 0 is plain color and n picks
+    textures[n - 1] (plain color again if that file is missing).
+    """
+    nodes = {
+        "output": {"type": "ShaderNodeOutputMaterial"},
+        "bsdf": {"type": "ShaderNodeBsdfPrincipled", "inputs": dict(inputs)},
+        "color": _attribute("color"),
+        "roughness": _attribute("roughness"),
+        "metallic": _attribute("metallic"),
+    }
+    links = [
+        ("roughness.Fac", "bsdf.Roughness"),
+        ("metallic.Fac", "bsdf.Metallic"),
+        ("bsdf.BSDF", "output.Surface"),
+    ]
+    color = "color.Color"
+    if textures:
+        nodes["texture"] = _attribute("texture")
+        if any(os.path.exists(path) for path in textures):
+            nodes["tex_coord"] = {"type": "ShaderNodeTexCoord"}
+            nodes["mapping"] = {"type": "ShaderNodeMapping"}
+            links.append(("tex_coord.Generated", "mapping.Vector"))
+        tinted = [color]
+        for index, path in enumerate(textures):
+            if not os.path.exists(path):
+                tinted.append(color)
+                continue
+            # The mtime is part of the spec hash, so an edited image rebuilds the material
+            nodes[f"image_{index}"] = {"type": "ShaderNodeTexImage", "image": path,
+                                       "image_mtime": os.path.getmtime(path)}
+            nodes[f"tint_{index}"] = {"type": "ShaderNodeMix", "inputs": {"Factor": 1.0},
+                                      "props": {"data_type": 'RGBA', "blend_type": 'MULTIPLY'}}
+            links += [
+                ("mapping.Vector", f"image_{index}.Vector"),
+                (color, f"tint_{index}.A"),
+                (f"image_{index}.Color", f"tint_{index}.B"),
+            ]
+            tinted.append(f"tint_{index}.Result")
+        color = _select(nodes, links, "texture_", "texture.Fac", tinted, 'RGBA')
+    links.append((color, "bsdf.Base Color"))
+
+    if patterns:
+        nodes["pattern"] = _attribute("pattern")
+        nodes["bump_strength"] = _attribute("bump")
+        nodes["bump"] = {"type": "ShaderNodeBump"}
+        sources = []
+        for index, (texture_type, texture_inputs, output) in enumerate(patterns):
+            nodes[f"pattern_{index}"] = {"type": texture_type, "inputs": dict(texture_inputs)}
+            sources.append(f"pattern_{index}.{output}")
+        selected = _select(nodes, links, "", "pattern.Fac", sources, 'FLOAT')
+        links += [
+            (selected, "bump.Height"),
+            ("bump_strength.Fac", "bump.Strength"),
+            ("bump.Normal", "bsdf.Normal"),
+        ]
+    return {"name": name, "nodes": nodes, "links": links}
+
+# One shader per family
+VARIANT_FAMILIES = {
+    "upholstery": family_spec("Upholstery", {"Specular IOR Level": 0.3, "Sheen Weight": 0.3}, [
+        ("ShaderNodeTexNoise", {"Scale": 150, "Detail": 16}, "Factor"),                  # woven fabric
+        ("ShaderNodeTexWave", {"Scale": 100, "Distortion": 2}, "Color"),                 # linen
+        ("ShaderNodeTexNoise", {"Scale": 50, "Detail": 15, "Roughness": 0.7}, "Factor"), # leather grain
+    ], textures=[config.FABRIC_TEXTURE_PATH, config.BURLAP_TEXTURE_PATH]),
+    "wood": family_spec("Wood", {"Specular IOR Level": 0.6}, [
+        ("ShaderNodeTexWave", {"Scale": 15, "Distortion": 2}, "Color"),                  # long grain
+        ("ShaderNodeTexNoise", {"Scale": 80}, "Factor"),                                 # burl
+    ]),
+    "finish": family_spec("Finish", {"Specular IOR Level": 0.5}),
+}
+
+# Colorways by family; fields left out take DEFAULT_VARIANT values
+COLORWAYS = {
+    "upholstery": {
+        "charcoal": {"color": (0.15, 0.15, 0.18), "roughness": 0.8, "pattern": 0, "bump": 0.02},
+        "velvet": {"color": (0.2, 0.15, 0.4), "roughness": 0.8, "pattern": 0, "bump": 0.01},
+        "linen": {"color": (0.9, 0.85, 0.75), "roughness": 0.9, "pattern": 1, "bump": 0.1},
+        "microfiber": {"color": (0.6, 0.6, 0.65), "roughness": 0.7, "pattern": 0, "bump": 0.0},
+        "cognac_leather": {"color": (0.4, 0.25, 0.15), "roughness": 0.3, "pattern": 2, "bump": 0.2},
+        "espresso_leather": {"color": (0.08, 0.05, 0.03), "roughness": 0.15, "pattern": 2, "bump": 0.05},
+        "gray_cloth": {"color": (1.0, 1.0, 1.0), "roughness": 0.85, "pattern": 0, "bump": 0.02, "texture": 1},
+        "burlap": {"color": (0.95, 0.9, 0.8), "roughness": 0.9, "pattern": 1, "bump": 0.05, "texture": 2},
+    },
+    "wood": {
+        "walnut": {"color": (0.09, 0.05, 0.02), "roughness": 0.1, "pattern": 0, "bump": 0.02},
+        "oak": {"color": (0.45, 0.3, 0.15), "roughness": 0.35, "pattern": 0, "bump": 0.03},
+        "ash": {"color": (0.7, 0.6, 0.45), "roughness": 0.4, "pattern": 1, "bump": 0.02},
+    },
+    "finish": {
+        "brushed_steel": {"color": (0.7, 0.7, 0.7), "roughness": 0.2, "metallic": 1.0},
+        "brass": {"color": (0.8, 0.6, 0.3), "roughness": 0.25, "metallic": 1.0},
+        "matte_black": {"color": (0.03, 0.03, 0.03), "roughness": 0.6},
+        "grey_plastic": {"color": (0.5, 0.5, 0.5), "roughness": 0.4},
+    },
+}
+
+# Catalog material types drawn from a family, with their default colorway
+MATERIAL_TYPE_FAMILIES = {
+    "fabric": ("upholstery", "charcoal"),
+    "leather": ("upholstery", "espresso_leather"),
+    "wood": ("wood", "walnut"),
+    "metal": ("finish", "brushed_steel"),
+    "plastic": ("finish", "grey_plastic"),
+}
+
+def family_material(family):
+    """The shared material of a family, compiled the first time it is used"""
+    if family not in VARIANT_FAMILIES:
+        raise ValueError(f"Unknown material family: {family}")
+    return compile_material(VARIANT_FAMILIES[family])
+
+def colorway_values(family, colorway):
+    """Every field of a colorway, given by name or as a dict of field values"""
+    if isinstance(colorway, str):
+        if colorway not in COLORWAYS.get(family, {}):
+            raise ValueError(f"Unknown colorway for {family}: {colorway}")
+        colorway = COLORWAYS[family][colorway]
+    values = dict(DEFAULT_VARIANT)
+    values.update(colorway)
+    return values
+
+def colorway_spec(family, colorway):
+    """Plain Principled spec with a colorway's color, roughness and metallic baked in.
+
+    For exporters such as OBJ/MTL that cannot read object properties;
+    patterns and image textures are left out.
+    """
+    values = colorway_values(family, colorway)
+    family_spec = VARIANT_FAMILIES[family]
+    inputs = dict(family_spec["nodes"]["bsdf"]["inputs"])
+    inputs.update({
+        "Base Color": tuple(values["color"]) + (1.0,),
+        "Roughness": values["roughness"],
+        "Metallic": values["metallic"],
+    })
+    name = colorway if isinstance(colorway, str) else "custom"
+    return principled_spec(f"{family_spec['name']}_{name}", inputs)
+
+def set_colorway(objects, family, colorway):
+    """Write a colorway's properties to objects; returns how many were recolored"""
+    values = colorway_values(family, colorway)
+    recolored = 0
+    for obj in objects:
+        for field, value in values.items():
+            # Floats throughout: the Attribute node reads float properties and arrays
+            obj[VARIANT_PROPS[field]] = (tuple(float(v) for v in value)
+                                         if isinstance(value, (tuple, list)) else float(value))
+        obj[FAMILY_KEY] = family
+        obj[COLORWAY_KEY] = colorway if isinstance(colorway, str) else "custom"
+        obj.update_tag()
+        recolored += 1
+    return recolored
+
+def assign_family(obj, family, colorway=None):
+    """Link the family material to an object's first slot and give the object a colorway.
+
+    The slot links to the object, so other users of the mesh keep their materials.
+    """
+    material = family_material(family)
+    if not obj.data.materials:
+        # A slot added to a shared mesh would appear on every user; slot a private copy instead
+        if obj.data.users > 1:
+            obj.data = obj.data.copy()
+        obj.data.materials.append(None)  # An empty mesh slot for the object to link into
+    slot = obj.material_slots[0]
+    slot.link = 'OBJECT'
+    slot.material = material
+    if colorway is not None:
+        set_colorway([obj], family, colorway)
+    return material
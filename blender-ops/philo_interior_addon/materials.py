@@ -1,234 +1,220 @@
 """Material creation and assignment module"""
 
-import bpy
 import os
 from . import config
+from .material_registry import get_material_registry
+from .material_compiler import compile_material, principled_spec
+from .material_keywords import format_match_table, get_keyword_matcher
+
+def fabric_spec(texture_path=None):
+    """Fabric: noise bump over a dark base color, or over the fabric texture when it exists"""
+    spec = {
+        "name": "Premium_Fabric",
+        "nodes": {
+            "output": {"type": "ShaderNodeOutputMaterial"},
+            "bsdf": {"type": "ShaderNodeBsdfPrincipled", "inputs": {
+                "Base Color": (0.15, 0.15, 0.18, 1),
+                "Roughness": 0.8,
+                "Sheen Weight": 0.3,
+                "Specular IOR Level": 0.2,
+            }},
+            "tex_coord": {"type": "ShaderNodeTexCoord"},
+            "mapping": {"type": "ShaderNodeMapping"},
+            "noise": {"type": "ShaderNodeTexNoise", "inputs": {"Scale": 150, "Detail": 16}},
+            "bump": {"type": "ShaderNodeBump", "inputs": {"Strength": 0.02}},
+        },
+        "links": [
+            ("tex_coord.Generated", "mapping.Vector"),
+            ("mapping.Vector", "noise.Vector"),
+            ("noise.Factor", "bump.Height"),
+            ("bump.Normal", "bsdf.Normal"),
+            ("bsdf.BSDF", "output.Surface"),
+        ],
+    }
+    if texture_path and os.path.exists(texture_path):
+        # The mtime is part of the spec hash, so an edited image rebuilds the material
+        spec["nodes"]["image"] = {"type": "ShaderNodeTexImage", "image": texture_path,
+                                  "image_mtime": os.path.getmtime(texture_path)}
+        spec["links"] += [("mapping.Vector", "image.Vector"), ("image.Color", "bsdf.Base Color")]
+    return spec
+
+# Catalog materials by type; a new material type is one entry here
+MATERIAL_SPECS = {
+    "leather": {
+        "name": "Luxury_Leather",
+        "nodes": {
+            "output": {"type": "ShaderNodeOutputMaterial"},
+            "bsdf": {"type": "ShaderNodeBsdfPrincipled", "inputs": {
+                "Base Color": (0.08, 0.05, 0.03, 1),
+                "Roughness": 0.15,
+                "Specular IOR Level": 0.8,
+            }},
+            "noise": {"type": "ShaderNodeTexNoise", "inputs": {"Scale": 25, "Detail": 5}},
+            "bump": {"type": "ShaderNodeBump", "inputs": {"Strength": 0.05}},
+        },
+        "links": [
+            ("noise.Factor", "bump.Height"),
+            ("bump.Normal", "bsdf.Normal"),
+            ("bsdf.BSDF", "output.Surface"),
+        ],
+    },
+    "wood": {
+        "name": "Premium_Wood",
+        "nodes": {
+            "output": {"type": "ShaderNodeOutputMaterial"},
+            "bsdf": {"type": "ShaderNodeBsdfPrincipled", "inputs": {
+                "Roughness": 0.1,
+                "Specular IOR Level": 0.6,
+            }},
+            "wave": {"type": "ShaderNodeTexWave", "inputs": {"Scale": 15, "Distortion": 2}},
+            "noise": {"type": "ShaderNodeTexNoise", "inputs": {"Scale": 80}},
+            "ramp": {"type": "ShaderNodeValToRGB", "ramp": [
+                (0.0, (0.06, 0.03, 0.01, 1)),
+                (1.0, (0.12, 0.07, 0.03, 1)),
+            ]},
+            "mix": {"type": "ShaderNodeMix", "props": {"data_type": 'RGBA'}, "inputs": {"Factor": 0.3}},
+        },
+        "links": [
+            ("wave.Color", "ramp.Factor"),
+            ("ramp.Color", "mix.A"),
+            ("noise.Color", "mix.B"),
+            ("mix.Result", "bsdf.Base Color"),
+            ("bsdf.BSDF", "output.Surface"),
+        ],
+    },
+    "metal": principled_spec("Brushed_Metal", {
+        "Base Color": (0.7, 0.7, 0.7, 1), "Metallic": 1.0, "Roughness": 0.2}),
+    "glass": principled_spec("Clear_Glass", {
+        "Base Color": (1, 1, 1, 1), "Roughness": 0.0, "Transmission Weight": 0.95, "IOR": 1.45}),
+    "plastic": principled_spec("Plastic", {
+        "Base Color": (0.5, 0.5, 0.5, 1), "Roughness": 0.4, "Specular IOR Level": 0.5}),
+}
+
+def catalog_specs(fabric_texture_path=None):
+    """Every catalog material spec by type, fabric included"""
+    specs = {"fabric": fabric_spec(fabric_texture_path or config.FABRIC_TEXTURE_PATH)}
+    specs.update(MATERIAL_SPECS)
+    return specs
+
+def get_principled_material(name, params):
+    """Registered Principled BSDF material for name and input values, built once.
+
+    No reference is held: the material stays as long as slots use it.
+    """
+    return compile_material(principled_spec(name, params))
 
 class MaterialManager:
-    def __init__(self):
+    def __init__(self, registry=None):
         self.materials = {}
+        self.registry = registry or get_material_registry()
     
     def create_all_materials(self, fabric_texture_path=None):
-        """Create all material types"""
+        """Create all material types (existing identical materials are reused).
+        
+        The manager holds one registry reference per type until
+        release_all(); getting the same set again costs no extra references.
+        """
+        self.release_all()
         self.materials["fabric"] = self.create_fabric_material(fabric_texture_path)
-        self.materials["leather"] = self.create_leather_material()
-        self.materials["wood"] = self.create_wood_material()
-        self.materials["metal"] = self.create_metal_material()
-        self.materials["glass"] = self.create_glass_material()
-        self.materials["plastic"] = self.create_plastic_material()
+        for material_type in MATERIAL_SPECS:
+            self.materials[material_type] = self.create(material_type)
         return self.materials
     
+    def release_all(self):
+        """Release the references held for the last create_all_materials"""
+        for material in self.materials.values():
+            self.registry.release(material)
+        self.materials = {}
+    
+    def create(self, material_type, fabric_texture_path=None):
+        """One material by type name ("fabric" or a MATERIAL_SPECS key); acquires a reference"""
+        if material_type == "fabric":
+            return self.create_fabric_material(fabric_texture_path)
+        spec = MATERIAL_SPECS.get(material_type)
+        return compile_material(spec, acquire=True) if spec else None
+    
     def create_fabric_material(self, texture_path=None):
         """Create realistic fabric material"""
-        mat = bpy.data.materials.new(name="Premium_Fabric")
-        mat.use_nodes = True
-        nodes = mat.node_tree.nodes
-        links = mat.node_tree.links
-        nodes.clear()
-        
-        # Setup nodes
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        principled = nodes.new(type='ShaderNodeBsdfPrincipled')
-        tex_coord = nodes.new(type='ShaderNodeTexCoord')
-        mapping = nodes.new(type='ShaderNodeMapping')
-        
-        # Fabric properties
-        principled.inputs['Base Color'].default_value = (0.15, 0.15, 0.18, 1)
-        principled.inputs['Roughness'].default_value = 0.8
-        principled.inputs['Sheen Weight'].default_value = 0.3
-        principled.inputs['Specular IOR Level'].default_value = 0.2
-        
-        # Texture if available
-        if texture_path and os.path.exists(texture_path):
-            img_node = nodes.new(type='ShaderNodeTexImage')
-            try:
-                img_node.image = bpy.data.images.load(texture_path)
-                links.new(mapping.outputs['Vector'], img_node.inputs['Vector'])
-                links.new(img_node.outputs['Color'], principled.inputs['Base Color'])
-            except:
-                pass
-        
-        # Fabric pattern
-        noise_tex = nodes.new(type='ShaderNodeTexNoise')
-        noise_tex.inputs['Scale'].default_value = 150
-        noise_tex.inputs['Detail'].default_value = 16
-        
-        bump = nodes.new(type='ShaderNodeBump')
-        bump.inputs['Strength'].default_value = 0.02
-        
-        # Connect
-        links.new(tex_coord.outputs['Generated'], mapping.inputs['Vector'])
-        links.new(mapping.outputs['Vector'], noise_tex.inputs['Vector'])
-        # Blender 4.x uses 'Factor' instead of 'Fac'
-        noise_output = 'Factor' if 'Factor' in noise_tex.outputs else 'Fac'
-        links.new(noise_tex.outputs[noise_output], bump.inputs['Height'])
-        links.new(bump.outputs['Normal'], principled.inputs['Normal'])
-        links.new(principled.outputs['BSDF'], output.inputs['Surface'])
-        
-        return mat
+        return compile_material(fabric_spec(texture_path), acquire=True)
     
     def create_leather_material(self):
         """Create leather material"""
-        mat = bpy.data.materials.new(name="Luxury_Leather")
-        mat.use_nodes = True
-        nodes = mat.node_tree.nodes
-        links = mat.node_tree.links
-        principled = nodes["Principled BSDF"]
-        
-        # Leather properties
-        principled.inputs['Base Color'].default_value = (0.08, 0.05, 0.03, 1)
-        principled.inputs['Roughness'].default_value = 0.15
-        principled.inputs['Specular IOR Level'].default_value = 0.8
-        
-        # Leather texture
-        noise = nodes.new(type='ShaderNodeTexNoise')
-        noise.inputs['Scale'].default_value = 25
-        noise.inputs['Detail'].default_value = 5
-        
-        bump = nodes.new(type='ShaderNodeBump')
-        bump.inputs['Strength'].default_value = 0.05
-        
-        # Blender 4.x uses 'Factor' instead of 'Fac'
-        noise_output = 'Factor' if 'Factor' in noise.outputs else 'Fac'
-        links.new(noise.outputs[noise_output], bump.inputs['Height'])
-        links.new(bump.outputs['Normal'], principled.inputs['Normal'])
-        
-        return mat
+        return self.create("leather")
     
     def create_wood_material(self):
         """Create wood material"""
-        mat = bpy.data.materials.new(name="Premium_Wood")
-        mat.use_nodes = True
-        nodes = mat.node_tree.nodes
-        links = mat.node_tree.links
-        principled = nodes["Principled BSDF"]
-        
-        # Wood grain
-        wave = nodes.new(type='ShaderNodeTexWave')
-        wave.inputs['Scale'].default_value = 15
-        wave.inputs['Distortion'].default_value = 2
-        
-        noise = nodes.new(type='ShaderNodeTexNoise')
-        noise.inputs['Scale'].default_value = 80
-        
-        mix = nodes.new(type='ShaderNodeMix')
-        mix.data_type = 'RGBA'
-        # Blender 4.x uses 'Factor' instead of 'Fac'
-        factor_input = 'Factor' if 'Factor' in mix.inputs else 'Fac'
-        mix.inputs[factor_input].default_value = 0.3
-        
-        ramp = nodes.new(type='ShaderNodeValToRGB')
-        ramp.color_ramp.elements[0].color = (0.06, 0.03, 0.01, 1)
-        ramp.color_ramp.elements[1].color = (0.12, 0.07, 0.03, 1)
-        
-        principled.inputs['Roughness'].default_value = 0.1
-        principled.inputs['Specular IOR Level'].default_value = 0.6
-        
-        # Blender 4.x uses 'Factor' instead of 'Fac'
-        ramp_input = 'Factor' if 'Factor' in ramp.inputs else 'Fac'
-        links.new(wave.outputs['Color'], ramp.inputs[ramp_input])
-        # Blender 4.x uses 'A' and 'B' instead of 'Color1' and 'Color2'
-        color1_input = 'A' if 'A' in mix.inputs else 'Color1'
-        color2_input = 'B' if 'B' in mix.inputs else 'Color2'
-        links.new(ramp.outputs['Color'], mix.inputs[color1_input])
-        links.new(noise.outputs['Color'], mix.inputs[color2_input])
-        # Blender 4.x uses 'Result' instead of 'Color' for mix output
-        mix_output = 'Result' if 'Result' in mix.outputs else 'Color'
-        links.new(mix.outputs[mix_output], principled.inputs['Base Color'])
-        
-        return mat
+        return self.create("wood")
     
     def create_metal_material(self):
         """Create metal material"""
-        mat = bpy.data.materials.new(name="Brushed_Metal")
-        mat.use_nodes = True
-        principled = mat.node_tree.nodes["Principled BSDF"]
-        
-        principled.inputs['Base Color'].default_value = (0.7, 0.7, 0.7, 1)
-        principled.inputs['Metallic'].default_value = 1.0
-        principled.inputs['Roughness'].default_value = 0.2
-        
-        return mat
+        return self.create("metal")
     
     def create_glass_material(self):
         """Create glass material"""
-        mat = bpy.data.materials.new(name="Clear_Glass")
-        mat.use_nodes = True
-        principled = mat.node_tree.nodes["Principled BSDF"]
-        
-        principled.inputs['Base Color'].default_value = (1, 1, 1, 1)
-        principled.inputs['Roughness'].default_value = 0.0
-        principled.inputs['Transmission Weight'].default_value = 0.95
-        principled.inputs['IOR'].default_value = 1.45
-        
-        return mat
+        return self.create("glass")
     
     def create_plastic_material(self):
         """Create plastic material"""
-        mat = bpy.data.materials.new(name="Plastic")
-        mat.use_nodes = True
-        principled = mat.node_tree.nodes["Principled BSDF"]
-        
-        principled.inputs['Base Color'].default_value = (0.5, 0.5, 0.5, 1)
-        principled.inputs['Roughness'].default_value = 0.4
-        principled.inputs['Specular IOR Level'].default_value = 0.5
-        
-        return mat
+        return self.create("plastic")
+
+def create_material(material_type):
+    """Registered material of a type, with the default fabric texture for fabric.
+
+    No reference is held: the material stays as long as slots use it.
+    """
+    registry = get_material_registry()
+    material = MaterialManager(registry).create(material_type, config.FABRIC_TEXTURE_PATH)
+    registry.release(material)
+    return material
 
 def assign_materials_by_name(obj, materials):
-    """Intelligently assign materials based on object/material slot names"""
+    """Intelligently assign materials based on object/material slot names.
+    
+    One pass over every mesh in the hierarchy: each slot takes the material
+    of the highest-priority keyword in its name, else in its object's name
+    (config.MATERIAL_KEYWORD_PRIORITY). Meshes without slots get one, with
+    fabric as the default. Prints the matches as one table and returns its rows.
+    """
     if not obj:
-        return
+        return []
     
-    objects_to_process = []
-    if obj.type == 'EMPTY' and obj.children:
-        objects_to_process = [child for child in obj.children if child.type == 'MESH']
-    elif obj.type == 'MESH':
-        objects_to_process = [obj]
+    matcher = get_keyword_matcher()
+    default = materials.get("fabric", materials[list(materials.keys())[0]])
+    rows = []
     
-    for mesh_obj in objects_to_process:
-        # Get existing material slots
-        existing_slots = list(mesh_obj.material_slots)
+    def lookup(name):
+        found = matcher.match(name)
+        return found if found and found[0] in materials else None
+    
+    for mesh_obj in [obj] + list(obj.children_recursive):
+        if mesh_obj.type != 'MESH' or mesh_obj.data is None:
+            continue
         
+        existing_slots = list(mesh_obj.material_slots)
         if existing_slots:
             # Keep existing slots but replace materials
+            object_match = lookup(mesh_obj.name)
             for slot in existing_slots:
-                slot_name = slot.name.lower() if slot.name else ""
-                material_assigned = False
-                
-                # Check each material type's keywords
-                for mat_type, keywords in config.MATERIAL_KEYWORDS.items():
-                    if any(keyword in slot_name for keyword in keywords):
-                        if mat_type in materials:
-                            slot.material = materials[mat_type]
-                            material_assigned = True
-                            print(f"Assigned {mat_type} to slot: {slot.name}")
-                            break
-                
-                # If no keyword match, check object name
-                if not material_assigned:
-                    obj_name = mesh_obj.name.lower()
-                    for mat_type, keywords in config.MATERIAL_KEYWORDS.items():
-                        if any(keyword in obj_name for keyword in keywords):
-                            if mat_type in materials:
-                                slot.material = materials[mat_type]
-                                print(f"Assigned {mat_type} to slot: {slot.name} (based on object name)")
-                                break
+                found, source = lookup(slot.name), "slot"
+                if found is None:
+                    found, source = object_match, "object"
+                if found is None:
+                    rows.append((mesh_obj.name, slot.name, None, None, None))
+                    continue
+                slot.material = materials[found[0]]
+                rows.append((mesh_obj.name, slot.name, found[0], found[1], source))
         else:
             # No existing slots, create one based on object name
+            found = lookup(mesh_obj.name)
             mesh_obj.data.materials.clear()
-            obj_name = mesh_obj.name.lower()
-            
-            material_assigned = False
-            for mat_type, keywords in config.MATERIAL_KEYWORDS.items():
-                if any(keyword in obj_name for keyword in keywords):
-                    if mat_type in materials:
-                        mesh_obj.data.materials.append(materials[mat_type])
-                        material_assigned = True
-                        print(f"Created material slot with {mat_type} for: {mesh_obj.name}")
-                        break
-            
-            # Default to fabric if no match
-            if not material_assigned:
-                mesh_obj.data.materials.append(materials.get("fabric", materials[list(materials.keys())[0]]))
-                print(f"Assigned default fabric material to: {mesh_obj.name}")
\ No newline at end of file
+            if found is not None:
+                mesh_obj.data.materials.append(materials[found[0]])
+                rows.append((mesh_obj.name, None, found[0], found[1], "object"))
+            else:
+                mesh_obj.data.materials.append(default)
+                rows.append((mesh_obj.name, None, default.name, None, "default"))
+    
+    if rows:
+        print(f"Material assignment for {obj.name}:")
+        print(format_match_table(rows))
+    return rows
@@ -0,0 +1,133 @@
+"""Build Blender meshes from parsed OBJ arrays with foreach_set"""
+
+import bpy
+import numpy as np
+from .obj_parser import parse_obj
+
+def _to_z_up(vectors):
+    """OBJ Y-up to Blender Z-up, the wm.obj_import default (forward -Z, up Y)"""
+    return np.stack([vectors[:, 0], -vectors[:, 2], vectors[:, 1]], axis=1)
+
+def get_or_create_material(name, spec=None):
+    """Existing material by name, or a new one from an MTL-style spec ({"color", "alpha", "texture"})"""
+    material = bpy.data.materials.get(name)
+    if material is not None:
+        return material
+
+    material = bpy.data.materials.new(name)
+    if not spec:
+        return material
+    material.use_nodes = True
+    principled = material.node_tree.nodes.get("Principled BSDF")
+    if principled is None:
+        return material
+    if spec.get("color"):
+        principled.inputs["Base Color"].default_value = (*spec["color"][:3], 1.0)
+    if spec.get("alpha", 1.0) < 1.0:
+        principled.inputs["Alpha"].default_value = spec["alpha"]
+    if spec.get("texture"):
+        try:
+            image = bpy.data.images.load(spec["texture"], check_existing=True)
+            texture = material.node_tree.nodes.new("ShaderNodeTexImage")
+            texture.image = image
+            material.node_tree.links.new(texture.outputs["Color"], principled.inputs["Base Color"])
+        except RuntimeError as e:
+            print(f"  WARNING: Could not load texture {spec['texture']}: {e}")
+    return material
+
+def mesh_from_arrays(name, positions, loop_vertices, face_sizes, material_indices=None,
+                     loop_uvs=None, loop_normals=None, materials=()):
+    """Mesh datablock from flat arrays: vertex positions, per-loop vertex indices and loops per face.
+
+    loop_uvs (L, 2) and loop_normals (L, 3) are optional per-loop
+    attributes; normals become custom split normals. materials is a list
+    of material datablocks for the slots material_indices refer to.
+    """
+    mesh = bpy.data.meshes.new(name)
+
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set("co", np.asarray(positions, dtype=np.float32).ravel())
+
+    loop_count = len(loop_vertices)
+    mesh.loops.add(loop_count)
+    mesh.loops.foreach_set("vertex_index", np.asarray(loop_vertices, dtype=np.int32))
+
+    face_sizes = np.asarray(face_sizes, dtype=np.int32)
+    mesh.polygons.add(len(face_sizes))
+    loop_starts = np.concatenate([[0], np.cumsum(face_sizes)[:-1]])
+    mesh.polygons.foreach_set("loop_start", loop_starts.astype(np.int32))
+    try:
+        mesh.polygons.foreach_set("loop_total", face_sizes)
+    except (AttributeError, TypeError, RuntimeError):
+        pass  # Read-only since Blender 4.0, derived from loop_start
+    if material_indices is not None:
+        mesh.polygons.foreach_set("material_index", np.asarray(material_indices, dtype=np.int32))
+
+    if loop_uvs is not None:
+        mesh.uv_layers.new(name="UVMap").data.foreach_set("uv", np.asarray(loop_uvs, dtype=np.float32).ravel())
+
+    for material in materials:
+        mesh.materials.append(material)
+
+    mesh.update(calc_edges=True)
+    mesh.validate(clean_customdata=False)
+
+    # Custom normals only if validate() removed nothing
+    if loop_normals is not None and len(mesh.loops) == loop_count:
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(face_sizes), dtype=bool))
+        if hasattr(mesh, "use_auto_smooth"):
+            mesh.use_auto_smooth = True  # Required for custom normals before Blender 4.1
+        mesh.normals_split_custom_set(np.asarray(loop_normals, dtype=np.float32))
+
+    return mesh
+
+def build_mesh(obj_data, entry, name=None, y_up=False):
+    """Mesh datablock for one parsed OBJ object (see ObjData.objects)"""
+    # Only the pool vertices this object uses, renumbered from 0
+    used, local_indices = np.unique(entry["vertex_indices"], return_inverse=True)
+    positions = obj_data.positions[used]
+    if y_up:
+        positions = _to_z_up(positions)
+
+    loop_uvs = None
+    uv_indices = entry["uv_indices"]
+    if (uv_indices >= 0).any() and len(obj_data.uvs):
+        loop_uvs = obj_data.uvs[np.maximum(uv_indices, 0)].astype(np.float32)
+        loop_uvs[uv_indices < 0] = 0.0
+
+    # Custom normals only when every loop has one
+    loop_normals = None
+    normal_indices = entry["normal_indices"]
+    if len(normal_indices) and (normal_indices >= 0).all():
+        loop_normals = obj_data.normals[normal_indices]
+        if y_up:
+            loop_normals = _to_z_up(loop_normals)
+
+    materials = [
+        get_or_create_material(material_name or "Material", obj_data.material_specs.get(material_name))
+        for material_name in entry["materials"]
+    ]
+    return mesh_from_arrays(name or entry["name"], positions, local_indices, entry["face_sizes"],
+                            entry["material_indices"], loop_uvs, loop_normals, materials)
+
+def build_objects(obj_data, collection=None, y_up=False):
+    """Link one object per parsed OBJ object into the collection and return them"""
+    collection = collection or bpy.context.collection
+    objects = []
+    for entry in obj_data.objects:
+        obj = bpy.data.objects.new(entry["name"], build_mesh(obj_data, entry, y_up=y_up))
+        collection.objects.link(obj)
+        objects.append(obj)
+    return objects
+
+def import_obj(filepath, collection=None, split_groups=False, y_up=False):
+    """Import an OBJ file as one object per `o` record and return the new objects.
+
+    Coordinates are kept as written in the file unless y_up converts them
+    the way wm.obj_import does.
+    """
+    obj_data = parse_obj(filepath, split_groups=split_groups)
+    objects = build_objects(obj_data, collection, y_up=y_up)
+    print(f"Imported {len(objects)} objects, {obj_data.vertex_count} vertices, "
+          f"{obj_data.face_count} faces from {filepath}")
+    return objects
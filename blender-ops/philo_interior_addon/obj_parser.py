@@ -0,0 +1,323 @@
+"""Streaming OBJ parser that tokenizes records with NumPy, importable without Blender
+
+The file is read in large chunks cut at line boundaries. Each chunk is
+classified line by line from its first bytes in one vectorized pass, and
+all v/vt/vn/f records of a chunk are converted to numbers by single
+NumPy calls, so no Python code runs per vertex or per face. Only the rare
+o/g/usemtl lines are handled in Python.
+"""
+
+import os
+import numpy as np
+
+CHUNK_SIZE = 16 * 1024 * 1024
+
+# Line classes
+_OTHER, _V, _VT, _VN, _F, _O, _G, _USEMTL, _MTLLIB = range(9)
+
+_SPACE, _TAB, _NL, _SLASH, _HASH = (ord(c) for c in " \t\n/#")
+
+# Bytes a run of plain float records can hold; anything else needs the per-line parse
+_FLOAT_BYTES = np.zeros(256, dtype=bool)
+_FLOAT_BYTES[np.frombuffer(b"0123456789+-.eEnNaAiIfF \t\r\n", dtype=np.uint8)] = True
+
+class ObjData:
+    """Parsed OBJ file.
+
+    positions (V, 3), uvs (T, 2) and normals (N, 3) are the file-wide
+    attribute pools. objects is a list of dicts, one per `o` record (or
+    per `g` record with split_groups), each with:
+      name: object name
+      face_sizes: loops per face (n-gons keep their size)
+      vertex_indices / uv_indices / normal_indices: per-loop 0-based
+          indices into the pools, -1 where a face omits the attribute
+      material_indices: per-face index into the object's materials list
+      materials: usemtl names used by the object (None for faces without one)
+    material_specs maps material names to their MTL definitions (see parse_mtl).
+    """
+
+    def __init__(self, positions, uvs, normals, objects, material_specs=None):
+        self.positions = positions
+        self.uvs = uvs
+        self.normals = normals
+        self.objects = objects
+        self.material_specs = material_specs or {}
+
+    @property
+    def vertex_count(self):
+        return len(self.positions)
+
+    @property
+    def face_count(self):
+        return sum(len(obj["face_sizes"]) for obj in self.objects)
+
+def _parse_floats(text, line_count, width):
+    """(line_count, width) floats from whitespace separated records, extra columns dropped"""
+    if line_count == 0:
+        return np.zeros((0, width))
+    if _FLOAT_BYTES[np.frombuffer(text, dtype=np.uint8)].all():
+        values = np.fromstring(text, dtype=np.float64, sep=" ")
+        if values.size % line_count == 0 and values.size // line_count >= width:
+            return values.reshape(line_count, -1)[:, :width]
+
+    # Records with differing column counts (e.g. optional w) or trailing tokens: parse line by line
+    rows = [line.split()[:width] for line in text.splitlines() if line.strip()]
+    return np.array(rows, dtype=np.float64)
+
+class ObjParser:
+    """Incremental OBJ parser; feed() chunks ending on a newline, then finish()"""
+
+    def __init__(self, name="Object", split_groups=False):
+        self.default_name = name
+        self.split_groups = split_groups
+
+        self.positions, self.uvs, self.normals = [], [], []
+        self.v_count = self.vt_count = self.vn_count = 0
+
+        self.face_sizes = []
+        self.loop_vertices, self.loop_uvs, self.loop_normals = [], [], []
+        self.face_count = 0
+
+        self.materials = []        # usemtl names in order of first use
+        self.material_ids = {}
+        self.material_events = []  # (first face, material id)
+        self.object_events = []    # (first face, object name)
+        self.material_libraries = []
+
+    def feed(self, chunk):
+        """Parse a chunk of complete lines"""
+        if not chunk:
+            return
+        buf = np.frombuffer(chunk, dtype=np.uint8)
+        ends = np.flatnonzero(buf == _NL)
+        starts = np.empty_like(ends)
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+        lengths = ends - starts + 1
+
+        # Classify every line from its first three bytes
+        padded = np.concatenate([buf, np.zeros(3, dtype=np.uint8)])
+        b0, b1, b2 = padded[starts], padded[starts + 1], padded[starts + 2]
+        sep1 = (b1 == _SPACE) | (b1 == _TAB)
+        sep2 = (b2 == _SPACE) | (b2 == _TAB)
+        classes = np.zeros(len(starts), dtype=np.uint8)
+        classes[(b0 == ord("v")) & sep1] = _V
+        classes[(b0 == ord("v")) & (b1 == ord("t")) & sep2] = _VT
+        classes[(b0 == ord("v")) & (b1 == ord("n")) & sep2] = _VN
+        classes[(b0 == ord("f")) & sep1] = _F
+        classes[(b0 == ord("o")) & sep1] = _O
+        classes[(b0 == ord("g")) & sep1] = _G
+        classes[(b0 == ord("u")) & (b1 == ord("s"))] = _USEMTL
+        classes[(b0 == ord("m")) & (b1 == ord("t"))] = _MTLLIB
+
+        # Blank out the record keywords so only numbers remain
+        work = buf.copy()
+        work[starts[(classes == _V) | (classes == _F)]] = _SPACE
+        keyword2 = starts[(classes == _VT) | (classes == _VN)]
+        work[keyword2] = _SPACE
+        work[keyword2 + 1] = _SPACE
+        byte_classes = np.repeat(classes, lengths)
+
+        # Blank out inline comments: every byte from a line's first # to its end
+        if _HASH in buf:
+            hashes = np.cumsum(buf == _HASH)
+            hashes_before_line = hashes[starts] - (buf[starts] == _HASH)
+            in_comment = hashes > np.repeat(hashes_before_line, lengths)
+            work[in_comment & (buf != _NL)] = _SPACE
+
+        # Counts of earlier records at every line, for negative indices and events
+        v_before = self.v_count + np.cumsum(classes == _V)
+        vt_before = self.vt_count + np.cumsum(classes == _VT)
+        vn_before = self.vn_count + np.cumsum(classes == _VN)
+        faces_before = self.face_count + np.cumsum(classes == _F) - (classes == _F)
+
+        for klass, pool, width in ((_V, self.positions, 3), (_VT, self.uvs, 2), (_VN, self.normals, 3)):
+            count = int((classes == klass).sum())
+            if count:
+                pool.append(_parse_floats(work[byte_classes == klass].tobytes(), count, width))
+
+        face_lines = np.flatnonzero(classes == _F)
+        if len(face_lines):
+            self._parse_faces(work[byte_classes == _F].tobytes(), face_lines,
+                              v_before, vt_before, vn_before)
+
+        # Rare records: objects, groups and materials
+        for line in np.flatnonzero(classes >= _O):
+            text = chunk[starts[line]:ends[line]].decode("utf-8", "replace").strip()
+            keyword, _, value = text.partition(" ")
+            value = value.strip()
+            first_face = int(faces_before[line])
+            if keyword == "o" or (keyword == "g" and self.split_groups):
+                self.object_events.append((first_face, value or self.default_name))
+            elif keyword == "usemtl":
+                if value not in self.material_ids:
+                    self.material_ids[value] = len(self.materials)
+                    self.materials.append(value)
+                self.material_events.append((first_face, self.material_ids[value]))
+            elif keyword == "mtllib" and value:
+                self.material_libraries.append(value)
+
+        self.v_count = int(v_before[-1])
+        self.vt_count = int(vt_before[-1])
+        self.vn_count = int(vn_before[-1])
+        self.face_count += len(face_lines)
+
+    def _parse_faces(self, text, face_lines, v_before, vt_before, vn_before):
+        """Vectorized parse of every `f` record in a chunk"""
+        # Give v//vn an explicit empty texture index (0 is never a valid OBJ index)
+        if b"//" in text:
+            text = text.replace(b"//", b"/0/")
+        face_bytes = np.frombuffer(text, dtype=np.uint8)
+
+        # Per-line loop count (tokens) and index components per loop (slashes)
+        line_starts = np.concatenate([[0], np.flatnonzero(face_bytes == _NL)[:-1] + 1])
+        blank = face_bytes <= _SPACE
+        token_starts = np.flatnonzero(blank[:-1] & ~blank[1:]) + 1
+
+        def per_line_count(positions):
+            return np.diff(np.searchsorted(positions, line_starts), append=len(positions))
+
+        sizes = per_line_count(token_starts)
+        slashes = per_line_count(np.flatnonzero(face_bytes == _SLASH))
+        components = slashes // np.maximum(sizes, 1) + 1
+
+        numbers = face_bytes.copy()
+        numbers[numbers == _SLASH] = _SPACE
+        values = np.fromstring(numbers.tobytes(), dtype=np.int64, sep=" ")
+        per_line = sizes * components
+        if values.size != per_line.sum():
+            raise ValueError("Malformed face records")
+
+        if (components == components[0]).all():
+            # Common case: one face format in the whole chunk
+            columns = values.reshape(-1, int(components[0]))
+            missing = np.zeros(len(columns), dtype=np.int64)
+            vertex = columns[:, 0]
+            uv = columns[:, 1] if columns.shape[1] >= 2 else missing
+            normal = columns[:, 2] if columns.shape[1] >= 3 else missing
+        else:
+            # Component of every parsed integer: 0 vertex, 1 texture, 2 normal
+            value_line = np.repeat(np.arange(len(sizes)), per_line)
+            line_offset = np.concatenate([[0], np.cumsum(per_line)[:-1]])
+            component = (np.arange(values.size) - line_offset[value_line]) % components[value_line]
+
+            loop_components = np.repeat(components, sizes)
+            vertex = values[component == 0]
+            uv = np.zeros(len(vertex), dtype=np.int64)
+            uv[loop_components >= 2] = values[component == 1]
+            normal = np.zeros(len(vertex), dtype=np.int64)
+            normal[loop_components >= 3] = values[component == 2]
+
+        # 1-based and negative (relative) indices to 0-based, missing to -1
+        def resolve(indices, before):
+            if (indices > 0).all():
+                return indices - 1
+            base = np.repeat(before[face_lines], sizes)
+            return np.where(indices > 0, indices - 1, np.where(indices < 0, base + indices, -1))
+
+        self.face_sizes.append(sizes)
+        self.loop_vertices.append(resolve(vertex, v_before))
+        self.loop_uvs.append(resolve(uv, vt_before))
+        self.loop_normals.append(resolve(normal, vn_before))
+
+    def finish(self):
+        """Assemble the parsed chunks into an ObjData"""
+        def join(parts, shape):
+            return np.concatenate(parts) if parts else np.zeros(shape)
+
+        positions = join(self.positions, (0, 3))
+        uvs = join(self.uvs, (0, 2))
+        normals = join(self.normals, (0, 3))
+        face_sizes = join(self.face_sizes, 0).astype(np.int64)
+        loop_vertices = join(self.loop_vertices, 0).astype(np.int64)
+        loop_uvs = join(self.loop_uvs, 0).astype(np.int64)
+        loop_normals = join(self.loop_normals, 0).astype(np.int64)
+
+        # Faces with fewer than three loops are not polygons
+        keep = face_sizes >= 3
+        if not keep.all():
+            keep_loops = np.repeat(keep, face_sizes)
+            loop_vertices, loop_uvs, loop_normals = (
+                loop_vertices[keep_loops], loop_uvs[keep_loops], loop_normals[keep_loops])
+        face_map = np.cumsum(keep) - keep  # Old face index -> new face index
+        face_sizes = face_sizes[keep]
+        total_faces = len(face_sizes)
+
+        def remap(first_face):
+            return int(face_map[first_face]) if first_face < len(face_map) else total_faces
+
+        # Material of every face from the usemtl events (-1 before the first one)
+        face_materials = np.full(total_faces, -1, dtype=np.int64)
+        for first_face, material in self.material_events:
+            face_materials[remap(first_face):] = material
+
+        # Object ranges from the o (or g) events
+        events = [(remap(first), name) for first, name in self.object_events]
+        if not events or events[0][0] > 0:
+            events.insert(0, (0, self.default_name))
+        loop_starts = np.concatenate([[0], np.cumsum(face_sizes)])
+
+        objects = []
+        for i, (first, name) in enumerate(events):
+            last = events[i + 1][0] if i + 1 < len(events) else total_faces
+            if last <= first:
+                continue
+            loops = slice(loop_starts[first], loop_starts[last])
+            used, local = np.unique(face_materials[first:last], return_inverse=True)
+            objects.append({
+                "name": name,
+                "face_sizes": face_sizes[first:last],
+                "vertex_indices": loop_vertices[loops],
+                "uv_indices": loop_uvs[loops],
+                "normal_indices": loop_normals[loops],
+                "material_indices": local.astype(np.int64),
+                "materials": [self.materials[m] if m >= 0 else None for m in used],
+            })
+
+        return ObjData(positions, uvs, normals, objects)
+
+def parse_mtl(filepath):
+    """Material definitions from an MTL file: {name: {"color", "alpha", "texture"}}"""
+    specs = {}
+    spec = None
+    with open(filepath, "r", errors="replace") as f:
+        for line in f:
+            keyword, _, value = line.strip().partition(" ")
+            value = value.strip()
+            if keyword == "newmtl":
+                spec = specs.setdefault(value, {"color": None, "alpha": 1.0, "texture": None})
+            elif spec is None:
+                continue
+            elif keyword == "Kd":
+                spec["color"] = tuple(float(c) for c in value.split()[:3])
+            elif keyword == "d":
+                spec["alpha"] = float(value.split()[0])
+            elif keyword == "map_Kd" and value:
+                # Options such as -s 1 1 1 come before the file name
+                texture = value.split()[-1]
+                spec["texture"] = os.path.join(os.path.dirname(filepath), texture)
+    return specs
+
+def parse_obj(filepath, chunk_size=CHUNK_SIZE, split_groups=False):
+    """Parse an OBJ file (and its MTL libraries) into an ObjData, reading it in chunk_size pieces"""
+    name = os.path.splitext(os.path.basename(filepath))[0]
+    parser = ObjParser(name=name, split_groups=split_groups)
+    remainder = b""
+    with open(filepath, "rb") as f:
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                break
+            block = remainder + block
+            cut = block.rfind(b"\n") + 1
+            parser.feed(block[:cut])
+            remainder = block[cut:]
+    if remainder:
+        parser.feed(remainder + b"\n")
+    obj_data = parser.finish()
+
+    for library in parser.material_libraries:
+        mtl_path = os.path.join(os.path.dirname(filepath), library)
+        if os.path.exists(mtl_path):
+            obj_data.material_specs.update(parse_mtl(mtl_path))
+    return obj_data
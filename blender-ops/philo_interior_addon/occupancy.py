@@ -0,0 +1,139 @@
+"""Rasterized floor occupancy with a clearance field for free-space search"""
+
+import math
+import numpy as np
+
+class OccupancyGrid:
+    """Floor raster of occupied cells plus the distance from each cell to the nearest obstacle.
+
+    The clearance field is a Euclidean distance transform of the floor:
+    for every cell center it holds the distance to the closest placed
+    footprint or floor boundary. It is updated in place as footprints are
+    added, so finding room for an item is a lookup for a cell whose
+    clearance covers the item instead of random rejection sampling.
+    """
+
+    def __init__(self, floor_bounds, resolution=0.05, room_polygon=None):
+        self.resolution = resolution
+        self.min_x = floor_bounds["min_x"]
+        self.min_y = floor_bounds["min_y"]
+        self.max_x = floor_bounds["max_x"]
+        self.max_y = floor_bounds["max_y"]
+
+        nx = max(1, int(math.ceil((self.max_x - self.min_x) / resolution)))
+        ny = max(1, int(math.ceil((self.max_y - self.min_y) / resolution)))
+        xs = np.minimum(self.min_x + (np.arange(nx) + 0.5) * resolution, self.max_x)
+        ys = np.minimum(self.min_y + (np.arange(ny) + 0.5) * resolution, self.max_y)
+
+        # Rows are Y, columns are X
+        self.cell_x, self.cell_y = np.meshgrid(xs, ys)
+        self.occupied = np.zeros(self.cell_x.shape, dtype=bool)
+        self.clearance = np.zeros(self.cell_x.shape)
+        self.max_clearance = 0.0
+        self.row_max = np.zeros(ny)  # Largest clearance per row, so the max never rescans the grid
+        
+        # Empty-floor state, computed once: distance to the floor boundary
+        self._empty_occupied = np.zeros(self.cell_x.shape, dtype=bool)
+        self._empty_clearance = np.minimum.reduce([
+            self.cell_x - self.min_x, self.max_x - self.cell_x,
+            self.cell_y - self.min_y, self.max_y - self.cell_y,
+        ])
+        
+        # Polygon rooms: cells outside the floor are occupied, the rest measure to the walls
+        if room_polygon is not None:
+            cells = np.stack([self.cell_x.ravel(), self.cell_y.ravel()], axis=1)
+            inside = room_polygon.contains(cells).reshape(self.cell_x.shape)
+            walls = room_polygon.distance_to_walls(cells).reshape(self.cell_x.shape)
+            self._empty_occupied = ~inside
+            np.minimum(self._empty_clearance, np.where(inside, walls, 0.0), out=self._empty_clearance)
+        
+        # Free cells bucketed by clearance, counted per row: bucket k holds clearances in
+        # [k, k + 1) * resolution, so a lookup visits one bucket's rows instead of every cell
+        self.bucket_count = int(self._empty_clearance.max() // resolution) + 1
+        self.bucket_rows = np.zeros((ny, self.bucket_count), dtype=np.int64)
+        self.clear()
+
+    def _bucket(self, clearance):
+        return np.minimum((clearance // self.resolution).astype(np.int64), self.bucket_count - 1)
+
+    def clear(self):
+        """Empty the floor; clearance becomes the distance to the floor boundary"""
+        self.occupied[:] = self._empty_occupied
+        self.clearance[:] = self._empty_clearance
+        self.row_max[:] = self.clearance.max(axis=1)
+        self.max_clearance = float(self.row_max.max())
+        
+        self.bucket_rows[:] = 0
+        rows = np.broadcast_to(np.arange(self.clearance.shape[0])[:, None], self.clearance.shape)
+        np.add.at(self.bucket_rows, (rows, self._bucket(self.clearance)), 1)
+
+    def _window(self, min_x, min_y, max_x, max_y):
+        """Row/column slices of the cells inside the given bounds"""
+        c0 = max(0, int(math.floor((min_x - self.min_x) / self.resolution)))
+        c1 = min(self.cell_x.shape[1], int(math.ceil((max_x - self.min_x) / self.resolution)) + 1)
+        r0 = max(0, int(math.floor((min_y - self.min_y) / self.resolution)))
+        r1 = min(self.cell_x.shape[0], int(math.ceil((max_y - self.min_y) / self.resolution)) + 1)
+        return slice(r0, r1), slice(c0, c1)
+
+    def add_footprint(self, center, half_extents, rotation):
+        """Rasterize an oriented footprint and lower the clearance around it"""
+        cos_r, sin_r = math.cos(rotation), math.sin(rotation)
+        reach = abs(half_extents[0] * cos_r) + abs(half_extents[1] * sin_r), \
+                abs(half_extents[0] * sin_r) + abs(half_extents[1] * cos_r)
+
+        # Cells further than the current max clearance cannot get any closer
+        rows, cols = self._window(center[0] - reach[0] - self.max_clearance,
+                                  center[1] - reach[1] - self.max_clearance,
+                                  center[0] + reach[0] + self.max_clearance,
+                                  center[1] + reach[1] + self.max_clearance)
+        dx = self.cell_x[rows, cols] - center[0]
+        dy = self.cell_y[rows, cols] - center[1]
+        if dx.size == 0:
+            return
+
+        # Distance from each cell center to the box, in the box's local frame
+        qx = np.abs(dx * cos_r + dy * sin_r) - half_extents[0]
+        qy = np.abs(-dx * sin_r + dy * cos_r) - half_extents[1]
+        distance = np.hypot(np.maximum(qx, 0.0), np.maximum(qy, 0.0))
+
+        self.occupied[rows, cols] |= (qx <= 0) & (qy <= 0)
+        
+        # Move the lowered cells to their new buckets
+        window = self.clearance[rows, cols]
+        lowered = distance < window
+        if not lowered.any():
+            return
+        row_ids = np.broadcast_to(np.arange(rows.start, rows.stop)[:, None], window.shape)[lowered]
+        np.subtract.at(self.bucket_rows, (row_ids, self._bucket(window[lowered])), 1)
+        np.add.at(self.bucket_rows, (row_ids, self._bucket(distance[lowered])), 1)
+        window[lowered] = distance[lowered]
+        
+        # Only rows crossing the window can lose their max
+        self.row_max[rows] = self.clearance[rows].max(axis=1)
+        self.max_clearance = float(self.row_max.max())
+
+    def find_free_cell(self, radius):
+        """Center of a cell with at least `radius` clearance, or None.
+
+        Picks the tightest fitting cell (smallest sufficient clearance) so
+        large open areas stay free for large items; ties go to the lowest
+        row, then column, which keeps the result deterministic.
+        """
+        if radius > self.max_clearance:
+            return None
+
+        # Every clearance in a bucket is below the next bucket's, so the first bucket
+        # at or above the radius holding a fitting cell holds the tightest fit
+        for bucket in range(int(self._bucket(np.float64(radius))), self.bucket_count):
+            rows = np.flatnonzero(self.bucket_rows[:, bucket])
+            if not len(rows):
+                continue
+            clearance = self.clearance[rows]
+            slack = np.where((clearance >= radius) & (self._bucket(clearance) == bucket), clearance, np.inf)
+            index = int(np.argmin(slack))
+            row, col = np.unravel_index(index, slack.shape)
+            if slack[row, col] == np.inf:
+                continue
+            row = rows[row]
+            return (float(self.cell_x[row, col]), float(self.cell_y[row, col]))
+        return None
@@ -0,0 +1,146 @@
+"""Parallel OBJ parsing on a process pool, handing results back through shared memory
+
+Workers run obj_parser.parse_obj and pack every array of the result into
+one shared memory block, so only a small descriptor is pickled back to
+Blender. The main thread maps the blocks as NumPy views and only has to
+build meshes from them (see obj_mesh.build_objects).
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from .obj_parser import ObjData, parse_obj
+
+# Per-object arrays, packed under "<object index>/<key>"
+OBJECT_ARRAYS = ("face_sizes", "vertex_indices", "uv_indices", "normal_indices", "material_indices")
+
+# Start of every packed array is aligned to this many bytes
+ALIGNMENT = 64
+
+def _packed_arrays(obj_data):
+    """Arrays to share, narrowed to the float32/int32 types Blender's foreach_set takes"""
+    arrays = {
+        "positions": obj_data.positions.astype(np.float32),
+        "uvs": obj_data.uvs.astype(np.float32),
+        "normals": obj_data.normals.astype(np.float32),
+    }
+    for index, entry in enumerate(obj_data.objects):
+        for key in OBJECT_ARRAYS:
+            arrays[f"{index}/{key}"] = entry[key].astype(np.int32)
+    return arrays
+
+def _parse_job(filepath):
+    """Parse one OBJ in a worker and pack it into a new shared memory block"""
+    try:
+        obj_data = parse_obj(filepath)
+    except Exception as e:
+        return {"filepath": filepath, "error": str(e)}
+
+    arrays = _packed_arrays(obj_data)
+    layout = {}
+    size = 0
+    for key, array in arrays.items():
+        layout[key] = (size, array.dtype.str, array.shape)
+        size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    # The main process unlinks the block once it has built the meshes
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for key, array in arrays.items():
+        offset, dtype, shape = layout[key]
+        np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)[...] = array
+    block.close()
+
+    return {
+        "filepath": filepath,
+        "shm": block.name,
+        "layout": layout,
+        "objects": [{"name": entry["name"], "materials": entry["materials"]} for entry in obj_data.objects],
+        "material_specs": obj_data.material_specs,
+    }
+
+def _unpack(result, block):
+    """ObjData whose arrays are views into a shared memory block"""
+    def view(key):
+        offset, dtype, shape = result["layout"][key]
+        return np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)
+
+    objects = []
+    for index, meta in enumerate(result["objects"]):
+        entry = dict(meta)
+        for key in OBJECT_ARRAYS:
+            entry[key] = view(f"{index}/{key}")
+        objects.append(entry)
+    return ObjData(view("positions"), view("uvs"), view("normals"), objects, result["material_specs"])
+
+class ParsedObjBatch:
+    """Parsed OBJ files by path; release() (or leaving the with block) frees the shared memory"""
+
+    def __init__(self):
+        self.results = {}
+        self.errors = {}
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def get(self, filepath):
+        """ObjData for a path, or None if it was not parsed or failed"""
+        return self.results.get(filepath)
+
+    def release(self):
+        """Drop the parsed data and unlink the shared memory blocks"""
+        self.results.clear()
+        for block in self._blocks:
+            try:
+                block.close()
+            except BufferError:
+                pass  # A caller still holds a view; the mapping goes away with it
+            block.unlink()
+        self._blocks = []
+
+def parse_objs_parallel(filepaths, max_workers=None):
+    """Parse several OBJ files at once, one worker process per file.
+
+    max_workers: pool size, defaults to the CPU count; a single file or
+        worker parses in-process without shared memory
+    Returns a ParsedObjBatch; failed files are listed in its errors dict.
+    """
+    filepaths = list(dict.fromkeys(filepaths))
+    batch = ParsedObjBatch()
+    if not filepaths:
+        return batch
+
+    workers = min(max_workers or os.cpu_count() or 1, len(filepaths))
+    if workers == 1:
+        for filepath in filepaths:
+            try:
+                batch.results[filepath] = parse_obj(filepath)
+            except Exception as e:
+                batch.errors[filepath] = str(e)
+        return batch
+
+    # Spawn keeps workers clean when called from inside Blender
+    context = multiprocessing.get_context("spawn")
+    # Largest files first so the longest parse starts right away
+    ordered = sorted(filepaths, key=lambda path: os.path.getsize(path) if os.path.exists(path) else 0,
+                     reverse=True)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            for result in pool.map(_parse_job, ordered):
+                if "error" in result:
+                    batch.errors[result["filepath"]] = result["error"]
+                    continue
+                block = shared_memory.SharedMemory(name=result["shm"])
+                batch._blocks.append(block)
+                batch.results[result["filepath"]] = _unpack(result, block)
+    except Exception:
+        batch.release()
+        raise
+
+    print(f"Parsed {len(batch.results)} OBJ files on {workers} worker(s)")
+    return batch
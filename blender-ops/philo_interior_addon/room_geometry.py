@@ -0,0 +1,214 @@
+"""Floor polygons for arbitrary room shapes, with vectorized geometric predicates"""
+
+import math
+import numpy as np
+
+# Tolerance for points lying on a wall and segments that only touch
+GEOMETRY_EPSILON = 1e-9
+
+class RoomPolygon:
+    """Simple floor polygon whose edges are walls (or openings).
+
+    All per-edge data is precomputed into arrays (the edge table), so the
+    predicates test M points or segments against every edge in one NumPy
+    operation instead of a Python loop per edge.
+
+    vertices: (x, y) floor corners in order, either winding
+    walls: edge indices that are solid walls, in placement priority order.
+        Edge i runs from vertex i to vertex i + 1. Edges not listed are
+        openings (e.g. the camera side) and get no wall candidates.
+        Defaults to every edge, longest first.
+    """
+
+    def __init__(self, vertices, walls=None):
+        vertices = np.asarray(vertices, dtype=float)
+        if len(vertices) < 3:
+            raise ValueError("A room polygon needs at least 3 vertices")
+
+        # Counter-clockwise winding, so the inward normal is the edge turned left
+        x, y = vertices[:, 0], vertices[:, 1]
+        signed_area = 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+        self.reversed = signed_area < 0
+        if self.reversed:
+            vertices = vertices[::-1]
+        self.vertices = vertices
+        self.area = abs(signed_area)
+
+        # Edge table
+        self.starts = vertices
+        self.ends = np.roll(vertices, -1, axis=0)
+        self.edges = self.ends - self.starts
+        self.lengths = np.hypot(self.edges[:, 0], self.edges[:, 1])
+        self.directions = self.edges / self.lengths[:, None]
+        self.normals = np.stack([-self.directions[:, 1], self.directions[:, 0]], axis=1)
+        self._inv_length_sq = 1.0 / (self.lengths ** 2)
+        dy = self.edges[:, 1]
+        self._inv_dy = np.divide(1.0, dy, out=np.zeros_like(dy), where=dy != 0)
+
+        self.min_xy = vertices.min(axis=0)
+        self.max_xy = vertices.max(axis=0)
+        self.centroid = self._area_centroid()
+
+        if walls is None:
+            walls = sorted(range(len(vertices)), key=lambda i: -self.lengths[i])
+        elif self.reversed:
+            # Edge i of the caller's winding is edge n - 2 - i after reversing
+            walls = [(len(vertices) - 2 - i) % len(vertices) for i in walls]
+        self.walls = list(walls)
+
+    @classmethod
+    def square(cls, size):
+        """Square room centered on the origin, open on the front (+Y) side like the default scene"""
+        half = size / 2
+        # Edges: 0 back, 1 right, 2 front, 3 left; walls in the back, left, right order
+        return cls([(-half, -half), (half, -half), (half, half), (-half, half)], walls=[0, 3, 1])
+
+    def _area_centroid(self):
+        """Centroid of the polygon area"""
+        cross = self.starts[:, 0] * self.ends[:, 1] - self.ends[:, 0] * self.starts[:, 1]
+        factor = 1.0 / (6.0 * self.area)
+        return (float(((self.starts[:, 0] + self.ends[:, 0]) * cross).sum() * factor),
+                float(((self.starts[:, 1] + self.ends[:, 1]) * cross).sum() * factor))
+
+    @property
+    def size(self):
+        """Largest extent of the bounding box, used where code expects a square room size"""
+        return float((self.max_xy - self.min_xy).max())
+
+    def facing_rotation(self, normal):
+        """Z rotation that faces an item along an inward direction (back wall faces 0)"""
+        return math.atan2(normal[0], normal[1]) + 0.0  # No negative zero
+
+    def edge_distances(self, points):
+        """Distance from each of M points to each edge segment, shape (M, edges)"""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        offsets = points[:, None, :] - self.starts[None, :, :]
+        t = np.clip((offsets * self.edges[None]).sum(axis=2) * self._inv_length_sq, 0.0, 1.0)
+        closest = self.starts[None] + t[:, :, None] * self.edges[None]
+        gaps = points[:, None, :] - closest
+        return np.hypot(gaps[:, :, 0], gaps[:, :, 1])
+
+    def distance_to_walls(self, points):
+        """Distance from each of M points to the nearest edge, shape (M,)"""
+        return self.edge_distances(points).min(axis=1)
+
+    def reflex_vertices(self):
+        """Vertices where the floor turns inward (the inner corner of an L), shape (K, 2)"""
+        previous = np.roll(self.directions, 1, axis=0)
+        turn = previous[:, 0] * self.directions[:, 1] - previous[:, 1] * self.directions[:, 0]
+        return self.vertices[turn < -GEOMETRY_EPSILON]
+
+    def contains(self, points):
+        """Even-odd point-in-polygon test for M points; points on a wall count as inside"""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        px = points[:, 0, None]
+        py = points[:, 1, None]
+        y0 = self.starts[None, :, 1]
+        y1 = self.ends[None, :, 1]
+
+        # Edges that straddle each point's horizontal ray, crossed to the right of it
+        straddles = (y0 > py) != (y1 > py)
+        x_cross = self.starts[None, :, 0] + (py - y0) * self.edges[None, :, 0] * self._inv_dy[None]
+        inside = (straddles & (px < x_cross)).sum(axis=1) % 2 == 1
+        return inside | (self.distance_to_walls(points) <= GEOMETRY_EPSILON)
+
+    def segments_cross_walls(self, starts, ends):
+        """True for each of M segments that properly crosses any edge (touching is allowed)"""
+        starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+        seg = ends - starts
+
+        def cross(ax, ay, bx, by):
+            return ax * by - ay * bx
+
+        # Side of each segment endpoint relative to each edge, and vice versa
+        to_start = starts[:, None, :] - self.starts[None]
+        to_end = ends[:, None, :] - self.starts[None]
+        side_start = cross(self.edges[None, :, 0], self.edges[None, :, 1], to_start[..., 0], to_start[..., 1])
+        side_end = cross(self.edges[None, :, 0], self.edges[None, :, 1], to_end[..., 0], to_end[..., 1])
+
+        to_edge_start = self.starts[None] - starts[:, None, :]
+        to_edge_end = self.ends[None] - starts[:, None, :]
+        side_edge_start = cross(seg[:, None, 0], seg[:, None, 1], to_edge_start[..., 0], to_edge_start[..., 1])
+        side_edge_end = cross(seg[:, None, 0], seg[:, None, 1], to_edge_end[..., 0], to_edge_end[..., 1])
+
+        crosses = ((side_start * side_end < -GEOMETRY_EPSILON) &
+                   (side_edge_start * side_edge_end < -GEOMETRY_EPSILON))
+        return crosses.any(axis=1)
+
+    def contains_footprints(self, centers, half_extents, rotations):
+        """True for each of M oriented footprints lying entirely inside the floor.
+
+        A rectangle is inside when its four corners are inside and none of
+        its sides crosses a wall, which also catches reflex corners of
+        L-shaped rooms poking into the footprint.
+        """
+        centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+        rotations = np.broadcast_to(np.asarray(rotations, dtype=float), (len(centers),))
+        half_x, half_y = half_extents
+        local = np.array([(-half_x, -half_y), (half_x, -half_y), (half_x, half_y), (-half_x, half_y)])
+
+        cos_r = np.cos(rotations)[:, None]
+        sin_r = np.sin(rotations)[:, None]
+        corners = np.stack([
+            centers[:, 0, None] + local[None, :, 0] * cos_r - local[None, :, 1] * sin_r,
+            centers[:, 1, None] + local[None, :, 0] * sin_r + local[None, :, 1] * cos_r,
+        ], axis=2)  # (M, 4, 2)
+
+        inside = self.contains(corners.reshape(-1, 2)).reshape(-1, 4).all(axis=1)
+        sides_cross = self.segments_cross_walls(
+            corners.reshape(-1, 2), np.roll(corners, -1, axis=1).reshape(-1, 2)
+        ).reshape(-1, 4).any(axis=1)
+        return inside & ~sides_cross
+
+    def wall_candidates(self, offset, step):
+        """Spots along every wall, `offset` in from it, facing into the room.
+
+        Returns (positions, rotations, ranks, slides): slides are the
+        distances from each wall's midpoint and ranks the wall's priority.
+        """
+        positions, rotations, ranks, slides = [], [], [], []
+        for rank, edge in enumerate(self.walls):
+            count = int(self.lengths[edge] / 2 / step + GEOMETRY_EPSILON)
+            slide = np.arange(-count, count + 1) * step
+            middle = (self.starts[edge] + self.ends[edge]) / 2 + self.normals[edge] * offset
+
+            positions.append(middle + slide[:, None] * self.directions[edge])
+            rotations.append(np.full(len(slide), self.facing_rotation(self.normals[edge])))
+            ranks.append(np.full(len(slide), rank))
+            slides.append(slide)
+        return (np.concatenate(positions), np.concatenate(rotations),
+                np.concatenate(ranks), np.concatenate(slides))
+
+    def corners(self):
+        """Convex corners touching a wall, in wall priority order.
+
+        Each corner is {"position", "along": (u1, u2), "rotation"}: u1 and u2
+        run away from the corner along its two edges, and the rotation faces
+        the bisector into the room.
+        """
+        count = len(self.vertices)
+        wall_rank = {edge: rank for rank, edge in enumerate(self.walls)}
+        found = []
+        for i in range(count):
+            previous, following = (i - 1) % count, i
+            if previous not in wall_rank and following not in wall_rank:
+                continue
+
+            # Left turn at the vertex means a convex corner on a CCW polygon
+            d0, d1 = self.directions[previous], self.directions[following]
+            turn = d0[0] * d1[1] - d0[1] * d1[0]
+            if turn <= GEOMETRY_EPSILON:
+                continue
+
+            along = (-self.directions[previous], self.directions[following])
+            bisector = along[0] + along[1]
+            rank = min(wall_rank.get(previous, count), wall_rank.get(following, count))
+            found.append((rank, i, {
+                "position": (float(self.vertices[i][0]), float(self.vertices[i][1])),
+                "along": along,
+                "rotation": self.facing_rotation(bisector),
+            }))
+
+        found.sort(key=lambda entry: entry[:2])
+        return [corner for _, _, corner in found]
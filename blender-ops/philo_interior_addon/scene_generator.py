@@ -8,6 +8,12 @@ from . import config
 from . import materials
 from . import camera_setup
 from . import furniture_placement
+from . import lod
+from . import material_baker
+from .asset_library import is_library_data
+from .material_registry import get_material_registry
+from .asset_manifest import compute_manifest, tag_root, tagged_world_bounds
+from .geometry_cache import capture_hierarchy
 
 class PhiloSceneGenerator:
     def __init__(self):
@@ -25,14 +31,17 @@ class PhiloSceneGenerator:
         bpy.ops.object.select_all(action='SELECT')
         bpy.ops.object.delete(use_global=False)
         
-        # Clear data blocks
+        # Clear data blocks, keeping meshes of the asset library masters
         for data in [bpy.data.meshes, bpy.data.materials, bpy.data.cameras, 
                     bpy.data.lights, bpy.data.worlds, bpy.data.images]:
             for item in data:
+                if is_library_data(item):
+                    continue
                 try:
                     data.remove(item)
                 except:
                     pass
+        get_material_registry().reset()
         print("Scene cleared for new generation.")
 
     def import_model(self, filepath):
@@ -118,18 +127,12 @@ class PhiloSceneGenerator:
 
     def position_on_floor(self, obj):
         """Position object on floor"""
-        if obj.type == 'EMPTY':
-            # Get bounds of all children
-            all_vertices = []
-            for child in obj.children:
-                if child.type == 'MESH':
-                    all_vertices.extend([child.matrix_world @ v.co for v in child.data.vertices])
-            if all_vertices:
-                lowest_z = min(v.z for v in all_vertices)
-                obj.location.z -= lowest_z
-        else:
-            lowest_z = min((obj.matrix_world @ v.co).z for v in obj.data.vertices)
-            obj.location.z -= lowest_z
+        # Measure the model once; repositioning then only transforms its manifest box corners
+        if tagged_world_bounds(obj) is None:
+            tag_root(obj, compute_manifest(capture_hierarchy(obj)[2]))
+        bpy.context.view_layer.update()
+        lowest_z = float(tagged_world_bounds(obj)[0][2])
+        obj.location.z -= lowest_z
         
         obj.location.x = 0
         obj.location.y = -1.5  # Against back wall
@@ -185,18 +188,16 @@ class PhiloSceneGenerator:
     def create_room_materials(self, room_objects):
         """Create and assign room materials"""
         # Floor material
-        floor_mat = bpy.data.materials.new(name="Wood_Floor")
-        floor_mat.use_nodes = True
-        principled = floor_mat.node_tree.nodes["Principled BSDF"]
-        principled.inputs['Base Color'].default_value = (0.12, 0.08, 0.05, 1)
-        principled.inputs['Roughness'].default_value = 0.15
+        floor_mat = materials.get_principled_material("Wood_Floor", {
+            'Base Color': (0.12, 0.08, 0.05, 1),
+            'Roughness': 0.15
+        })
         
         # Wall material
-        wall_mat = bpy.data.materials.new(name="Wall_Paint")
-        wall_mat.use_nodes = True
-        principled = wall_mat.node_tree.nodes["Principled BSDF"]
-        principled.inputs['Base Color'].default_value = (0.88, 0.87, 0.85, 1)
-        principled.inputs['Roughness'].default_value = 0.9
+        wall_mat = materials.get_principled_material("Wall_Paint", {
+            'Base Color': (0.88, 0.87, 0.85, 1),
+            'Roughness': 0.9
+        })
         
         # Assign materials
         room_objects[0].data.materials.append(floor_mat)  # Floor
@@ -273,6 +274,12 @@ class PhiloSceneGenerator:
             scene.cycles.samples = preset["samples"]
             scene.render.resolution_percentage = preset["resolution_percentage"]
             scene.cycles.use_denoising = preset["denoising"]
+            
+            # Decimated furniture proxies for preview and medium quality
+            # (procedural materials go back first, so proxies pick them up)
+            material_baker.restore_procedural_materials(scene)
+            lod.set_quality(quality, scene)
+            material_baker.set_baked_for_quality(quality, scene)
         
         # Enhanced photorealistic settings for interior scenes
         scene.cycles.max_bounces = 16
@@ -332,6 +339,7 @@ class PhiloSceneGenerator:
         # Create and assign materials
         mats = self.material_manager.create_all_materials(config.FABRIC_TEXTURE_PATH)
         materials.assign_materials_by_name(self.imported_object, mats)
+        self._purge_unused_materials()
         
         # Setup lighting
         self.setup_lighting(config.HDRI_PATH)
@@ -348,7 +356,7 @@ class PhiloSceneGenerator:
         
         print(f"Scene generated successfully with {camera_preset} camera view!")
     
-    def generate_furnished_room(self, furniture_count=6, camera_preset="reference_view", render_quality="medium"):
+    def generate_furnished_room(self, furniture_count=6, camera_preset="reference_view", render_quality="medium", seed=None):
         """Generate a complete furnished room with smart furniture placement"""
         print("Generating furnished room layout...")
         
@@ -359,7 +367,7 @@ class PhiloSceneGenerator:
         self.create_room()
         
         # Generate smart furniture layout
-        furniture_objects = self.furniture_manager.generate_furnished_room(furniture_count)
+        furniture_objects = self.furniture_manager.generate_furnished_room(furniture_count, seed=seed)
         
         # Apply materials to all furniture
         print("\nApplying materials to furniture...")
@@ -384,6 +392,7 @@ class PhiloSceneGenerator:
                     print(f"    ERROR: {obj.name} was deleted during material application!")
             else:
                 print(f"  WARNING: furniture_objects[{i}] is missing or None")
+        self._purge_unused_materials()
         
         # Setup lighting
         self.setup_lighting(config.HDRI_PATH)
@@ -437,28 +446,29 @@ class PhiloSceneGenerator:
             # Apply decorative materials
             self._apply_decorative_material(obj)
     
+    def _purge_unused_materials(self):
+        """Drop the manager's material references and remove registered materials no slot uses"""
+        self.material_manager.release_all()
+        registry = get_material_registry()
+        removed = registry.purge()
+        print(f"Materials: {registry.report()}, {removed} unused purged")
+    
     def _apply_wood_material(self, obj):
-        """Apply wood material to object"""
-        wood_mat = bpy.data.materials.new(name=f"Wood_{obj.name}")
-        wood_mat.use_nodes = True
-        principled = wood_mat.node_tree.nodes["Principled BSDF"]
-        principled.inputs['Base Color'].default_value = (0.3, 0.2, 0.1, 1)
-        principled.inputs['Roughness'].default_value = 0.3
-        # Blender 4.x uses 'Specular IOR Level' instead of 'Specular'
-        if 'Specular IOR Level' in principled.inputs:
-            principled.inputs['Specular IOR Level'].default_value = 0.5
-        elif 'Specular' in principled.inputs:
-            principled.inputs['Specular'].default_value = 0.2
+        """Apply wood material to object (one shared material for all wooden furniture)"""
+        wood_mat = materials.get_principled_material("Furniture_Wood", {
+            'Base Color': (0.3, 0.2, 0.1, 1),
+            'Roughness': 0.3,
+            'Specular IOR Level': 0.5  # 'Specular' before Blender 4.0, resolved by the compiler
+        })
         
         self._assign_material_to_object(obj, wood_mat)
     
     def _apply_decorative_material(self, obj):
-        """Apply decorative material to object"""
-        decor_mat = bpy.data.materials.new(name=f"Decor_{obj.name}")
-        decor_mat.use_nodes = True
-        principled = decor_mat.node_tree.nodes["Principled BSDF"]
-        principled.inputs['Base Color'].default_value = (0.8, 0.7, 0.6, 1)
-        principled.inputs['Roughness'].default_value = 0.4
+        """Apply decorative material to object (one shared material for all decor)"""
+        decor_mat = materials.get_principled_material("Furniture_Decor", {
+            'Base Color': (0.8, 0.7, 0.6, 1),
+            'Roughness': 0.4
+        })
         
         self._assign_material_to_object(obj, decor_mat)
     
@@ -3,6 +3,7 @@
 import math
 import random
 from .expert_interior_design import ExpertInteriorLayout
+from . import collision
 
 class PlacementRules:
     """Defines smart placement rules for different furniture types"""
@@ -128,6 +129,16 @@ class PlacementRules:
 class SmartLayoutGenerator:
     """Generates smart furniture layouts using placement rules"""
     
+    # Footprint (width, depth) per layout key, for items missing from the catalog
+    FOOTPRINTS = {
+        "sofa": (2.2, 0.9),
+        "coffee_table": (1.2, 0.6),
+    }
+    DEFAULT_FOOTPRINT = (0.3, 0.3)
+    
+    # Clearance added around every footprint, keeping a 0.5m walkway between items
+    COLLISION_MARGIN = 0.25
+    
     def __init__(self, room_size=6):
         self.room_size = room_size
         self.placed_items = []
@@ -202,11 +213,12 @@ class SmartLayoutGenerator:
         placements = self.rules.get_sofa_placement(self.room_size)
         
         for placement in placements["positions"]:
-            if not self._check_collision(placement["pos"], 2.2, 0.9):
+            if not self._check_collision(placement["pos"], 2.2, 0.9, placement["rot"]):
                 return {
                     "file": furniture_file,
                     "position": (placement["pos"][0], placement["pos"][1], 0),
                     "rotation": (0, 0, placement["rot"]),
+                    "footprint": (2.2, 0.9),
                     "type": "sofa"
                 }
         return None
@@ -216,11 +228,12 @@ class SmartLayoutGenerator:
         placements = self.rules.get_coffee_table_placement(sofa_pos, sofa_rot)
         
         for placement in placements["positions"]:
-            if not self._check_collision(placement["pos"], 1.2, 0.6):
+            if not self._check_collision(placement["pos"], 1.2, 0.6, placement["rot"]):
                 return {
                     "file": furniture_file,
                     "position": (placement["pos"][0], placement["pos"][1], 0),
                     "rotation": (0, 0, placement["rot"]),
+                    "footprint": (1.2, 0.6),
                     "type": "coffee_table"
                 }
         return None
@@ -270,7 +283,7 @@ class SmartLayoutGenerator:
                 }
             
             # For floor items, check collision but be less strict
-            if not self._check_collision(pos, 0.3, 0.3):  # Smaller collision check
+            if not self._check_collision(pos, 0.3, 0.3, placement["rot"]):  # Smaller collision check
                 return {
                     "file": furniture_file,
                     "position": (pos[0], pos[1], height),
@@ -288,13 +301,42 @@ class SmartLayoutGenerator:
             "type": furniture_type
         }
     
-    def _check_collision(self, position, width, depth):
+    def _catalog_info(self, item):
+        """Catalog entry of a placed item, or None"""
+        # Import here: layout_core imports this module
+        from .layout_core import FurnitureCatalog
+        return FurnitureCatalog.get_furniture_info(item.get("file"))
+    
+    def _footprint(self, item):
+        """Footprint (width, depth) of a placed item, from its catalog dimensions"""
+        if "footprint" in item:
+            return item["footprint"]
+        info = self._catalog_info(item)
+        if info:
+            return (info["dimensions"]["width"], info["dimensions"]["depth"])
+        return self.FOOTPRINTS.get(item.get("type"), self.DEFAULT_FOOTPRINT)
+    
+    def _is_obstacle(self, item):
+        """Wall decor hangs above the floor and rugs lie under furniture"""
+        info = self._catalog_info(item)
+        if info:
+            return info["type"] != "wall_decor" and info["category"] != "floor_decor"
+        return item.get("type") not in ("painting", "rug")
+    
+    def _check_collision(self, position, width, depth, rotation=0.0):
         """Check if position collides with existing furniture"""
-        for item in self.placed_items:
-            dist = math.sqrt(
-                (position[0] - item["position"][0])**2 + 
-                (position[1] - item["position"][1])**2
-            )
-            if dist < (width + 0.5):  # Minimum spacing
-                return True
-        return False
\ No newline at end of file
+        obstacles = [item for item in self.placed_items if self._is_obstacle(item)]
+        if not obstacles:
+            return False
+        
+        # Test the candidate against every placed footprint in one array operation
+        centers = [item["position"][:2] for item in obstacles]
+        half_extents = [[d / 2 for d in self._footprint(item)] for item in obstacles]
+        rotations = [item["rotation"][2] for item in obstacles]
+        
+        hits = collision.obb_overlap(
+            position[:2], (width / 2, depth / 2), rotation,
+            centers, half_extents, rotations,
+            margin=self.COLLISION_MARGIN
+        )
+        return bool(hits.any())
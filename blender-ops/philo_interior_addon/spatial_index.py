@@ -0,0 +1,69 @@
+"""Uniform grid index over placed furniture footprints"""
+
+import math
+
+class FootprintGrid:
+    """Buckets axis-aligned footprint bounds into fixed-size floor cells.
+
+    Items are inserted once when they are placed, so a query only touches
+    the cells under the candidate instead of every placed object.
+    """
+
+    def __init__(self, cell_size=0.5):
+        self.cell_size = cell_size
+        self.cells = {}    # (ix, iy) -> list of item ids
+        self.bounds = {}   # item id -> (min_x, min_y, max_x, max_y)
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def clear(self):
+        """Remove every item from the index"""
+        self.cells = {}
+        self.bounds = {}
+
+    def _cell_range(self, min_x, min_y, max_x, max_y):
+        """Yield every cell key overlapped by the given bounds"""
+        x0 = math.floor(min_x / self.cell_size)
+        x1 = math.floor(max_x / self.cell_size)
+        y0 = math.floor(min_y / self.cell_size)
+        y1 = math.floor(max_y / self.cell_size)
+        for ix in range(x0, x1 + 1):
+            for iy in range(y0, y1 + 1):
+                yield (ix, iy)
+
+    def insert(self, item_id, min_x, min_y, max_x, max_y):
+        """Register an item's footprint bounds"""
+        if item_id in self.bounds:
+            self.remove(item_id)
+        self.bounds[item_id] = (min_x, min_y, max_x, max_y)
+        for key in self._cell_range(min_x, min_y, max_x, max_y):
+            self.cells.setdefault(key, []).append(item_id)
+
+    def remove(self, item_id):
+        """Drop an item from the index"""
+        bounds = self.bounds.pop(item_id, None)
+        if bounds is None:
+            return
+        for key in self._cell_range(*bounds):
+            bucket = self.cells.get(key)
+            if bucket is None:
+                continue
+            bucket.remove(item_id)
+            if not bucket:
+                del self.cells[key]
+
+    def query(self, min_x, min_y, max_x, max_y):
+        """Return ids of items whose bounds overlap the query bounds, in id order"""
+        found = set()
+        for key in self._cell_range(min_x, min_y, max_x, max_y):
+            bucket = self.cells.get(key)
+            if bucket:
+                found.update(bucket)
+
+        hits = []
+        for item_id in found:
+            b = self.bounds[item_id]
+            if b[0] <= max_x and b[2] >= min_x and b[1] <= max_y and b[3] >= min_y:
+                hits.append(item_id)
+        return sorted(hits)
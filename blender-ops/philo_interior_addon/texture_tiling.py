@@ -0,0 +1,45 @@
+"""Seamless tiling for baked texture maps, importable without Blender
+
+A map baked from a procedural pattern over a unit plane does not wrap:
+its left and right (and top and bottom) edges come from unrelated parts
+of the pattern. make_tileable cross-fades a band along the edges into a
+copy of the image rolled by half its size. The rolled copy wraps
+continuously and its own seam lies in the middle, where the original is
+kept, so the result repeats without visible seams when sampled with a
+REPEAT extension.
+"""
+
+import numpy as np
+
+# Width of the cross-faded band along each edge, as a fraction of the image size
+TILE_BLEND = 0.25
+
+def edge_weights(size, blend=TILE_BLEND):
+    """Weight of the original image per pixel along one axis: 0 on the edges, 1 past the band"""
+    index = np.arange(size)
+    distance = np.minimum(index, size - 1 - index) / max(blend * size, 1.0)
+    t = np.clip(distance, 0.0, 1.0)
+    return t * t * (3.0 - 2.0 * t)  # Smoothstep, so the fade has no visible edge
+
+def make_tileable(pixels, blend=TILE_BLEND, normal_map=False):
+    """(H, W, C) pixels that wrap seamlessly in both directions.
+
+    Each axis is made periodic in turn; blending two images that wrap
+    along the first axis keeps that property for the second pass.
+    normal_map renormalizes blended tangent-space normals stored as
+    n * 0.5 + 0.5 in the first three channels.
+    """
+    result = np.asarray(pixels, dtype=np.float64)
+    for axis in (0, 1):
+        size = result.shape[axis]
+        shape = [1] * result.ndim
+        shape[axis] = size
+        weights = edge_weights(size, blend).reshape(shape)
+        rolled = np.roll(result, size // 2, axis=axis)
+        result = weights * result + (1.0 - weights) * rolled
+
+    if normal_map:
+        vectors = result[..., :3] * 2.0 - 1.0
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-9)
+        result[..., :3] = vectors * 0.5 + 0.5
+    return result
@@ -0,0 +1,53 @@
+"""Operator-free transform application: bake rotation, scale or location into object data
+
+Replaces bpy.ops.object.transform_apply, which needs an active, selected
+object, updates the whole depsgraph per call and fails in
+`blender --background` without a window context. Everything here works on
+datablocks directly.
+"""
+
+from mathutils import Matrix
+
+def _owned_data(obj):
+    """The object's data, copied first if other objects share it so they keep their shape"""
+    if obj.data.users > 1:
+        obj.data = obj.data.copy()
+    return obj.data
+
+def apply_transform(obj, location=False, rotation=True, scale=True):
+    """Bake the chosen parts of an object's own transform into its data and reset them.
+
+    Children keep their world transform: what was baked is folded into
+    their matrix_parent_inverse. Objects without transformable data
+    (empties) only pass the transform on to their children.
+    Returns the baked matrix.
+    """
+    basis = obj.matrix_basis.copy()
+    loc, rot, sca = basis.decompose()
+
+    # Parts that stay on the object
+    kept = Matrix.Identity(4)
+    if not location:
+        kept = Matrix.Translation(loc)
+    if not rotation:
+        kept = kept @ rot.to_matrix().to_4x4()
+    if not scale:
+        kept = kept @ Matrix.Diagonal(sca).to_4x4()
+
+    baked = kept.inverted() @ basis
+    if baked == Matrix.Identity(4):
+        return baked
+
+    data = obj.data
+    if data is not None and hasattr(data, "transform"):
+        data = _owned_data(obj)
+        data.transform(baked)
+        # A mirroring transform turns faces inside out
+        if baked.determinant() < 0 and hasattr(data, "flip_normals"):
+            data.flip_normals()
+        data.update()
+
+    obj.matrix_basis = kept
+    for child in obj.children:
+        child.matrix_parent_inverse = baked @ child.matrix_parent_inverse
+    return baked
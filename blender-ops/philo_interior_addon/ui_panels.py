@@ -6,6 +6,8 @@ from bpy.props import StringProperty, BoolProperty, FloatProperty, EnumProperty,
 from bpy_extras.io_utils import ImportHelper
 from . import scene_generator
 from . import config
+from . import lod
+from . import material_baker
 
 class PHILO_OT_generate_scene(Operator, ImportHelper):
     bl_idname = "philo.generate_scene"
@@ -70,6 +72,14 @@ class PHILO_OT_generate_furnished_room(Operator):
         max=7
     )
     
+    # Layout seed; the same seed reuses the cached layout
+    layout_seed: IntProperty(
+        name="Layout Seed",
+        description="Seed for the furniture layout; each seed varies the expert arrangement",
+        default=0,
+        min=0
+    )
+    
     # Render quality
     render_quality: EnumProperty(
         name="Render Quality",
@@ -87,7 +97,8 @@ class PHILO_OT_generate_furnished_room(Operator):
             generator = scene_generator.PhiloSceneGenerator()
             furniture_objects = generator.generate_furnished_room(
                 furniture_count=self.furniture_count,
-                render_quality=self.render_quality
+                render_quality=self.render_quality,
+                seed=self.layout_seed
             )
             
             self.report({'INFO'}, f"Furnished room generated with {len(furniture_objects)} pieces!")
@@ -97,20 +108,54 @@ class PHILO_OT_generate_furnished_room(Operator):
             self.report({'ERROR'}, f"Furnished room generation failed: {str(e)}")
             return {'CANCELLED'}
 
+def _restore_after_render(scene, samples, quality):
+    """Put back the samples and geometry detail once the render job finishes or is cancelled.
+
+    Returns the handler, so a render that never starts can restore right away.
+    """
+    def restore():
+        scene.cycles.samples = samples
+        lod.set_quality(quality, scene)
+        return None  # Run once
+    
+    def on_render_end(*args):
+        for handlers in (bpy.app.handlers.render_complete, bpy.app.handlers.render_cancel):
+            if on_render_end in handlers:
+                handlers.remove(on_render_end)
+        # Render handlers run on the render thread; change scene data from the main loop
+        bpy.app.timers.register(restore, first_interval=0.0)
+    
+    bpy.app.handlers.render_complete.append(on_render_end)
+    bpy.app.handlers.render_cancel.append(on_render_end)
+    return on_render_end
+
 class PHILO_OT_quick_render(Operator):
     bl_idname = "philo.quick_render"
     bl_label = "Quick Preview Render"
     bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
-        original_samples = context.scene.cycles.samples
-        context.scene.cycles.samples = 128
+        scene = context.scene
+        original_samples = scene.cycles.samples
+        original_quality = getattr(scene, "philo_lod_quality", 'final')
+        scene.cycles.samples = 128
         
-        bpy.ops.render.render('INVOKE_DEFAULT')
+        # Preview renders use the lightest furniture proxies
+        material_baker.restore_procedural_materials(scene)
+        lod.set_quality('preview', scene)
         
-        context.scene.cycles.samples = original_samples
+        # The render runs as a job after this returns, so restore the settings when it ends
+        on_render_end = _restore_after_render(scene, original_samples, original_quality)
+        if bpy.ops.render.render('INVOKE_DEFAULT') == {'CANCELLED'}:
+            on_render_end()
         return {'FINISHED'}
 
+def _start_render():
+    """Start an interactive render, also from a timer whose context has no window"""
+    window = bpy.context.window or bpy.context.window_manager.windows[0]
+    with bpy.context.temp_override(window=window):
+        bpy.ops.render.render('INVOKE_DEFAULT')
+
 class PHILO_OT_final_render(Operator):
     bl_idname = "philo.final_render"
     bl_label = "Final High-Quality Render"
@@ -119,10 +164,31 @@ class PHILO_OT_final_render(Operator):
     def execute(self, context):
         context.scene.cycles.samples = 1024
         context.scene.cycles.use_denoising = True
+        lod.set_quality('final', context.scene)
         
-        bpy.ops.render.render('INVOKE_DEFAULT')
+        # The render starts once the baked materials are in; missing bakes are made
+        # in the background first and the render follows from the bake timer
+        material_baker.set_baked_for_quality('final', context.scene, on_ready=_start_render)
+        if material_baker.is_waiting(context.scene):
+            self.report({'INFO'}, "Baking materials; the render starts when they are ready")
         return {'FINISHED'}
 
+class PHILO_OT_export_web(Operator):
+    bl_idname = "philo.export_web"
+    bl_label = "Export for Web Viewer"
+    bl_description = "Export the scene as GLB with baked materials"
+    
+    def execute(self, context):
+        from . import web_export
+        
+        try:
+            filepath = web_export.export_web_scene(scene=context.scene)
+            self.report({'INFO'}, f"Exported {filepath}")
+            return {'FINISHED'}
+        except Exception as e:
+            self.report({'ERROR'}, f"Web export failed: {str(e)}")
+            return {'CANCELLED'}
+
 class PHILO_OT_render_snapshot(Operator):
     bl_idname = "philo.render_snapshot"
     bl_label = "Render Snapshot from Reference View"
@@ -143,6 +209,8 @@ class PHILO_OT_render_snapshot(Operator):
         # Render with high quality settings
         context.scene.cycles.samples = 512
         context.scene.cycles.use_denoising = True
+        material_baker.restore_procedural_materials(context.scene)
+        lod.set_quality('medium', context.scene)
         
         # Start render
         bpy.ops.render.render('INVOKE_DEFAULT')
@@ -236,16 +304,9 @@ class PHILO_OT_assign_material_to_selected(Operator):
             self.report({'ERROR'}, "Select a mesh object")
             return {'CANCELLED'}
         
-        # Get or create material
-        mat_name = f"{self.material_type.title()}_Material"
-        material = bpy.data.materials.get(mat_name)
-        
-        if not material:
-            # Create material if it doesn't exist
-            from . import materials
-            mat_manager = materials.MaterialManager()
-            all_mats = mat_manager.create_all_materials()
-            material = all_mats.get(self.material_type)
+        # Registered material of this type, built only the first time
+        from . import materials
+        material = materials.create_material(self.material_type)
         
         if not material:
             self.report({'ERROR'}, f"Could not create {self.material_type} material")
@@ -318,6 +379,9 @@ class PHILO_PT_main_panel(Panel):
         col.operator(PHILO_OT_render_snapshot.bl_idname, 
                     text="Snapshot (Reference View)", 
                     icon='CAMERA_DATA')
+        col.operator(PHILO_OT_export_web.bl_idname, 
+                    text="Export for Web", 
+                    icon='EXPORT')
 
 class PHILO_PT_camera_panel(Panel):
     bl_label = "Camera Controls"
@@ -382,6 +446,7 @@ class PHILO_PT_settings_panel(Panel):
         if scene.render.engine == 'CYCLES':
             layout.prop(scene.cycles, "samples")
             layout.prop(scene.cycles, "use_denoising")
+            layout.prop(scene, "philo_lod_quality")
             layout.separator()
             layout.prop(scene.view_settings, "exposure")
             layout.prop(scene.view_settings, "gamma")
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""Export the generated scene as a GLB for the website viewer
+
+Procedural node materials do not survive glTF export, so the scene is
+switched to the baked image-textured materials for the export and back
+to the procedural ones afterwards.
+"""
+
+import os
+import bpy
+from . import config
+from .material_baker import restore_procedural_materials, use_baked_materials
+
+def export_web_scene(filepath=None, scene=None):
+    """Write the visible scene to a .glb with baked materials; returns the file path"""
+    scene = scene or bpy.context.scene
+    filepath = filepath or os.path.join(config.WEB_EXPORT_DIR, f"{scene.name}.glb")
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+    use_baked_materials(scene, wait=True)
+    try:
+        bpy.ops.export_scene.gltf(
+            filepath=filepath,
+            export_format='GLB',
+            use_visible=True,
+            export_apply=True,
+            export_cameras=False,
+            export_lights=False,
+        )
+    finally:
+        restore_procedural_materials(scene)
+
+    print(f"Web scene exported to {filepath}")
+    return filepath
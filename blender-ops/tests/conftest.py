@@ -0,0 +1,8 @@
+"""Make the add-on package importable without Blender (only its bpy-free modules are tested)"""
+
+import os
+import sys
+
+blender_ops_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if blender_ops_path not in sys.path:
+    sys.path.insert(0, blender_ops_path)
@@ -0,0 +1,70 @@
+import json
+
+import numpy as np
+import pytest
+
+from philo_interior_addon.asset_manifest import (
+    ManifestStore, aabb_corners, compute_manifest, footprint_polygon, tagged_world_bounds, tag_root)
+
+
+def box_mesh(min_xyz, max_xyz):
+    """Closed box with outward-facing quads"""
+    (x0, y0, z0), (x1, y1, z1) = min_xyz, max_xyz
+    positions = np.array([(x, y, z) for z in (z0, z1) for y in (y0, y1) for x in (x0, x1)], dtype=float)
+    faces = [(0, 2, 3, 1), (4, 5, 7, 6), (0, 1, 5, 4), (2, 6, 7, 3), (0, 4, 6, 2), (1, 3, 7, 5)]
+    return {"positions": positions, "loop_vertices": np.array(faces).ravel(),
+            "face_sizes": np.full(len(faces), 4)}
+
+
+class TaggedRoot(dict):
+    pass
+
+
+def test_manifest_of_table_uses_top_surface_not_vase():
+    top = box_mesh((-0.6, -0.4, 0.7), (0.6, 0.4, 0.75))
+    leg = box_mesh((-0.05, -0.05, 0.0), (0.05, 0.05, 0.7))
+    vase = box_mesh((-0.05, -0.05, 0.75), (0.05, 0.05, 1.05))
+    manifest = compute_manifest([top, leg, vase])
+
+    assert manifest["aabb_min"] == pytest.approx([-0.6, -0.4, 0.0])
+    assert manifest["aabb_max"] == pytest.approx([0.6, 0.4, 1.05])
+    assert manifest["lowest_z"] == pytest.approx(0.0)
+    assert manifest["vertex_count"] == 24
+    assert manifest["face_count"] == 18
+    assert manifest["top_surface_height"] == pytest.approx(0.75)
+
+
+def test_empty_manifest():
+    manifest = compute_manifest([])
+    assert manifest["footprint"] == []
+    assert manifest["vertex_count"] == 0
+
+
+def test_footprint_of_box_is_its_rectangle():
+    points = np.array([(x, y) for x in (-1, 0, 1) for y in (-0.5, 0, 0.5)], dtype=float)
+    footprint = {tuple(point) for point in footprint_polygon(points)}
+    assert {(-1, -0.5), (-1, 0.5), (1, -0.5), (1, 0.5)} <= footprint
+    assert all(abs(x) == 1 or abs(y) == 0.5 for x, y in footprint)  # Only boundary points
+
+
+def test_tagged_world_bounds_transforms_corners():
+    root = TaggedRoot()
+    assert tagged_world_bounds(root, np.eye(4)) is None
+
+    tag_root(root, {"aabb_min": [-1, -0.5, 0], "aabb_max": [1, 0.5, 2], "top_surface_height": 2})
+    # Quarter turn about Z and a lift of 3
+    matrix = np.array([[0, -1, 0, 0], [1, 0, 0, 0], [0, 0, 1, 3], [0, 0, 0, 1]], dtype=float)
+    low, high = tagged_world_bounds(root, matrix)
+    assert low == pytest.approx([-0.5, -1, 3])
+    assert high == pytest.approx([0.5, 1, 5])
+    assert aabb_corners([0, 0, 0], [1, 1, 1]).shape == (4, 8)
+
+
+def test_manifest_store_checks_key(tmp_path):
+    store = ManifestStore(str(tmp_path))
+    saved = store.save("sofa-1.obj", "key-1", {"aabb_min": [0, 0, 0]})
+    assert saved["file"] == "sofa-1.obj"
+    assert store.load("sofa-1.obj", "key-1")["aabb_min"] == [0, 0, 0]
+    assert store.load("sofa-1.obj", "key-2") is None
+    assert store.load("chair.obj", "key-1") is None
+    assert json.loads((tmp_path / "sofa-1.obj.json").read_text())["key"] == "key-1"
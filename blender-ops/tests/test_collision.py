@@ -0,0 +1,75 @@
+import math
+
+import numpy as np
+
+from philo_interior_addon import collision
+from philo_interior_addon.collision import FootprintSet, obb_overlap, obb_penetration
+
+
+def test_axis_aligned_overlap_and_separation():
+    assert obb_overlap((0, 0), (1, 1), 0, (1.5, 0), (1, 1), 0)
+    assert not obb_overlap((0, 0), (1, 1), 0, (2.5, 0), (1, 1), 0)
+
+
+def test_touching_footprints_are_separated():
+    assert not obb_overlap((0, 0), (1, 1), 0, (2, 0), (1, 1), 0)
+
+
+def test_margin_inflates_both_footprints():
+    assert not obb_overlap((0, 0), (1, 1), 0, (2.1, 0), (1, 1), 0)
+    assert obb_overlap((0, 0), (1, 1), 0, (2.1, 0), (1, 1), 0, margin=0.1)
+
+
+def test_rotated_box_separates_where_aabb_would_overlap():
+    # A diamond off the square's corner: their bounding boxes overlap, the shapes do not
+    half = (0.5, 0.5)
+    center = (1.0, 1.0)
+    assert not obb_overlap((0, 0), half, 0, center, half, math.pi / 4)
+    reach = collision.rotated_half_extents(half, math.pi / 4)
+    assert center[0] - reach[0] < 0.5 and center[1] - reach[1] < 0.5
+    assert obb_overlap((0, 0), half, 0, (0.8, 0.8), half, math.pi / 4)
+
+
+def test_penetration_depth():
+    depth = obb_penetration((0, 0), (1, 1), 0, (1.5, 0), (1, 1), 0)
+    assert np.isclose(depth, 0.5)
+    assert obb_penetration((0, 0), (1, 1), 0, (3, 0), (1, 1), 0) == 0.0
+
+
+def test_broadcast_candidates_against_placed():
+    candidates = np.array([[0.0, 0.0], [5.0, 0.0], [10.0, 0.0]])
+    placed = np.array([[0.5, 0.0], [10.0, 0.5]])
+    hits = obb_overlap(candidates[:, None, :], (1, 1), np.zeros((3, 1)),
+                       placed[None, :, :], np.ones((1, 2, 2)), np.zeros((1, 2)))
+    assert hits.shape == (3, 2)
+    assert hits.any(axis=1).tolist() == [True, False, True]
+
+
+def test_footprint_set_grows_and_updates():
+    footprints = FootprintSet(capacity=1)
+    for i in range(20):
+        footprints.add((i * 3.0, 0.0, 0.0), (1, 1), 0.0)
+    assert len(footprints) == 20
+    assert footprints.overlaps((3.0, 0.0), (0.5, 0.5), 0.0).sum() == 1
+
+    footprints.update(1, (100.0, 100.0), (1, 1), 0.0)
+    assert not footprints.overlaps((3.0, 0.0), (0.5, 0.5), 0.0).any()
+    assert footprints.overlaps((3.0, 0.0), (0.5, 0.5), 0.0, indices=[0, 2]).sum() == 0
+
+    footprints.clear()
+    assert len(footprints) == 0
+
+
+def test_rule_placer_uses_catalog_footprints():
+    from philo_interior_addon.smart_placement_rules import SmartLayoutGenerator
+
+    generator = SmartLayoutGenerator(room_size=6)
+    generator.placed_items = [
+        {"file": "shelf-1.obj", "position": (0, 0, 0), "rotation": (0, 0, 0), "type": "shelf"},
+        {"file": "rug-1.obj", "position": (0, 2, 0.01), "rotation": (0, 0, 0), "type": "rug"},
+    ]
+    # The 0.8m wide shelf reaches x = 0.4; a 0.3 square stand-in would stop at 0.15
+    assert generator._check_collision((0.8, 0), 0.3, 0.3)
+    assert not generator._check_collision((1.2, 0), 0.3, 0.3)
+    # Rugs lie under furniture
+    assert not generator._check_collision((0, 2), 0.3, 0.3)
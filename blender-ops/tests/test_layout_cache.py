@@ -0,0 +1,68 @@
+from philo_interior_addon import config
+from philo_interior_addon.layout_cache import LayoutCache
+
+CATALOG = {"sofa-1.obj": {"dimensions": {"width": 2.2, "depth": 0.9}}}
+ROOM = {"size": 6}
+LAYOUT = [{"file": "sofa-1.obj", "position": (0.0, -2.0, 0.0), "rotation": (0, 0, 0.0)}]
+
+
+def test_key_depends_on_every_input():
+    key = LayoutCache.make_key(CATALOG, ROOM, ["sofa-1.obj"], 1)
+    assert key == LayoutCache.make_key(CATALOG, dict(ROOM), ("sofa-1.obj",), 1)
+    assert key != LayoutCache.make_key(CATALOG, {"size": 7}, ["sofa-1.obj"], 1)
+    assert key != LayoutCache.make_key(CATALOG, ROOM, [], 1)
+    assert key != LayoutCache.make_key({}, ROOM, ["sofa-1.obj"], 1)
+
+
+def test_round_trip_through_disk_restores_tuples(tmp_path):
+    key = LayoutCache.make_key(CATALOG, ROOM, ["sofa-1.obj"], 1)
+    LayoutCache(str(tmp_path)).put(key, LAYOUT)
+
+    reopened = LayoutCache(str(tmp_path))
+    assert reopened.get(key) == LAYOUT
+    assert isinstance(reopened.get(key)[0]["position"], tuple)
+    assert reopened.hits == 2
+
+
+def test_miss_and_memory_eviction(tmp_path):
+    cache = LayoutCache(str(tmp_path), max_entries=2)
+    assert cache.get("missing") is None
+    assert cache.misses == 1
+
+    for key in ("a", "b", "c"):
+        cache.put(key, LAYOUT)
+    assert list(cache.entries) == ["b", "c"]
+    assert cache.get("a") == LAYOUT  # Evicted from memory, still on disk
+
+
+def test_disk_trim_and_clear(tmp_path):
+    cache = LayoutCache(str(tmp_path), max_entries=1, max_disk_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, LAYOUT)
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+    cache.clear()
+    assert list(tmp_path.glob("*.json")) == []
+    assert cache.get("c") is None
+
+
+def test_key_changes_with_solver_version(monkeypatch):
+    key = LayoutCache.make_key(CATALOG, ROOM, ["sofa-1.obj"], 1)
+    monkeypatch.setattr(config, "LAYOUT_CACHE_VERSION", config.LAYOUT_CACHE_VERSION + 1)
+    assert LayoutCache.make_key(CATALOG, ROOM, ["sofa-1.obj"], 1) != key
+
+
+def test_callers_cannot_mutate_cached_layouts(tmp_path):
+    cache = LayoutCache(str(tmp_path))
+    layout = [dict(item) for item in LAYOUT]
+    cache.put("a", layout)
+    layout[0]["position"] = (9, 9, 9)
+
+    first = cache.get("a")
+    first[0]["position"] = (5, 5, 5)
+    first.append({"file": "rug-1.obj"})
+    assert cache.get("a") == LAYOUT
+
+    reopened = LayoutCache(str(tmp_path))
+    reopened.get("a")[0]["file"] = "chair.obj"
+    assert reopened.get("a") == LAYOUT
@@ -0,0 +1,49 @@
+import contextlib
+import io
+
+from philo_interior_addon.layout_core import solve_layout
+
+
+def quiet_solve(*args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return solve_layout(*args, **kwargs)
+
+
+def layout_key(layout):
+    return tuple((item["file"], tuple(round(v, 3) for v in item["position"]), round(item["rotation"][2], 3))
+                 for item in layout)
+
+
+def test_same_seed_same_layout():
+    assert quiet_solve({"size": 6}, seed=5) == quiet_solve({"size": 6}, seed=5)
+
+
+def test_seeds_give_distinct_layouts():
+    seeds = range(20)
+    layouts = {layout_key(quiet_solve({"size": 6}, seed=seed)) for seed in seeds}
+    assert len(layouts) >= 0.8 * len(seeds)
+
+
+def test_expert_start_places_the_selection_and_falls_back_to_greedy():
+    selection = ["sofa-1.obj", "table-2.obj", "painting-1.obj"]
+    layout = quiet_solve({"size": 6}, seed=0, start="expert", selection=selection)
+    assert sorted(item["file"] for item in layout) == sorted(selection)
+
+    sofa = next(item for item in layout if item["file"] == "sofa-1.obj")
+    assert sofa["position"] == (0, -2.2, 0)
+
+
+def test_expert_start_honours_furniture_count_and_polygon():
+    from philo_interior_addon.layout_core import FurnitureCatalog
+    from philo_interior_addon.room_geometry import RoomPolygon
+
+    # Mirrored L: the expert back-right corner is not floor
+    polygon = [(-3, -3), (0, -3), (0, 0), (3, 0), (3, 3), (-3, 3)]
+    layout = quiet_solve({"size": 6, "polygon": polygon}, seed=0, start="expert", furniture_count=5)
+    assert len(layout) == 5
+
+    room = RoomPolygon(polygon)
+    for item in layout:
+        dims = FurnitureCatalog.FURNITURE_DATA[item["file"]]["dimensions"]
+        assert room.contains_footprints([item["position"][:2]], (dims["width"] / 2, dims["depth"] / 2),
+                                        item["rotation"][2])[0], item["file"]
@@ -0,0 +1,32 @@
+import contextlib
+import io
+
+import numpy as np
+
+from philo_interior_addon.layout_core import FurnitureCatalog, solve_layout
+from philo_interior_addon.layout_optimizer import LayoutAnnealer
+
+
+def quietly(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def test_annealing_keeps_cost_free_items_near_their_start():
+    room = {"size": 6}
+    start = quietly(solve_layout, room, seed=0, start="expert")
+    annealed = quietly(solve_layout, room, seed=0, mode="anneal", start="expert", iterations=3000)
+
+    before = {item["file"]: np.array(item["position"][:2]) for item in start}
+    for item in annealed:
+        assert np.hypot(*(np.array(item["position"][:2]) - before[item["file"]])) < 0.5, item["file"]
+
+
+def test_optimize_reports_the_starting_cost():
+    layout = quietly(solve_layout, {"size": 6}, seed=1)
+    annealer = LayoutAnnealer(layout, 6, FurnitureCatalog.FURNITURE_DATA, seed=1)
+    start_cost = annealer.total_cost
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        annealer.optimize(500)
+    assert f"cost {start_cost:.3f} ->" in out.getvalue()
@@ -0,0 +1,52 @@
+from philo_interior_addon import config
+from philo_interior_addon.material_keywords import KeywordMatcher, format_match_table, get_keyword_matcher
+
+
+def reference_match(name, keywords, priority):
+    """The nested-loop lookup the matcher replaced"""
+    name = name.lower()
+    for material_type in priority + [t for t in keywords if t not in priority]:
+        for keyword in sorted(keywords[material_type], key=len, reverse=True):
+            if keyword in name:
+                return material_type, keyword
+    return None
+
+
+def test_priority_beats_position_in_name():
+    matcher = KeywordMatcher(config.MATERIAL_KEYWORDS, config.MATERIAL_KEYWORD_PRIORITY)
+    assert matcher.match("Metal_Sofa_Leg") == ("fabric", "sofa")
+    assert matcher.match("table_leg") == ("wood", "table")
+    assert matcher.match("Chrome") == ("metal", "chrome")
+    assert matcher.match("lamp") is None
+    assert matcher.match("") is None
+
+
+def test_overlapping_keywords_still_found():
+    # "polyester" contains "poly"; "iron" inside "environment"
+    matcher = KeywordMatcher({"plastic": ["poly"], "metal": ["iron"]}, ["metal", "plastic"])
+    assert matcher.match("environment_poly") == ("metal", "iron")
+
+
+def test_longer_keyword_of_same_type_wins():
+    matcher = KeywordMatcher({"wood": ["wood", "woodgrain"]})
+    assert matcher.match("oak_woodgrain") == ("wood", "woodgrain")
+
+
+def test_matches_reference_lookup():
+    keywords = config.MATERIAL_KEYWORDS
+    priority = config.MATERIAL_KEYWORD_PRIORITY
+    matcher = KeywordMatcher(keywords, priority)
+    names = ["sofa_seat", "leather_ottoman", "glass_table_top", "polyshelf", "steel_frame",
+             "cushion_mirror", "Acrylic_Leg", "hide", "random"]
+    for name in names:
+        assert matcher.match(name) == reference_match(name, keywords, priority), name
+
+
+def test_shared_matcher_and_table():
+    assert get_keyword_matcher() is get_keyword_matcher()
+    table = format_match_table([("Sofa", "Seat", "fabric", "sofa", "object"),
+                                ("Lamp", None, None, None, None)])
+    lines = table.splitlines()
+    assert lines[0].startswith("Object")
+    assert set(lines[1]) <= {"-", " "}
+    assert lines[3].split() == ["Lamp", "-", "-", "-", "-"]
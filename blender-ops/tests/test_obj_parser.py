@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from philo_interior_addon.obj_parser import ObjParser, parse_obj
+
+CUBE_SIDE = b"""mtllib side.mtl
+o Side
+v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 0
+vt 0 0
+vt 1 0
+vt 1 1
+vn 0 0 1
+usemtl Red
+f 1/1/1 2/2/1 3/3/1 4/3/1
+o Other
+usemtl Blue
+f -4//1 -3//1 -2//1
+"""
+
+
+def parse_bytes(data):
+    parser = ObjParser()
+    parser.feed(data)
+    return parser.finish()
+
+
+def test_pools_objects_and_materials():
+    obj_data = parse_bytes(CUBE_SIDE)
+    assert obj_data.vertex_count == 4
+    assert obj_data.positions[2].tolist() == [1, 1, 0]
+    assert obj_data.uvs.shape == (3, 2)
+    assert obj_data.face_count == 2
+
+    side, other = obj_data.objects
+    assert side["name"] == "Side"
+    assert side["face_sizes"].tolist() == [4]
+    assert side["vertex_indices"].tolist() == [0, 1, 2, 3]
+    assert side["uv_indices"].tolist() == [0, 1, 2, 2]
+    assert side["materials"] == ["Red"]
+
+    # Negative indices are relative to the vertices read so far; v//vn has no texture index
+    assert other["vertex_indices"].tolist() == [0, 1, 2]
+    assert other["uv_indices"].tolist() == [-1, -1, -1]
+    assert other["normal_indices"].tolist() == [0, 0, 0]
+    assert other["materials"] == ["Blue"]
+
+
+def test_optional_w_and_mixed_face_formats():
+    obj_data = parse_bytes(b"v 0 0 0 1\nv 1 0 0\nv 0 1 0 1\nvt 0 0\nf 1/1 2/1 3/1\nf 1 2 3\n")
+    assert obj_data.positions.shape == (3, 3)
+    assert obj_data.objects[0]["uv_indices"].tolist() == [0, 0, 0, -1, -1, -1]
+
+
+def test_degenerate_faces_are_dropped():
+    obj_data = parse_bytes(b"v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2\nf 1 2 3\n")
+    assert obj_data.face_count == 1
+
+
+def test_chunked_file_matches_single_read(tmp_path):
+    path = tmp_path / "side.obj"
+    path.write_bytes(CUBE_SIDE)
+    (tmp_path / "side.mtl").write_text("newmtl Red\nKd 1 0 0\nd 0.5\nmap_Kd -s 1 1 1 red.png\n")
+
+    whole = parse_obj(str(path))
+    chunked = parse_obj(str(path), chunk_size=7)
+    assert np.array_equal(whole.positions, chunked.positions)
+    for a, b in zip(whole.objects, chunked.objects):
+        assert np.array_equal(a["vertex_indices"], b["vertex_indices"])
+        assert a["materials"] == b["materials"]
+
+    red = whole.material_specs["Red"]
+    assert red["color"] == (1.0, 0.0, 0.0)
+    assert red["alpha"] == pytest.approx(0.5)
+    assert red["texture"] == str(tmp_path / "red.png")
+
+
+def test_inline_comments_and_trailing_tokens():
+    obj_data = parse_bytes(b"# header\n"
+                           b"v 1 2 3 # note\n"
+                           b"v 4 5 6\t#tab comment\n"
+                           b"v 7 8 9 0.5 extra\n"
+                           b"vt 0.5 0.25 # uv\n"
+                           b"f 1/1 2/1 3/1 # tri\n"
+                           b"f 1 2 3#tight\n")
+    assert obj_data.positions.tolist() == [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    assert obj_data.uvs.tolist() == [[0.5, 0.25]]
+    assert obj_data.objects[0]["face_sizes"].tolist() == [3, 3]
+    assert obj_data.objects[0]["vertex_indices"].tolist() == [0, 1, 2, 0, 1, 2]
+    assert obj_data.objects[0]["uv_indices"].tolist() == [0, 0, 0, -1, -1, -1]
@@ -0,0 +1,87 @@
+import math
+
+import numpy as np
+
+from philo_interior_addon.occupancy import OccupancyGrid
+from philo_interior_addon.room_geometry import RoomPolygon
+
+FLOOR = {"min_x": -2.0, "max_x": 2.0, "min_y": -2.0, "max_y": 2.0}
+
+
+def test_empty_floor_clearance_is_distance_to_boundary():
+    grid = OccupancyGrid(FLOOR, resolution=0.1)
+    assert math.isclose(grid.max_clearance, 1.95, abs_tol=1e-9)
+    assert not grid.occupied.any()
+
+
+def test_add_footprint_marks_cells_and_lowers_clearance():
+    grid = OccupancyGrid(FLOOR, resolution=0.1)
+    grid.add_footprint((0.0, 0.0), (0.5, 0.5), 0.0)
+
+    assert grid.occupied[(np.abs(grid.cell_x) < 0.45) & (np.abs(grid.cell_y) < 0.45)].all()
+    assert not grid.occupied[np.abs(grid.cell_x) > 0.55].any()
+    # A cell 1m right of the box edge is 1m from it (and further from the walls' corner)
+    row, col = np.argwhere(np.isclose(grid.cell_x, 1.45) & np.isclose(grid.cell_y, 0.05))[0]
+    assert math.isclose(grid.clearance[row, col], 0.55, abs_tol=1e-9)
+
+
+def test_find_free_cell_fits_radius_and_is_tightest():
+    grid = OccupancyGrid(FLOOR, resolution=0.1)
+    grid.add_footprint((0.0, 0.0), (0.5, 0.5), 0.0)
+    cell = grid.find_free_cell(0.3)
+    assert cell is not None
+
+    row, col = np.argwhere(np.isclose(grid.cell_x, cell[0]) & np.isclose(grid.cell_y, cell[1]))[0]
+    clearance = grid.clearance[row, col]
+    assert clearance >= 0.3
+    assert clearance == grid.clearance[grid.clearance >= 0.3].min()
+
+
+def test_find_free_cell_none_when_nothing_fits():
+    grid = OccupancyGrid(FLOOR, resolution=0.1)
+    assert grid.find_free_cell(2.5) is None
+    grid.add_footprint((0.0, 0.0), (2.0, 2.0), 0.0)
+    assert grid.find_free_cell(0.1) is None
+
+
+def test_clear_restores_empty_floor():
+    grid = OccupancyGrid(FLOOR, resolution=0.1)
+    empty = grid.clearance.copy()
+    grid.add_footprint((0.5, 0.5), (0.3, 0.3), 0.4)
+    grid.clear()
+    assert np.array_equal(grid.clearance, empty)
+    assert not grid.occupied.any()
+
+
+def test_polygon_room_blocks_cells_outside_floor():
+    room = RoomPolygon([(-2, -2), (2, -2), (2, 0), (0, 0), (0, 2), (-2, 2)])
+    floor = {"min_x": -2.0, "max_x": 2.0, "min_y": -2.0, "max_y": 2.0}
+    grid = OccupancyGrid(floor, resolution=0.1, room_polygon=room)
+    outside = (grid.cell_x > 0.05) & (grid.cell_y > 0.05)
+    assert grid.occupied[outside].all()
+    assert (grid.clearance[outside] == 0).all()
+
+    # Clearance is a radius: a 0.5m square needs its half-diagonal
+    half = (0.25, 0.25)
+    for _ in range(5):
+        cell = grid.find_free_cell(math.hypot(*half))
+        assert cell is not None
+        assert room.contains_footprints([cell], half, 0.0)[0]
+        grid.add_footprint(cell, half, 0.0)
+
+
+def test_incremental_state_matches_full_scan():
+    rng = np.random.default_rng(7)
+    grid = OccupancyGrid({"min_x": -4.0, "max_x": 4.0, "min_y": -3.0, "max_y": 3.0}, resolution=0.05)
+    for _ in range(40):
+        center = rng.uniform(-4, 4), rng.uniform(-3, 3)
+        grid.add_footprint(center, rng.uniform(0.05, 0.4, size=2), rng.uniform(0, math.pi))
+        assert grid.max_clearance == grid.clearance.max()
+
+        for radius in (0.05, 0.12, 0.3):
+            slack = np.where(grid.clearance >= radius, grid.clearance, np.inf)
+            if np.isinf(slack).all():
+                assert grid.find_free_cell(radius) is None
+                continue
+            row, col = np.unravel_index(int(np.argmin(slack)), slack.shape)
+            assert grid.find_free_cell(radius) == (grid.cell_x[row, col], grid.cell_y[row, col])
@@ -0,0 +1,48 @@
+import contextlib
+import io
+
+import pytest
+
+from philo_interior_addon.incremental_layout import update_layout
+from philo_interior_addon.layout_core import FurnitureCatalog, solve_layout
+from philo_interior_addon.room_geometry import RoomPolygon
+
+L_ROOM = [(-3, -3), (3, -3), (3, 0), (0, 0), (0, 3), (-3, 3)]
+ROOM = {"size": 6, "polygon": L_ROOM}
+
+
+def quietly(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def off_floor(layout):
+    """Files of floor items whose footprint leaves the L-shaped floor"""
+    room = RoomPolygon(L_ROOM)
+    outside = []
+    for item in layout:
+        info = FurnitureCatalog.FURNITURE_DATA[item["file"]]
+        if info["type"] == "wall_decor":
+            continue
+        half_extents = (info["dimensions"]["width"] / 2, info["dimensions"]["depth"] / 2)
+        if not room.contains_footprints([item["position"][:2]], half_extents, item["rotation"][2])[0]:
+            outside.append(item["file"])
+    return outside
+
+
+@pytest.mark.parametrize("start", ["greedy", "expert"])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_annealed_l_room_stays_on_floor(seed, start):
+    layout = quietly(solve_layout, ROOM, seed=seed, mode="anneal", start=start, iterations=1500)
+    assert off_floor(layout) == []
+
+
+def test_update_layout_places_on_l_floor():
+    layout = [item for item in quietly(solve_layout, ROOM, seed=3) if item["file"] != "table-1.obj"]
+    new_layout, affected = quietly(update_layout, layout, {"action": "add", "file": "table-1.obj"}, ROOM)
+    assert "table-1.obj" in affected
+    assert off_floor(new_layout) == []
+
+    moved, _ = quietly(update_layout, new_layout,
+                       {"action": "move", "file": "sofa-1.obj", "position": (-1.5, -2.45, 0)}, ROOM)
+    assert off_floor(moved) == []
@@ -0,0 +1,77 @@
+import math
+
+import numpy as np
+import pytest
+
+from philo_interior_addon.room_geometry import RoomPolygon
+
+L_ROOM = [(-3, -3), (3, -3), (3, 0), (0, 0), (0, 3), (-3, 3)]
+
+
+def test_square_room():
+    room = RoomPolygon.square(6)
+    assert room.area == pytest.approx(36)
+    assert room.size == pytest.approx(6)
+    assert room.centroid == pytest.approx((0, 0))
+    assert room.walls == [0, 3, 1]
+
+
+def test_needs_three_vertices():
+    with pytest.raises(ValueError):
+        RoomPolygon([(0, 0), (1, 0)])
+
+
+def test_winding_is_normalized():
+    clockwise = RoomPolygon(L_ROOM[::-1])
+    counter = RoomPolygon(L_ROOM)
+    assert clockwise.area == pytest.approx(counter.area) == pytest.approx(27)
+    assert clockwise.centroid == pytest.approx(counter.centroid)
+
+
+def test_contains_points_and_walls():
+    room = RoomPolygon(L_ROOM)
+    inside = room.contains([(-1, -1), (1, 1), (2, -1), (-1, 2), (0, 0), (3, -3)])
+    assert inside.tolist() == [True, False, True, True, True, True]
+
+
+def test_distance_to_walls():
+    room = RoomPolygon(L_ROOM)
+    assert room.distance_to_walls([(-2, -2), (1, -1)]) == pytest.approx([1, 1])
+
+
+def test_footprint_across_inner_corner_is_outside():
+    room = RoomPolygon(L_ROOM)
+    # All four corners inside the floor, but the inner corner pokes through the box
+    assert not room.contains_footprints([(0.0, 0.0)], (0.25, 0.25), 0.0)[0]
+    assert room.contains_footprints([(-1.0, -1.0)], (0.25, 0.25), 0.0)[0]
+    assert not room.contains_footprints([(-2.9, 0.0)], (0.25, 0.25), 0.0)[0]
+
+
+def test_wall_candidates_face_into_room():
+    room = RoomPolygon.square(6)
+    positions, rotations, ranks, slides = room.wall_candidates(0.5, 1.0)
+    back = ranks == 0
+    assert np.allclose(positions[back][:, 1], -2.5)
+    assert np.allclose(rotations[back], 0.0)
+    assert room.contains(positions).all()
+
+
+def test_corners_are_convex_only():
+    room = RoomPolygon(L_ROOM)
+    corners = room.corners()
+    positions = {corner["position"] for corner in corners}
+    assert (0.0, 0.0) not in positions
+    assert len(corners) == 5
+    for corner in corners:
+        inward = np.array(corner["along"][0]) + np.array(corner["along"][1])
+        facing = np.array((math.sin(corner["rotation"]), math.cos(corner["rotation"])))
+        assert np.dot(inward, facing) > 0
+
+
+def test_reflex_vertices_and_edge_distances():
+    room = RoomPolygon(L_ROOM)
+    assert room.reflex_vertices().tolist() == [[0.0, 0.0]]
+    assert len(RoomPolygon.square(6).reflex_vertices()) == 0
+    distances = room.edge_distances([(-2, -2)])
+    assert distances.shape == (1, 6)
+    assert distances.min() == pytest.approx(room.distance_to_walls([(-2, -2)])[0])
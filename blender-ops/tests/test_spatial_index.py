@@ -0,0 +1,79 @@
+from philo_interior_addon.spatial_index import FootprintGrid
+
+
+def test_query_returns_overlapping_items_in_id_order():
+    grid = FootprintGrid(cell_size=0.5)
+    grid.insert(2, 0.0, 0.0, 1.0, 1.0)
+    grid.insert(1, 0.8, 0.8, 1.6, 1.6)
+    grid.insert(3, 5.0, 5.0, 6.0, 6.0)
+
+    assert grid.query(0.5, 0.5, 0.9, 0.9) == [1, 2]
+    assert grid.query(5.5, 5.5, 5.6, 5.6) == [3]
+    assert grid.query(3.0, 3.0, 4.0, 4.0) == []
+
+
+def test_touching_bounds_count_as_overlap():
+    grid = FootprintGrid(cell_size=0.5)
+    grid.insert(0, 0.0, 0.0, 1.0, 1.0)
+    assert grid.query(1.0, 0.0, 2.0, 1.0) == [0]
+
+
+def test_negative_coordinates_use_floor_cells():
+    grid = FootprintGrid(cell_size=0.5)
+    grid.insert(0, -1.2, -1.2, -0.9, -0.9)
+    assert grid.query(-1.0, -1.0, -0.95, -0.95) == [0]
+    assert grid.query(0.0, 0.0, 0.1, 0.1) == []
+
+
+def test_reinsert_moves_item_and_remove_empties_cells():
+    grid = FootprintGrid(cell_size=0.5)
+    grid.insert(0, 0.0, 0.0, 0.4, 0.4)
+    grid.insert(0, 3.0, 3.0, 3.4, 3.4)
+    assert len(grid) == 1
+    assert grid.query(0.1, 0.1, 0.2, 0.2) == []
+    assert grid.query(3.1, 3.1, 3.2, 3.2) == [0]
+
+    grid.remove(0)
+    grid.remove(0)  # Removing twice is a no-op
+    assert len(grid) == 0
+    assert grid.cells == {}
+
+
+def test_clear():
+    grid = FootprintGrid()
+    grid.insert(0, 0.0, 0.0, 1.0, 1.0)
+    grid.clear()
+    assert len(grid) == 0
+    assert grid.query(0.0, 0.0, 1.0, 1.0) == []
+
+
+def test_batched_candidates_match_a_full_collision_scan():
+    import contextlib
+    import io
+
+    import numpy as np
+
+    from philo_interior_addon import collision
+    from philo_interior_addon.layout_core import SmartFurniturePlacement
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        placer = SmartFurniturePlacement(room_size=8, seed=5)
+        placer.reset_placements()
+        rng = np.random.default_rng(5)
+        dims = {"width": 0.6, "height": 0.5, "depth": 0.4}
+        for x, y in rng.uniform(-3.5, 3.5, (40, 2)):
+            placer.add_placement({"position": (float(x), float(y), 0.0),
+                                  "rotation": (0, 0, float(rng.uniform(0, np.pi))), "dimensions": dims})
+
+    positions = rng.uniform(-4, 4, (300, 2))
+    rotations = rng.uniform(0, np.pi, 300)
+    valid = placer._valid_candidates(positions, rotations, dims)
+
+    in_bounds = np.all(np.abs(positions) + collision.rotated_half_extents((0.3, 0.2), rotations) <= 3.7, axis=1)
+    hits = collision.obb_overlap(
+        positions[:, None, :], (0.3, 0.2), rotations[:, None],
+        placer.footprints.centers[None], placer.footprints.half_extents[None],
+        placer.footprints.rotations[None], margin=placer.COLLISION_MARGIN
+    ).any(axis=1)
+    assert np.array_equal(valid, in_bounds & ~hits)
+    assert valid.any() and (in_bounds & ~valid).any()
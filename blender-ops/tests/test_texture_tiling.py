@@ -0,0 +1,47 @@
+import numpy as np
+
+from philo_interior_addon.texture_tiling import edge_weights, make_tileable
+
+
+def wrap_jump(image, axis):
+    """Largest step between the last and first pixel rows/columns along an axis"""
+    first = np.take(image, 0, axis=axis)
+    last = np.take(image, -1, axis=axis)
+    return np.abs(first - last).max()
+
+
+def largest_step(image, axis):
+    return np.abs(np.diff(image, axis=axis)).max()
+
+
+def test_edge_weights():
+    weights = edge_weights(64, 0.25)
+    assert weights[0] == weights[-1] == 0.0
+    assert (weights[16:48] == 1.0).all()
+    assert np.allclose(weights, weights[::-1])
+
+
+def test_ramps_wrap_without_seams():
+    y, x = np.mgrid[0:64, 0:64] / 63.0
+    image = np.stack([x, y, x * y, np.ones_like(x)], axis=2)
+    assert wrap_jump(image, 0) == 1.0 and wrap_jump(image, 1) == 1.0
+
+    tiled = make_tileable(image)
+    for axis in (0, 1):
+        assert wrap_jump(tiled, axis) <= largest_step(tiled, axis) + 1e-9
+    assert np.allclose(tiled[..., 3], 1.0)
+
+
+def test_noise_keeps_its_center():
+    rng = np.random.default_rng(3)
+    image = rng.random((32, 32, 3))
+    tiled = make_tileable(image)
+    assert np.allclose(tiled[8:24, 8:24], image[8:24, 8:24])
+
+
+def test_normal_maps_stay_unit_length():
+    rng = np.random.default_rng(5)
+    vectors = rng.normal(size=(16, 16, 3)) + (0, 0, 3)
+    vectors /= np.linalg.norm(vectors, axis=2, keepdims=True)
+    tiled = make_tileable(vectors * 0.5 + 0.5, normal_map=True)
+    assert np.allclose(np.linalg.norm(tiled * 2 - 1, axis=2), 1.0)
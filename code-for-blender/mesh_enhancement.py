@@ -14,12 +14,69 @@ bl_info = {
 import bpy
 from mathutils import Vector
 import os
+import sys
 import math
 
 from bpy_extras.io_utils import ImportHelper
 from bpy.props import StringProperty
 from bpy.types import Operator, Panel
 
+# Geometry statistics and the material compiler come from the add-on package in
+# blender-ops; this is the only place the path is set up
+BLENDER_OPS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "blender-ops")
+if BLENDER_OPS_PATH not in sys.path:
+    sys.path.append(BLENDER_OPS_PATH)
+from philo_interior_addon.geometry_stats import object_stats
+from philo_interior_addon.material_compiler import compile_materials, principled_spec
+
+def sofa_fabric_spec(texture_path):
+    """Box-projected fabric texture driving color, roughness and bump"""
+    return {
+        "name": "PBR_Sofa_Fabric",
+        "nodes": {
+            "output": {"type": "ShaderNodeOutputMaterial"},
+            "bsdf": {"type": "ShaderNodeBsdfPrincipled", "inputs": {"Sheen Weight": 0.7}},
+            "tex_coord": {"type": "ShaderNodeTexCoord"},
+            "mapping": {"type": "ShaderNodeMapping", "inputs": {"Scale": (6, 6, 6)}},
+            "image": {"type": "ShaderNodeTexImage", "image": texture_path, "props": {"projection": 'BOX'},
+                      "image_mtime": os.path.getmtime(texture_path)},
+            "bump": {"type": "ShaderNodeBump", "inputs": {"Strength": 0.04}},
+        },
+        "links": [
+            ("tex_coord.Generated", "mapping.Vector"),
+            ("mapping.Vector", "image.Vector"),
+            ("image.Color", "bsdf.Base Color"),
+            ("image.Color", "bsdf.Roughness"),
+            ("image.Color", "bump.Height"),
+            ("bump.Normal", "bsdf.Normal"),
+            ("bsdf.BSDF", "output.Surface"),
+        ],
+    }
+
+PILLOW_FABRIC_SPEC = principled_spec("PBR_Pillow_Fabric", {
+    "Base Color": (0.95, 0.95, 0.92, 1.0), "Roughness": 0.8, "Sheen Weight": 1.0})
+
+TABLE_WOOD_SPEC = {
+    "name": "PBR_Table_Wood",
+    "nodes": {
+        "output": {"type": "ShaderNodeOutputMaterial"},
+        "bsdf": {"type": "ShaderNodeBsdfPrincipled", "inputs": {"Roughness": 0.15, "Specular IOR Level": 0.4}},
+        "noise": {"type": "ShaderNodeTexNoise", "inputs": {"Scale": 25, "Detail": 10}},
+        "ramp": {"type": "ShaderNodeValToRGB", "ramp": [
+            (0.0, (0.03, 0.01, 0.01, 1)),
+            (1.0, (0.08, 0.04, 0.02, 1)),
+        ]},
+    },
+    "links": [
+        ("noise.Factor", "ramp.Factor"),
+        ("ramp.Color", "bsdf.Base Color"),
+        ("bsdf.BSDF", "output.Surface"),
+    ],
+}
+
+FLOOR_SPEC = principled_spec("Hardwood_Floor", {"Roughness": 0.2})
+WALL_SPEC = principled_spec("Wall_Paint", {"Base Color": (0.92, 0.92, 0.9, 1), "Roughness": 0.7})
+
 class PhiloSceneGenerator:
     def __init__(self):
         self.imported_object = None
@@ -70,7 +127,7 @@ class PhiloSceneGenerator:
         bpy.ops.uv.smart_project(angle_limit=66, island_margin=0.02)
         bpy.ops.object.mode_set(mode='OBJECT')
         bpy.context.view_layer.update()
-        lowest_z = min((obj.matrix_world @ v.co).z for v in obj.data.vertices)
+        lowest_z = float(object_stats(obj)["min"][2])
         obj.location.z -= lowest_z
         print(f"Prepared and placed '{obj.name}' on the floor.")
 
@@ -78,63 +135,14 @@ class PhiloSceneGenerator:
         if not obj or not obj.data:
             return
 
-        materials = {}
-        # Sofa Fabric
-        sofa_mat = bpy.data.materials.new(name="PBR_Sofa_Fabric")
-        sofa_mat.use_nodes = True
-        nodes = sofa_mat.node_tree.nodes
-        links = sofa_mat.node_tree.links
-        nodes.clear()
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        principled = nodes.new(type='ShaderNodeBsdfPrincipled')
-        tex_coord = nodes.new(type='ShaderNodeTexCoord')
-        mapping = nodes.new(type='ShaderNodeMapping')
-        mapping.inputs['Scale'].default_value = (6, 6, 6)
-        try:
-            img_node = nodes.new(type='ShaderNodeTexImage')
-            img_node.image = bpy.data.images.load(fabric_texture_path)
-            img_node.projection = 'BOX'
-        except Exception as e:
-            print(f"Could not load fabric texture: {e}")
+        if not os.path.exists(fabric_texture_path):
+            print(f"Could not load fabric texture: {fabric_texture_path} not found")
             return
-        bump = nodes.new(type='ShaderNodeBump')
-        bump.inputs['Strength'].default_value = 0.04
-        principled.inputs['Sheen Weight'].default_value = 0.7
-        links.new(tex_coord.outputs['Generated'], mapping.inputs['Vector'])
-        links.new(mapping.outputs['Vector'], img_node.inputs['Vector'])
-        links.new(img_node.outputs['Color'], principled.inputs['Base Color'])
-        links.new(img_node.outputs['Color'], principled.inputs['Roughness'])
-        links.new(img_node.outputs['Color'], bump.inputs['Height'])
-        links.new(bump.outputs['Normal'], principled.inputs['Normal'])
-        links.new(principled.outputs['BSDF'], output.inputs['Surface'])
-        materials["sofa"] = sofa_mat
-
-        # Pillow Fabric
-        pillow_mat = bpy.data.materials.new(name="PBR_Pillow_Fabric")
-        pillow_mat.use_nodes = True
-        p_principled = pillow_mat.node_tree.nodes["Principled BSDF"]
-        p_principled.inputs['Base Color'].default_value = (0.95, 0.95, 0.92, 1.0)
-        p_principled.inputs['Roughness'].default_value = 0.8
-        p_principled.inputs['Sheen Weight'].default_value = 1.0
-        materials["pillow"] = pillow_mat
-
-        # Table Wood
-        wood_mat = bpy.data.materials.new(name="PBR_Table_Wood")
-        wood_mat.use_nodes = True
-        w_nodes = wood_mat.node_tree.nodes
-        w_links = wood_mat.node_tree.links
-        w_principled = w_nodes["Principled BSDF"]
-        w_principled.inputs['Roughness'].default_value = 0.15
-        w_principled.inputs['Specular IOR Level'].default_value = 0.4
-        w_tex = w_nodes.new(type='ShaderNodeTexNoise')
-        w_tex.inputs['Scale'].default_value = 25
-        w_tex.inputs['Detail'].default_value = 10
-        w_ramp = w_nodes.new(type='ShaderNodeValToRGB')
-        w_ramp.color_ramp.elements[0].color = (0.03, 0.01, 0.01, 1)
-        w_ramp.color_ramp.elements[1].color = (0.08, 0.04, 0.02, 1)
-        w_links.new(w_tex.outputs['Fac'], w_ramp.inputs['Fac'])
-        w_links.new(w_ramp.outputs['Color'], w_principled.inputs['Base Color'])
-        materials["table"] = wood_mat
+        materials = compile_materials({
+            "sofa": sofa_fabric_spec(fabric_texture_path),
+            "pillow": PILLOW_FABRIC_SPEC,
+            "table": TABLE_WOOD_SPEC,
+        })
 
         obj.data.materials.clear()
         num_slots = len(obj.material_slots)
@@ -175,18 +183,11 @@ class PhiloSceneGenerator:
         ceiling = bpy.context.active_object
 
         # --- Create Materials for Room ---
-        floor_mat = bpy.data.materials.new(name="Hardwood_Floor")
-        floor_mat.use_nodes = True
-        nodes = floor_mat.node_tree.nodes
-        principled = nodes["Principled BSDF"]
-        principled.inputs['Roughness'].default_value = 0.2
+        room_materials = compile_materials({"floor": FLOOR_SPEC, "wall": WALL_SPEC})
+        floor_mat = room_materials["floor"]
         floor.data.materials.append(floor_mat)
 
-        wall_mat = bpy.data.materials.new(name="Wall_Paint")
-        wall_mat.use_nodes = True
-        wall_principled = wall_mat.node_tree.nodes["Principled BSDF"]
-        wall_principled.inputs['Base Color'].default_value = (0.92, 0.92, 0.9, 1)
-        wall_principled.inputs['Roughness'].default_value = 0.7
+        wall_mat = room_materials["wall"]
         back_wall.data.materials.append(wall_mat)
         left_wall.data.materials.append(wall_mat)
         ceiling.data.materials.append(wall_mat)
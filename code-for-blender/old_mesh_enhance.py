@@ -15,12 +15,46 @@ import bpy
 import bmesh
 from mathutils import Vector, noise
 import os
+import sys
 import math
 import random
 from bpy_extras.io_utils import ImportHelper
 from bpy.props import StringProperty, FloatProperty, BoolProperty, EnumProperty
 from bpy.types import Operator, Panel
 
+# The OBJ importer, material compiler and material families come from the
+# add-on package in blender-ops; this is the only place the path is set up
+BLENDER_OPS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "blender-ops")
+if BLENDER_OPS_PATH not in sys.path:
+    sys.path.append(BLENDER_OPS_PATH)
+from philo_interior_addon.obj_mesh import import_obj
+from philo_interior_addon.material_compiler import compile_material, principled_spec
+from philo_interior_addon.material_variants import COLORWAY_KEY, colorway_spec, family_material, set_colorway
+
+# Sofa variants: colorways of the shared upholstery shader
+SOFA_COLORWAYS = ("velvet", "cognac_leather", "linen", "microfiber")
+
+WOOD_FLOOR_SPEC = {
+    "name": "Wood_Floor",
+    "nodes": {
+        "output": {"type": "ShaderNodeOutputMaterial"},
+        "bsdf": {"type": "ShaderNodeBsdfPrincipled", "inputs": {
+            "Base Color": (0.4, 0.25, 0.1, 1.0), "Roughness": 0.4, "Specular IOR Level": 0.6}},
+        "wave": {"type": "ShaderNodeTexWave", "props": {"wave_type": 'SAW'}, "inputs": {"Scale": 20.0}},
+        "noise": {"type": "ShaderNodeTexNoise", "inputs": {"Scale": 50.0, "Detail": 10.0}},
+        "mix": {"type": "ShaderNodeMixRGB", "props": {"blend_type": 'MULTIPLY'}, "inputs": {"Factor": 0.3}},
+    },
+    "links": [
+        ("wave.Color", "mix.A"),
+        ("noise.Color", "mix.B"),
+        ("mix.Result", "bsdf.Base Color"),
+        ("bsdf.BSDF", "output.Surface"),
+    ],
+}
+
+WALL_PAINT_SPEC = principled_spec("Wall_Paint", {
+    "Base Color": (0.95, 0.95, 0.9, 1.0), "Roughness": 0.8, "Specular IOR Level": 0.1})
+
 class MeshyModelEnhancerPro:
     def __init__(self):
         self.original_object = None
@@ -115,39 +149,15 @@ class MeshyModelEnhancerPro:
             self.original_object.name = "Fallback_Cube"
             
     def import_obj_manual(self, filepath):
-        """Simplified manual OBJ import"""
+        """Manual OBJ import through the streaming NumPy parser (keeps UVs, normals and materials)"""
         try:
-            vertices = []
-            faces = []
-            
-            with open(filepath, 'r') as file:
-                for line in file:
-                    line = line.strip()
-                    if line.startswith('v '):
-                        parts = line.split()
-                        if len(parts) >= 4:
-                            vertices.append([float(parts[1]), float(parts[2]), float(parts[3])])
-                    elif line.startswith('f '):
-                        parts = line.split()[1:]
-                        face = []
-                        for part in parts:
-                            vertex_index = int(part.split('/')[0]) - 1
-                            face.append(vertex_index)
-                        if len(face) >= 3:
-                            faces.append(face)
-            
-            if not vertices or not faces:
+            objects = import_obj(filepath)
+            if not objects:
                 raise Exception("No valid geometry found")
             
-            mesh = bpy.data.meshes.new(name="ImportedOBJ")
-            mesh.from_pydata(vertices, [], faces)
-            mesh.update()
-            
-            obj = bpy.data.objects.new("ImportedOBJ", mesh)
-            bpy.context.collection.objects.link(obj)
-            
-            bpy.context.view_layer.objects.active = obj
-            obj.select_set(True)
+            for obj in objects:
+                obj.select_set(True)
+            bpy.context.view_layer.objects.active = objects[0]
             
         except Exception as e:
             print(f"Manual import failed: {e}")
@@ -206,108 +216,8 @@ class MeshyModelEnhancerPro:
                 bpy.ops.object.mode_set(mode='OBJECT')
         
     def create_realistic_sofa_materials(self):
-        """Create realistic sofa materials compatible with older Blender versions"""
-        materials = {}
-        
-        # Velvet Sofa
-        velvet_mat = bpy.data.materials.new(name="Velvet_Sofa")
-        velvet_mat.use_nodes = True
-        nodes = velvet_mat.node_tree.nodes
-        links = velvet_mat.node_tree.links
-        
-        nodes.clear()
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        principled = nodes.new(type='ShaderNodeBsdfPrincipled')
-        
-        # Velvet properties (compatible with older versions)
-        principled.inputs['Base Color'].default_value = (0.2, 0.15, 0.4, 1.0)
-        principled.inputs['Roughness'].default_value = 0.8
-        principled.inputs['Metallic'].default_value = 0.0
-        principled.inputs['Specular'].default_value = 0.3
-        if 'Subsurface' in principled.inputs:
-            principled.inputs['Subsurface'].default_value = 0.1
-        
-        links.new(principled.outputs['BSDF'], output.inputs['Surface'])
-        materials['velvet'] = velvet_mat
-        
-        # Leather Sofa
-        leather_mat = bpy.data.materials.new(name="Leather_Sofa")
-        leather_mat.use_nodes = True
-        nodes = leather_mat.node_tree.nodes
-        links = leather_mat.node_tree.links
-        
-        nodes.clear()
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        principled = nodes.new(type='ShaderNodeBsdfPrincipled')
-        noise_tex = nodes.new(type='ShaderNodeTexNoise')
-        bump_node = nodes.new(type='ShaderNodeBump')
-        
-        # Leather properties
-        principled.inputs['Base Color'].default_value = (0.4, 0.25, 0.15, 1.0)
-        principled.inputs['Roughness'].default_value = 0.3
-        principled.inputs['Metallic'].default_value = 0.0
-        principled.inputs['Specular'].default_value = 0.8
-        
-        # Leather texture
-        noise_tex.inputs['Scale'].default_value = 50.0
-        noise_tex.inputs['Detail'].default_value = 15.0
-        noise_tex.inputs['Roughness'].default_value = 0.7
-        
-        bump_node.inputs['Strength'].default_value = 0.2
-        
-        links.new(noise_tex.outputs['Fac'], bump_node.inputs['Height'])
-        links.new(bump_node.outputs['Normal'], principled.inputs['Normal'])
-        links.new(principled.outputs['BSDF'], output.inputs['Surface'])
-        materials['leather'] = leather_mat
-        
-        # Linen Fabric
-        linen_mat = bpy.data.materials.new(name="Linen_Sofa")
-        linen_mat.use_nodes = True
-        nodes = linen_mat.node_tree.nodes
-        links = linen_mat.node_tree.links
-        
-        nodes.clear()
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        principled = nodes.new(type='ShaderNodeBsdfPrincipled')
-        wave_tex = nodes.new(type='ShaderNodeTexWave')
-        bump_node = nodes.new(type='ShaderNodeBump')
-        
-        # Linen properties
-        principled.inputs['Base Color'].default_value = (0.9, 0.85, 0.75, 1.0)
-        principled.inputs['Roughness'].default_value = 0.9
-        principled.inputs['Metallic'].default_value = 0.0
-        principled.inputs['Specular'].default_value = 0.2
-        
-        # Fabric texture
-        wave_tex.inputs['Scale'].default_value = 100.0
-        wave_tex.inputs['Distortion'].default_value = 2.0
-        bump_node.inputs['Strength'].default_value = 0.1
-        
-        links.new(wave_tex.outputs['Color'], bump_node.inputs['Height'])
-        links.new(bump_node.outputs['Normal'], principled.inputs['Normal'])
-        links.new(principled.outputs['BSDF'], output.inputs['Surface'])
-        materials['linen'] = linen_mat
-        
-        # Microfiber
-        microfiber_mat = bpy.data.materials.new(name="Microfiber_Sofa")
-        microfiber_mat.use_nodes = True
-        nodes = microfiber_mat.node_tree.nodes
-        links = microfiber_mat.node_tree.links
-        
-        nodes.clear()
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        principled = nodes.new(type='ShaderNodeBsdfPrincipled')
-        
-        # Microfiber properties
-        principled.inputs['Base Color'].default_value = (0.6, 0.6, 0.65, 1.0)
-        principled.inputs['Roughness'].default_value = 0.7
-        principled.inputs['Metallic'].default_value = 0.0
-        principled.inputs['Specular'].default_value = 0.4
-        
-        links.new(principled.outputs['BSDF'], output.inputs['Surface'])
-        materials['microfiber'] = microfiber_mat
-        
-        return materials
+        """Shared upholstery material; each sofa variant sets its colorway as object properties"""
+        return family_material("upholstery")
         
     def create_realistic_environment(self):
         """Create a realistic room environment"""
@@ -318,37 +228,7 @@ class MeshyModelEnhancerPro:
             floor.name = "Floor"
             
             # Floor material
-            floor_mat = bpy.data.materials.new(name="Wood_Floor")
-            floor_mat.use_nodes = True
-            nodes = floor_mat.node_tree.nodes
-            links = floor_mat.node_tree.links
-            
-            nodes.clear()
-            output = nodes.new(type='ShaderNodeOutputMaterial')
-            principled = nodes.new(type='ShaderNodeBsdfPrincipled')
-            wave_tex = nodes.new(type='ShaderNodeTexWave')
-            noise_tex = nodes.new(type='ShaderNodeTexNoise')
-            mix_node = nodes.new(type='ShaderNodeMixRGB')
-            
-            # Wood floor properties
-            principled.inputs['Base Color'].default_value = (0.4, 0.25, 0.1, 1.0)
-            principled.inputs['Roughness'].default_value = 0.4
-            principled.inputs['Specular'].default_value = 0.6
-            
-            # Wood grain texture
-            wave_tex.inputs['Scale'].default_value = 20.0
-            wave_tex.wave_type = 'SAW'
-            
-            noise_tex.inputs['Scale'].default_value = 50.0
-            noise_tex.inputs['Detail'].default_value = 10.0
-            
-            mix_node.blend_type = 'MULTIPLY'
-            mix_node.inputs['Fac'].default_value = 0.3
-            
-            links.new(wave_tex.outputs['Color'], mix_node.inputs['Color1'])
-            links.new(noise_tex.outputs['Color'], mix_node.inputs['Color2'])
-            links.new(mix_node.outputs['Color'], principled.inputs['Base Color'])
-            links.new(principled.outputs['BSDF'], output.inputs['Surface'])
+            floor_mat = compile_material(WOOD_FLOOR_SPEC)
             
             floor.data.materials.append(floor_mat)
             self.scene_objects.append(floor)
@@ -372,21 +252,7 @@ class MeshyModelEnhancerPro:
             right_wall.rotation_euler = (math.radians(90), 0, math.radians(-90))
             
             # Wall material
-            wall_mat = bpy.data.materials.new(name="Wall_Paint")
-            wall_mat.use_nodes = True
-            nodes = wall_mat.node_tree.nodes
-            links = wall_mat.node_tree.links
-            
-            nodes.clear()
-            output = nodes.new(type='ShaderNodeOutputMaterial')
-            principled = nodes.new(type='ShaderNodeBsdfPrincipled')
-            
-            # Wall properties
-            principled.inputs['Base Color'].default_value = (0.95, 0.95, 0.9, 1.0)
-            principled.inputs['Roughness'].default_value = 0.8
-            principled.inputs['Specular'].default_value = 0.1
-            
-            links.new(principled.outputs['BSDF'], output.inputs['Surface'])
+            wall_mat = compile_material(WALL_PAINT_SPEC)
             
             # Apply wall material
             for wall in [back_wall, left_wall, right_wall]:
@@ -472,39 +338,36 @@ class MeshyModelEnhancerPro:
             # Setup lighting
             self.setup_realistic_lighting()
             
-            materials = self.create_realistic_sofa_materials()
+            material = self.create_realistic_sofa_materials()
+            
+            # Geometry and UVs are prepared once; every variant shares the mesh
+            self.smart_uv_unwrap(self.original_object)
+            self.enhance_geometry_safe(self.original_object)
+            self.original_object.data.materials.clear()
+            self.original_object.data.materials.append(material)
+            set_colorway([self.original_object], "upholstery", SOFA_COLORWAYS[0])
             
             # Position variants in a line for better presentation
             spacing = 4.0
-            start_x = -((len(materials) - 1) * spacing) / 2
+            start_x = -((len(SOFA_COLORWAYS) - 1) * spacing) / 2
             
-            for i, (mat_name, material) in enumerate(materials.items()):
-                print(f"Creating variant {i+1}/{len(materials)}: {mat_name}")
+            for i, colorway in enumerate(SOFA_COLORWAYS):
+                print(f"Creating variant {i+1}/{len(SOFA_COLORWAYS)}: {colorway}")
                 
-                # Duplicate the original object
+                # Linked duplicate: new object, same mesh and material
                 variant_obj = self.original_object.copy()
-                variant_obj.data = self.original_object.data.copy()
-                variant_obj.name = f"{base_name}_{mat_name}"
+                variant_obj.name = f"{base_name}_{colorway}"
                 
                 bpy.context.collection.objects.link(variant_obj)
                 
                 # Position variant
                 variant_obj.location = (start_x + i * spacing, 0, 0)
                 
-                # Clear existing materials and apply new one
-                variant_obj.data.materials.clear()
-                variant_obj.data.materials.append(material)
-                
-                # UV unwrap for better texturing
-                self.smart_uv_unwrap(variant_obj)
-                
-                # Enhance geometry
-                self.enhance_geometry_safe(variant_obj)
+                # The colorway is a handful of object properties read by the shader
+                set_colorway([variant_obj], "upholstery", colorway)
                 
                 self.enhanced_objects.append(variant_obj)
                 
-                bpy.context.view_layer.update()
-                
             print("All variants created successfully")
             
         except Exception as e:
@@ -538,6 +401,12 @@ class MeshyModelEnhancerPro:
                     
                     export_path = os.path.join(output_dir, f"{obj.name}.obj")
                     
+                    # The MTL file cannot carry the shared shader's object properties:
+                    # link a plain material with the variant's colorway for the export
+                    slot = obj.material_slots[0]
+                    slot.link = 'OBJECT'
+                    slot.material = compile_material(colorway_spec("upholstery", obj[COLORWAY_KEY]))
+                    
                     try:
                         bpy.ops.wm.obj_export(
                             filepath=export_path,
@@ -558,6 +427,10 @@ class MeshyModelEnhancerPro:
                             use_uvs=True,
                             use_triangles=True
                         )
+                    finally:
+                        # Back to the shared family material for the saved scene
+                        slot.material = None
+                        slot.link = 'DATA'
                     
                     print(f"Exported: {export_path}")
                     